@@ -3,19 +3,210 @@
 Batch convert all TikZ files in the library to SVG
 """
 
+import hashlib
+import logging
+import os
+import re
+import shutil
+import subprocess
 import sys
+import tempfile
+from itertools import chain
+from multiprocessing import Pool
 from pathlib import Path
 
-from convert import convert_tex_to_svg
+import tikz2svg
+from convert import ConvertError, convert_tex_to_svg, pdf_page_to_svg
 
+log = logging.getLogger(__name__)
 
-def batch_convert(input_dir="library", output_dir="library/svg", pattern="*.tex"):
-    """Convert all .tex files in input_dir to SVG"""
+CACHE_DIR = Path(".cache")
+
+# pdflatex summary line, e.g. "Output written on batch0.pdf (3 pages, 51234 bytes)."
+_PAGES_RE = re.compile(r"Output written on .*?\((\d+) pages?")
+
+# Cached SVG suffix by the backend that produced it: native and pdflatex
+# output of the same file differ
+_CACHE_SUFFIXES = {"native": ".native.svg", "pdflatex": ".svg"}
+
+
+def _pdflatex_version():
+    """Return the pdflatex version banner (empty if pdflatex is not installed)"""
+    try:
+        result = subprocess.run(["pdflatex", "--version"], capture_output=True, text=True)
+        version = result.stdout
+    except OSError:
+        version = ""
+    return version
+
+
+def _native_fingerprint():
+    """Hash of the tikz2svg version, sources and grammar, which native output depends on"""
+    package = Path(tikz2svg.__file__).parent
+    digest = hashlib.sha256(tikz2svg.__version__.encode())
+    for source in sorted(chain(package.rglob("*.py"), package.rglob("*.lark"))):
+        digest.update(source.relative_to(package).as_posix().encode())
+        digest.update(source.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def _prepare_cache(cache_dir, fingerprint):
+    """Create the SVG cache directory, emptying it if pdflatex or tikz2svg changed since"""
+    svg_dir = cache_dir / "svg"
+    meta_file = cache_dir / "meta"
+    meta = f"{_pdflatex_version()}\ntikz2svg {fingerprint}\n"
+
+    if meta_file.exists() and meta_file.read_text() != meta:
+        shutil.rmtree(svg_dir, ignore_errors=True)
+
+    svg_dir.mkdir(parents=True, exist_ok=True)
+    meta_file.write_text(meta)
+    return svg_dir
+
+
+def _cache_name(digest, backend, fingerprint):
+    """Cache file name of a .tex source's SVG produced by backend"""
+    version = f".{fingerprint}" if backend == "native" else ""
+    return f"{digest}{version}{_CACHE_SUFFIXES[backend]}"
+
+
+def _find_cached(svg_cache, digest, backends, fingerprint):
+    """Return the cached SVG of the first of backends that has one, or None"""
+    candidates = (svg_cache / _cache_name(digest, backend, fingerprint) for backend in backends)
+    return next((candidate for candidate in candidates if candidate.exists()), None)
+
+
+def _convert_one(task):
+    """Pool worker: convert one file
+
+    Returns (tex_file, backend that produced the SVG or None, error message or None).
+    """
+    tex_file, svg_file, options = task
+    try:
+        backend = convert_tex_to_svg(tex_file, svg_file, **options)
+        error = None
+    except Exception as e:
+        backend, error = None, str(e)
+    return tex_file, backend, error
+
+
+def _split_document(source):
+    """Split a LaTeX document into (preamble, body); body is None without \\begin{document}"""
+    preamble, begin_document, rest = source.partition("\\begin{document}")
+    body = rest.partition("\\end{document}")[0] if begin_document else None
+    return preamble, body
+
+
+def _compile_group(preamble, members, driver):
+    """Compile the bodies of files sharing a preamble into one PDF, one page each"""
+    bodies = "\n\\clearpage\n".join(f"\\begingroup\n{body}\n\\endgroup" for _, body in members)
+    driver.write_text(
+        f"{preamble}\\begin{{document}}\n{bodies}\n\\end{{document}}\n", encoding="utf-8"
+    )
+
+    try:
+        result = subprocess.run(
+            [
+                "pdflatex",
+                "-interaction=nonstopmode",
+                "-halt-on-error",
+                "-shell-escape",
+                driver.name,
+            ],
+            cwd=driver.parent,
+            capture_output=True,
+            text=True,
+        )
+    except OSError:
+        result = None
+
+    pages = _PAGES_RE.search(result.stdout) if result and result.returncode == 0 else None
+    converted = {}
+
+    # A page count mismatch means some file produced several pages (or none):
+    # pages cannot be attributed, so the whole group falls back to per-file
+    if pages and int(pages.group(1)) == len(members):
+        pdf_file = driver.with_suffix(".pdf")
+        for page, (tex_file, _) in enumerate(members, 1):
+            page_svg = driver.parent / f"{tex_file.stem}.svg"
+            try:
+                pdf_page_to_svg(pdf_file, page_svg, page)
+                converted[tex_file] = page_svg
+            except ConvertError:
+                pass
+
+    return converted
+
+
+def batch_compile(tex_files, tmpdir):
+    """Compile files with one pdflatex run per distinct preamble
+
+    Files sharing a preamble have their bodies concatenated into a driver
+    document, each body in its own group (so local \\newcommand definitions do
+    not clash) and on its own page, which pdf_page_to_svg() then extracts page
+    by page. This pays pdflatex startup and package loading once per preamble
+    instead of once per file.
+
+    Returns a dict mapping each converted .tex file to its SVG inside tmpdir.
+    Files missing from it (unique preamble, compile error, unexpected page
+    count) should go through convert_tex_to_svg.
+    """
+    tmpdir = Path(tmpdir)
+    groups = {}
+    for tex_file in tex_files:
+        preamble, body = _split_document(tex_file.read_text(encoding="utf-8", errors="replace"))
+        if body is not None:
+            groups.setdefault(preamble, []).append((tex_file, body))
+
+    converted = {}
+    for index, (preamble, members) in enumerate(groups.items()):
+        if len(members) > 1:
+            converted.update(_compile_group(preamble, members, tmpdir / f"batch{index}.tex"))
+    return converted
+
+
+def batch_convert(
+    input_dir="library",
+    output_dir="library/svg",
+    pattern="*.tex",
+    jobs=None,
+    validate_only=False,
+    cache=True,
+    precompile=False,
+    batch=False,
+    native=True,
+    fallback=True,
+):
+    """Convert all .tex files in input_dir to SVG
+
+    Files are independent, so they are converted in parallel by a pool of
+    ``jobs`` worker processes (defaults to the number of CPUs).
+
+    With ``validate_only``, files are only checked for compilation (pdflatex
+    draftmode) and no SVG is written.
+
+    With ``cache``, generated SVGs are kept in ``.cache/svg`` under the sha256
+    of their .tex source and the backend that produced them, and unchanged
+    files are copied from there instead of being recompiled. Native entries
+    also carry a hash of the tikz2svg sources. The cache is emptied when the
+    pdflatex version or the tikz2svg sources change.
+
+    With ``precompile``, each distinct preamble is dumped once into a pdflatex
+    format that later compiles load instead of re-reading the packages.
+
+    With ``batch``, files sharing a preamble are first compiled together by
+    batch_compile(); files it could not handle go through the process pool.
+    Batching is a pdflatex optimization, so it is skipped when ``native``.
+
+    With ``native``, each file is first converted by the in-tree parser,
+    falling back to pdflatex unless ``fallback`` is False (in which case
+    files the parser cannot handle are reported as failures).
+    """
     input_path = Path(input_dir)
     output_path = Path(output_dir)
 
     if not input_path.exists():
-        print(f"Error: Input directory not found: {input_path}")
+        log.error("Error: Input directory not found: %s", input_path)
         sys.exit(1)
 
     # Create output directory
@@ -25,37 +216,88 @@ def batch_convert(input_dir="library", output_dir="library/svg", pattern="*.tex"
     tex_files = sorted(input_path.glob(pattern))
 
     if not tex_files:
-        print(f"No .tex files found in {input_path}")
+        log.info("No .tex files found in %s", input_path)
         return
 
-    print(f"Found {len(tex_files)} TikZ files to convert")
-    print(f"Input:  {input_path.absolute()}")
-    print(f"Output: {output_path.absolute()}")
-    print("-" * 60)
+    log.info("Found %d TikZ files to convert", len(tex_files))
+    log.info("Input:  %s", input_path.absolute())
+    log.info("Output: %s", output_path.absolute())
+    log.info("-" * 60)
 
     success_count = 0
     failed = []
+    fingerprint = _native_fingerprint()
+    svg_cache = _prepare_cache(CACHE_DIR, fingerprint) if cache and not validate_only else None
 
-    for i, tex_file in enumerate(tex_files, 1):
+    # Backends whose cached output may be served, in order of preference
+    backends = (["native"] if native else []) + (["pdflatex"] if fallback or not native else [])
+
+    # Serve unchanged files from the cache, queue the others for conversion
+    pending = {}
+    for tex_file in tex_files:
         svg_file = output_path / tex_file.with_suffix(".svg").name
-        print(f"[{i}/{len(tex_files)}] {tex_file.name}")
+        digest = hashlib.sha256(tex_file.read_bytes()).hexdigest() if svg_cache else None
+        cached_svg = _find_cached(svg_cache, digest, backends, fingerprint) if digest else None
 
-        try:
-            convert_tex_to_svg(tex_file, svg_file)
+        if cached_svg:
+            # copyfile copies in the kernel (sendfile) and skips copy()'s chmod
+            shutil.copyfile(cached_svg, svg_file)
             success_count += 1
-        except Exception as e:
-            print(f"  ✗ Error: {e}")
-            failed.append(tex_file.name)
+            log.info("[%d/%d] %s (cached)", success_count, len(tex_files), tex_file.name)
+        else:
+            pending[tex_file] = (svg_file, digest)
+
+    # One scratch directory for the whole run instead of one per file
+    with tempfile.TemporaryDirectory() as scratch_dir:
+        if batch and not validate_only and not native:
+            for tex_file, page_svg in batch_compile(list(pending), scratch_dir).items():
+                svg_file, digest = pending.pop(tex_file)
+                shutil.move(str(page_svg), str(svg_file))
+                success_count += 1
+                log.info("[%d/%d] %s (batched)", success_count, len(tex_files), tex_file.name)
+                if digest:
+                    shutil.copyfile(
+                        svg_file, svg_cache / _cache_name(digest, "pdflatex", fingerprint)
+                    )
+
+        options = {
+            "draft": validate_only,
+            "precompile": precompile,
+            "scratch_dir": scratch_dir,
+            "native": native,
+            "fallback": fallback,
+        }
+        tasks = [(tex_file, svg_file, options) for tex_file, (svg_file, _) in pending.items()]
+
+        # chunksize=1: compile times vary from sub-second to minutes, so handing
+        # out several files at once would leave workers idle behind a slow one
+        with Pool(processes=jobs or os.cpu_count()) as pool:
+            results = pool.imap_unordered(_convert_one, tasks, chunksize=1)
+            for i, (tex_file, backend, error) in enumerate(results, success_count + 1):
+                svg_file, digest = pending[tex_file]
+                log.info("[%d/%d] %s", i, len(tex_files), tex_file.name)
 
-    print("-" * 60)
-    print(f"\n✓ Successfully converted {success_count}/{len(tex_files)} files")
+                if error is None:
+                    success_count += 1
+                    if digest:
+                        shutil.copyfile(
+                            svg_file, svg_cache / _cache_name(digest, backend, fingerprint)
+                        )
+                else:
+                    log.error("  ✗ Error: %s", error)
+                    failed.append(tex_file.name)
+
+    log.info("-" * 60)
+    verb = "validated" if validate_only else "converted"
+    log.info("\n✓ Successfully %s %d/%d files", verb, success_count, len(tex_files))
 
     if failed:
-        print(f"\n✗ Failed to convert {len(failed)} files:")
+        log.error("\n✗ Failed to convert %d files:", len(failed))
         for name in failed:
-            print(f"  - {name}")
+            log.error("  - %s", name)
 
-    print(f"\nSVG files saved to: {output_path.absolute()}")
+    if not validate_only:
+        log.info("\nSVG files saved to: %s", output_path.absolute())
 
 
 if __name__ == "__main__":
@@ -77,7 +319,64 @@ if __name__ == "__main__":
     parser.add_argument(
         "--pattern", "-p", default="*.tex", help="File pattern to match (default: *.tex)"
     )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=None,
+        help="Number of parallel conversion processes (default: number of CPUs)",
+    )
+    parser.add_argument(
+        "--validate-only",
+        action="store_true",
+        help="Only check that files compile (pdflatex draftmode), without writing SVGs",
+    )
+
+    parser.add_argument(
+        "--cache",
+        dest="cache",
+        action="store_true",
+        default=True,
+        help="Reuse SVGs of unchanged files from .cache/svg (default)",
+    )
+    parser.add_argument(
+        "--no-cache", dest="cache", action="store_false", help="Always recompile every file"
+    )
+    parser.add_argument(
+        "--precompile",
+        action="store_true",
+        help="Dump each distinct preamble into a pdflatex format reused by later compiles",
+    )
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Compile files sharing a preamble in a single pdflatex run (with --no-native)",
+    )
+    parser.add_argument(
+        "--no-native",
+        dest="native",
+        action="store_false",
+        help="Always use pdflatex instead of trying the in-tree TikZ parser first",
+    )
+    parser.add_argument(
+        "--no-fallback",
+        dest="fallback",
+        action="store_false",
+        help="Report files the in-tree parser cannot convert as failures, without pdflatex",
+    )
 
     args = parser.parse_args()
 
-    batch_convert(args.input, args.output, args.pattern)
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stdout)
+    batch_convert(
+        args.input,
+        args.output,
+        args.pattern,
+        args.jobs,
+        args.validate_only,
+        args.cache,
+        args.precompile,
+        args.batch,
+        args.native,
+        args.fallback,
+    )
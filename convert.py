@@ -1,76 +1,256 @@
 #!/usr/bin/env python3
 """
-Convert TikZ LaTeX files to SVG using pdflatex and pdf2svg
+Convert TikZ LaTeX files to SVG using pdflatex and pdf2svg (or PyMuPDF)
+
+Inputs are regular LaTeX documents starting with \\documentclass. With
+``precompile=True`` the preamble (everything before \\begin{document}) is
+dumped once into a pdflatex format with mylatexformat and later compiles load
+that format with -fmt instead of re-reading \\usepackage{tikz} and friends.
 """
 
+import hashlib
+import logging
+import os
 import shutil
 import subprocess
 import sys
 import tempfile
 from pathlib import Path
 
+from tikz2svg import SVGConverter, TikzParser
+
+try:
+    import fitz  # PyMuPDF
+
+    PYMUPDF_AVAILABLE = True
+except ImportError:
+    PYMUPDF_AVAILABLE = False
+
+log = logging.getLogger(__name__)
+
+# Precompiled preamble formats, keyed by a hash of the preamble
+FORMAT_DIR = Path(".cache/fmt")
+
+# Files pdflatex leaves next to <stem>.tex, removed after each compile in a scratch_dir
+SCRATCH_SUFFIXES = (".tex", ".aux", ".log", ".out", ".pdf")
+
 
-def convert_tex_to_svg(input_path, output_path):
+class ConvertError(Exception):
+    """Raised when a LaTeX file cannot be converted to SVG."""
+
+
+def convert_tex_to_svg(
+    input_path,
+    output_path,
+    draft=False,
+    precompile=False,
+    scratch_dir=None,
+    native=True,
+    fallback=True,
+):
     """
-    Convert a LaTeX file to SVG using pdflatex and pdf2svg
+    Convert a LaTeX file to SVG
+
+    The in-tree TikzParser and SVGConverter are tried first: they need no
+    LaTeX toolchain, subprocess or temporary files. pdflatex and pdf2svg are
+    only used for documents the native converter cannot handle.
 
     Args:
         input_path: Path to the input .tex file
         output_path: Path for the output .svg file
+        draft: Only check that the file compiles. pdflatex runs in draftmode,
+            which skips writing the PDF, and no SVG is produced.
+        precompile: Compile against a precompiled format of the file's preamble,
+            building it in FORMAT_DIR on first use.
+        scratch_dir: Directory to compile in, reused across calls. Only this
+            file's intermediate files are removed afterwards. When None, a
+            fresh temporary directory is created and removed.
+        native: Try the native converter before pdflatex. Not used with draft,
+            which checks that the document compiles with LaTeX.
+        fallback: Fall back to pdflatex when the native converter fails. When
+            False, a native failure raises ConvertError.
+
+    Returns:
+        The backend that produced the output: "native" or "pdflatex"
+
+    Raises:
+        ConvertError: If the input is missing or a conversion step fails
     """
     input_path = Path(input_path)
     output_path = Path(output_path)
 
     if not input_path.exists():
-        print(f"Error: Input file not found: {input_path}")
-        sys.exit(1)
+        raise ConvertError(f"Input file not found: {input_path}")
 
     # Create output directory if it doesn't exist
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    # Create a temporary directory for compilation
-    with tempfile.TemporaryDirectory() as tmpdir:
-        tmpdir = Path(tmpdir)
+    backend = "pdflatex"
+    if native and not draft:
+        try:
+            _native_convert(input_path, output_path)
+            backend = "native"
+        except Exception as e:
+            if not fallback:
+                raise ConvertError(f"Native conversion failed: {e}") from e
+            log.warning("Native conversion failed, falling back to pdflatex: %s", e)
 
-        # Copy the input file to temp directory
-        temp_tex = tmpdir / input_path.name
-        shutil.copy(input_path, temp_tex)
+    if backend == "pdflatex":
+        _compile_in_scratch(input_path, output_path, scratch_dir, draft, precompile)
 
-        # Compile LaTeX to PDF
-        print(f"Compiling {input_path.name} to PDF...")
-        result = subprocess.run(
-            ["pdflatex", "-interaction=nonstopmode", "-shell-escape", str(temp_tex)],
-            cwd=tmpdir,
-            capture_output=True,
-            text=True,
-        )
+    if draft:
+        log.debug("✓ %s compiles", input_path.name)
+    else:
+        log.debug("✓ Successfully created %s with %s", output_path, backend)
 
-        if result.returncode != 0:
-            print("Error during pdflatex compilation:")
-            print(result.stdout)
-            print(result.stderr)
-            sys.exit(1)
+    return backend
+
+
+def _native_convert(input_path, output_path):
+    """Convert input_path with TikzParser and SVGConverter, without LaTeX."""
+    ast = TikzParser().parse_file(input_path)
+    Path(output_path).write_text(SVGConverter().convert(ast), encoding="utf-8")
+
+
+def _compile_in_scratch(input_path, output_path, scratch_dir, draft, precompile):
+    """Run _compile() in scratch_dir, or in a fresh temporary directory if None."""
+    if scratch_dir is None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            _compile(input_path, output_path, Path(tmpdir), draft, precompile)
+    else:
+        # One subdirectory per process, so parallel callers can share scratch_dir
+        tmpdir = Path(scratch_dir) / str(os.getpid())
+        tmpdir.mkdir(parents=True, exist_ok=True)
+        try:
+            _compile(input_path, output_path, tmpdir, draft, precompile)
+        finally:
+            for suffix in SCRATCH_SUFFIXES:
+                (tmpdir / f"{input_path.stem}{suffix}").unlink(missing_ok=True)
+
+
+def _compile(input_path, output_path, tmpdir, draft, precompile):
+    """Compile input_path inside tmpdir, then convert the PDF to output_path."""
+    # Copy the input file to the compilation directory
+    temp_tex = tmpdir / input_path.name
+    shutil.copyfile(input_path, temp_tex)
+
+    if draft:
+        args = ["pdflatex", "-interaction=batchmode", "-halt-on-error", "-draftmode"]
+    else:
+        args = ["pdflatex", "-interaction=nonstopmode", "-shell-escape"]
+
+    fmt_file = _ensure_format(temp_tex) if precompile else None
+    if fmt_file:
+        args.append(f"-fmt={fmt_file.with_suffix('')}")
+    args.append(str(temp_tex))
+
+    # Compile LaTeX to PDF
+    log.debug("Compiling %s to PDF...", input_path.name)
+    result = subprocess.run(args, cwd=tmpdir, capture_output=True, text=True)
 
-        # Find the generated PDF
-        pdf_file = tmpdir / input_path.with_suffix(".pdf").name
+    if result.returncode != 0:
+        raise ConvertError(f"Error during pdflatex compilation:\n{result.stdout}\n{result.stderr}")
 
-        if not pdf_file.exists():
-            print(f"Error: PDF file was not generated: {pdf_file}")
-            sys.exit(1)
+    if not draft:
+        _pdf_to_svg(tmpdir / input_path.with_suffix(".pdf").name, output_path)
 
-        # Convert PDF to SVG
-        print("Converting PDF to SVG...")
+
+def _ensure_format(tex_file):
+    """Return the precompiled format for tex_file's preamble, building it if needed.
+
+    Returns None when the file has no \\begin{document} or the format cannot be
+    built, in which case the caller compiles normally.
+    """
+    source = tex_file.read_text(encoding="utf-8", errors="replace")
+    preamble, begin_document, _ = source.partition("\\begin{document}")
+
+    fmt_file = None
+    if begin_document:
+        fmt_name = f"tikz2svg_fmt_{hashlib.sha256(preamble.encode()).hexdigest()[:16]}"
+        fmt_file = FORMAT_DIR.absolute() / f"{fmt_name}.fmt"
+        if not fmt_file.exists():
+            fmt_file = _build_format(tex_file, fmt_name, fmt_file)
+
+    return fmt_file
+
+
+def _build_format(tex_file, fmt_name, fmt_file):
+    """Dump the preamble of tex_file into fmt_file with mylatexformat.
+
+    pdflatex runs in a private temporary directory inside FORMAT_DIR, so
+    parallel workers building the same preamble never touch each other's
+    files, and its .log and other leftovers go away with the directory.
+    """
+    log.debug("Precompiling preamble of %s...", tex_file.name)
+    fmt_file.parent.mkdir(parents=True, exist_ok=True)
+
+    with tempfile.TemporaryDirectory(dir=fmt_file.parent) as build_dir:
+        build_dir = Path(build_dir)
+        shutil.copyfile(tex_file, build_dir / tex_file.name)
+        try:
+            result = subprocess.run(
+                [
+                    "pdflatex",
+                    "-ini",
+                    f"-jobname={fmt_name}",
+                    "&pdflatex",
+                    "mylatexformat.ltx",
+                    tex_file.name,
+                ],
+                cwd=build_dir,
+                capture_output=True,
+                text=True,
+            )
+        except OSError:
+            result = None
+        built = build_dir / f"{fmt_name}.fmt"
+
+        if result and result.returncode == 0 and built.exists():
+            # Same filesystem, so the rename is atomic: concurrent workers never
+            # load a half-written format, and the last finished build wins
+            os.replace(built, fmt_file)
+        else:
+            fmt_file = None
+
+    return fmt_file
+
+
+def _pdf_to_svg(pdf_file, output_path):
+    """Convert a compiled PDF to SVG."""
+    if not pdf_file.exists():
+        raise ConvertError(f"PDF file was not generated: {pdf_file}")
+
+    log.debug("Converting PDF to SVG...")
+    pdf_page_to_svg(pdf_file, output_path)
+
+
+def pdf_page_to_svg(pdf_file, output_path, page=1):
+    """Convert one page (1-based) of a PDF to SVG
+
+    With PyMuPDF installed the page is rendered in-process, saving a pdf2svg
+    fork/exec and poppler's font setup for every file. Otherwise pdf2svg is
+    run. Both render glyphs as paths, so the SVG needs no fonts.
+
+    Raises:
+        ConvertError: If the page cannot be converted
+    """
+    if PYMUPDF_AVAILABLE:
+        try:
+            with fitz.open(pdf_file) as document:
+                svg = document[page - 1].get_svg_image(text_as_path=True)
+        except Exception as e:
+            raise ConvertError(f"Error during PDF to SVG conversion:\n{e}") from e
+        Path(output_path).write_text(svg, encoding="utf-8")
+    else:
         result = subprocess.run(
-            ["pdf2svg", str(pdf_file), str(output_path)], capture_output=True, text=True
+            ["pdf2svg", str(pdf_file), str(output_path), str(page)],
+            capture_output=True,
+            text=True,
         )
-
         if result.returncode != 0:
-            print("Error during pdf2svg conversion:")
-            print(result.stdout)
-            print(result.stderr)
-            sys.exit(1)
-
-    print(f"✓ Successfully created {output_path}")
+            raise ConvertError(
+                f"Error during pdf2svg conversion:\n{result.stdout}\n{result.stderr}"
+            )
 
 
 if __name__ == "__main__":
@@ -83,4 +263,11 @@ if __name__ == "__main__":
     if len(sys.argv) > 2:
         output_file = sys.argv[2]
 
-    convert_tex_to_svg(input_file, output_file)
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stdout)
+
+    try:
+        convert_tex_to_svg(input_file, output_file)
+        log.info("✓ Successfully created %s", output_file)
+    except ConvertError as e:
+        log.error("Error: %s", e)
+        sys.exit(1)
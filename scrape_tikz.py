@@ -4,26 +4,50 @@ Scraper for TikZ examples from TeXample.net
 Downloads TikZ code and metadata from the gallery
 """
 
+import asyncio
 import json
 import re
-import time
 from pathlib import Path
 from urllib.parse import urljoin
 
-import requests
+import aiohttp
 from bs4 import BeautifulSoup
 
+HEADERS = {"User-Agent": "Mozilla/5.0 (TikZ Library Builder)"}
+TIMEOUT = aiohttp.ClientTimeout(total=10)
+
+TAG_HREF_RE = re.compile(r"/tikz/tag/")
+CATEGORY_HREF_RE = re.compile(r"/tikz/examples/category/")
+INVALID_CHARS_RE = re.compile(r"[^\w\s-]")
+DASHES_RE = re.compile(r"[-\s]+")
+
 
 class TikZScraper:
-    def __init__(self, output_dir="library"):
+    def __init__(self, output_dir="library", concurrency=8):
         self.base_url = "https://texample.net"
         self.gallery_url = f"{self.base_url}/tikz/examples/all/"
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True)
-        self.session = requests.Session()
-        self.session.headers.update({"User-Agent": "Mozilla/5.0 (TikZ Library Builder)"})
+        self.concurrency = concurrency
+        self.session = None
+        self.semaphore = None
+
+    async def fetch(self, url):
+        """Fetch a page, keeping at most ``concurrency`` requests in flight
+
+        Returns the undecoded body: lxml detects the encoding from the page's
+        meta tag itself, so decoding it here first would be wasted work. The
+        per-request delay is kept for politeness, but it is now paid by
+        each slot concurrently instead of serially for the whole scrape.
+        """
+        async with self.semaphore:
+            async with self.session.get(url) as response:
+                response.raise_for_status()
+                content = await response.read()
+            await asyncio.sleep(0.5)  # Be polite
+        return content
 
-    def get_example_links(self, max_pages=None):
+    async def get_example_links(self, max_pages=None):
         """Get all example links from the gallery"""
         print("Fetching example links from gallery...")
         example_links = []
@@ -37,13 +61,12 @@ class TikZScraper:
             print(f"  Fetching page {page}...")
 
             try:
-                response = self.session.get(url, timeout=10)
-                response.raise_for_status()
-            except requests.RequestException as e:
+                html = await self.fetch(url)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
                 print(f"  Error fetching page {page}: {e}")
                 break
 
-            soup = BeautifulSoup(response.text, "html.parser")
+            soup = BeautifulSoup(html, "lxml")
 
             # Find example links (they're in article titles)
             articles = soup.find_all("article")
@@ -53,9 +76,8 @@ class TikZScraper:
 
             for article in articles:
                 title_link = article.find("h2", class_="entry-title")
-                if title_link and title_link.find("a"):
-                    link = title_link.find("a")["href"]
-                    full_link = urljoin(self.base_url, link)
+                if title_link and (anchor := title_link.find("a")):
+                    full_link = urljoin(self.base_url, anchor["href"])
                     example_links.append(full_link)
 
             print(f"  Found {len(articles)} examples on page {page}")
@@ -66,7 +88,6 @@ class TikZScraper:
                 break
 
             page += 1
-            time.sleep(0.5)  # Be polite
 
         print(f"\nTotal examples found: {len(example_links)}")
         return example_links
@@ -107,7 +128,7 @@ class TikZScraper:
 
         # Tags
         tags = []
-        tag_elems = soup.find_all("a", href=re.compile(r"/tikz/tag/"))
+        tag_elems = soup.find_all("a", href=TAG_HREF_RE)
         for tag in tag_elems:
             tags.append(tag.get_text().strip())
         if tags:
@@ -115,7 +136,7 @@ class TikZScraper:
 
         # Categories
         categories = []
-        cat_elems = soup.find_all("a", href=re.compile(r"/tikz/examples/category/"))
+        cat_elems = soup.find_all("a", href=CATEGORY_HREF_RE)
         for cat in cat_elems:
             categories.append(cat.get_text().strip())
         if categories:
@@ -126,20 +147,20 @@ class TikZScraper:
     def sanitize_filename(self, text):
         """Create a safe filename from text"""
         # Remove or replace invalid characters
-        text = re.sub(r"[^\w\s-]", "", text)
-        text = re.sub(r"[-\s]+", "-", text)
+        text = INVALID_CHARS_RE.sub("", text)
+        text = DASHES_RE.sub("-", text)
         return text.lower()[:50]  # Limit length
 
-    def download_example(self, url, index):
+    async def download_example(self, url, index, total):
         """Download a single example"""
         try:
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
-        except requests.RequestException as e:
-            print(f"  Error: {e}")
+            html = await self.fetch(url)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            print(f"[{index}/{total}] {url}\n  Error: {e}")
             return False
 
-        soup = BeautifulSoup(response.text, "html.parser")
+        print(f"[{index}/{total}] {url}")
+        soup = BeautifulSoup(html, "lxml")
 
         # Extract code and metadata
         code = self.extract_tikz_code(soup)
@@ -166,13 +187,22 @@ class TikZScraper:
         print(f"  ✓ Saved: {filename}")
         return True
 
-    def scrape(self, max_pages=None, max_examples=None):
+    async def scrape(self, max_pages=None, max_examples=None):
         """Main scraping function"""
         print("Starting TikZ gallery scraper")
         print(f"Output directory: {self.output_dir.absolute()}\n")
 
-        # Get all example links
-        links = self.get_example_links(max_pages)
+        self.semaphore = asyncio.Semaphore(self.concurrency)
+        connector = aiohttp.TCPConnector(limit=self.concurrency)
+        async with aiohttp.ClientSession(
+            headers=HEADERS, timeout=TIMEOUT, connector=connector
+        ) as self.session:
+            await self._scrape(max_pages, max_examples)
+
+    async def _scrape(self, max_pages, max_examples):
+        # Gallery pages are chained by their "next" link, so they are walked in
+        # order; the examples themselves are downloaded concurrently
+        links = await self.get_example_links(max_pages)
 
         if max_examples:
             links = links[:max_examples]
@@ -180,12 +210,10 @@ class TikZScraper:
         print(f"\nDownloading {len(links)} examples...")
         print("-" * 60)
 
-        success_count = 0
-        for i, link in enumerate(links, 1):
-            print(f"[{i}/{len(links)}] {link}")
-            if self.download_example(link, i):
-                success_count += 1
-            time.sleep(0.5)  # Be polite to the server
+        results = await asyncio.gather(
+            *[self.download_example(link, i, len(links)) for i, link in enumerate(links, 1)]
+        )
+        success_count = sum(results)
 
         print("-" * 60)
         print(f"\n✓ Successfully downloaded {success_count}/{len(links)} examples")
@@ -204,8 +232,15 @@ if __name__ == "__main__":
     )
     parser.add_argument("--max-pages", type=int, help="Maximum number of gallery pages to scrape")
     parser.add_argument("--max-examples", type=int, help="Maximum number of examples to download")
+    parser.add_argument(
+        "--concurrency",
+        "-c",
+        type=int,
+        default=8,
+        help="Maximum number of requests in flight (default: 8)",
+    )
 
     args = parser.parse_args()
 
-    scraper = TikZScraper(output_dir=args.output)
-    scraper.scrape(max_pages=args.max_pages, max_examples=args.max_examples)
+    scraper = TikZScraper(output_dir=args.output, concurrency=args.concurrency)
+    asyncio.run(scraper.scrape(max_pages=args.max_pages, max_examples=args.max_examples))
@@ -1,6 +1,9 @@
 #!/usr/bin/env python3
 """Test the TikZ parser on complex_demo.tex with all Phase features."""
 
+import re
+from collections import Counter
+
 from tikz2svg.parser.parser import TikzParser
 from tikz2svg.svg.converter import SVGConverter
 
@@ -44,9 +47,11 @@ try:
     print()
 
     # Analyze SVG output
-    path_count = svg.count("<path")
-    text_count = svg.count("<text")
-    group_count = svg.count("<g")
+    # One scan for all the counters instead of one str.count per counter
+    counts = Counter(re.findall(r"<(path|text|g)\b", svg))
+    path_count = counts["path"]
+    text_count = counts["text"]
+    group_count = counts["g"]
     print("SVG Analysis:")
     print(f"  - Path elements: {path_count}")
     print(f"  - Text elements: {text_count}")
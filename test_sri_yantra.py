@@ -1,6 +1,9 @@
 #!/usr/bin/env python3
 """Test the TikZ parser on the Sri Yantra library example (0001-sri-yantra.tex)."""
 
+import re
+from collections import Counter
+
 from tikz2svg.parser.parser import TikzParser
 from tikz2svg.svg.converter import SVGConverter
 
@@ -63,10 +66,14 @@ try:
     print()
 
     # Analyze SVG output
-    path_count = svg.count("<path")
-    text_count = svg.count("<text")
-    group_count = svg.count("<g")
-    circle_count = svg.count("circle")
+    # One scan for all the counters instead of one str.count per counter
+    counts = Counter(
+        match.group(1) or match.group() for match in re.finditer(r"<(path|text|g)\b|circle", svg)
+    )
+    path_count = counts["path"]
+    text_count = counts["text"]
+    group_count = counts["g"]
+    circle_count = counts["circle"]
 
     print("SVG Analysis:")
     print(f"  - Path elements: {path_count}")
@@ -0,0 +1,62 @@
+"""Shared pytest fixtures."""
+
+from functools import lru_cache
+from typing import NamedTuple
+
+import pytest
+
+from tikz2svg.parser.parser import TikzParser
+from tikz2svg.svg.converter import SVGConverter
+
+
+class Rendered(NamedTuple):
+    """SVG produced by the render fixture, with its number of drawn paths."""
+
+    svg: str
+    path_count: int
+
+
+@pytest.fixture(scope="session")
+def shared_parser():
+    """Create one parser per session (per worker under pytest-xdist); its grammar is built once."""
+    return TikzParser()
+
+
+@pytest.fixture
+def parser(shared_parser):
+    """Provide the shared parser with macros from earlier tests forgotten."""
+    shared_parser.reset()
+    return shared_parser
+
+
+@pytest.fixture(scope="session")
+def shared_converter():
+    """Create one converter per session (per worker under pytest-xdist)."""
+    return SVGConverter()
+
+
+@pytest.fixture
+def converter(shared_converter):
+    """Provide the shared converter with coordinates and variables from earlier tests forgotten."""
+    shared_converter.reset()
+    return shared_converter
+
+
+@pytest.fixture(scope="session")
+def render(shared_parser, shared_converter):
+    """Provide a function converting a TikZ source to a Rendered SVG, memoized by source.
+
+    The shared parser and converter are reset before each conversion, so the
+    SVG only depends on the source and repeated snippets are converted once.
+    The path count is the converter's, taken with the SVG rather than
+    recounted by every test.
+    """
+
+    @lru_cache(maxsize=None)
+    def render_source(tikz: str) -> Rendered:
+        shared_parser.reset()
+        shared_converter.reset()
+        svg = shared_converter.convert(shared_parser.parse(tikz))
+        return Rendered(svg, shared_converter.path_count)
+
+    return render_source
@@ -0,0 +1,16 @@
+"""Assertion helpers shared by the test modules."""
+
+import re
+
+# Root element of a generated document
+_SVG_ROOT_RE = re.compile(r"<svg\b")
+
+
+def assert_svg_ok(svg, min_paths=0):
+    """Assert svg is an SVG document with at least min_paths <path> elements.
+
+    One call replaces the separate '"<svg" in svg' and '"<path" in svg'
+    checks, and the path count is only scanned for when it is asked for.
+    """
+    assert _SVG_ROOT_RE.search(svg), "output is not an SVG document"
+    assert not min_paths or svg.count("<path") >= min_paths, f"expected {min_paths}+ paths"
@@ -1,18 +1,20 @@
 """Unit tests for CoordinateResolver."""
 
+import sys
+
 import pytest
 
 from tikz2svg.evaluator.math_eval import MathEvaluator
 from tikz2svg.parser.ast_nodes import Coordinate
-from tikz2svg.svg.coordinate_resolver import CoordinateResolver
-from tikz2svg.svg.geometry import CoordinateTransformer
+from tikz2svg.svg.coordinate_resolver import CoordinateResolver, _eval_constant
+from tikz2svg.svg.geometry import make_transformer
 
 
 @pytest.fixture
 def setup_resolver():
     """Create CoordinateResolver with dependencies."""
     evaluator = MathEvaluator()
-    transformer = CoordinateTransformer(scale=1.0, offset_x=250, offset_y=250)
+    transformer = make_transformer(scale=1.0, offset_x=250, offset_y=250)
     named_coords = {"A": (100, 100), "B": (200, 200)}
     resolver = CoordinateResolver(transformer, evaluator, named_coords)
     return resolver, transformer, evaluator
@@ -170,6 +172,26 @@ def test_eval_value_invalid_string(setup_resolver):
     assert result == 0.0
 
 
+def test_eval_value_constant_expression_is_cached(setup_resolver):
+    """Test repeated constant expressions are served from the cache."""
+    resolver, _, _ = setup_resolver
+
+    resolver.eval_value("sqrt(16)+0.5")
+    hits = _eval_constant.cache_info().hits
+    assert resolver.eval_value("sqrt(16)+0.5") == 4.5
+    assert _eval_constant.cache_info().hits == hits + 1
+
+
+def test_eval_value_variable_expression_not_cached(setup_resolver):
+    """Test expressions reading variables see the current value."""
+    resolver, _, evaluator = setup_resolver
+
+    evaluator.context.set_variable("i", 1)
+    assert resolver.eval_value("\\i*2") == 2.0
+    evaluator.context.set_variable("i", 3)
+    assert resolver.eval_value("\\i*2") == 6.0
+
+
 def test_eval_value_non_numeric_type(setup_resolver):
     """Test evaluating non-numeric type returns 0.0."""
     resolver, _, _ = setup_resolver
@@ -195,6 +217,17 @@ def test_store_named(setup_resolver):
     assert result == (300, 300)
 
 
+def test_store_named_interns_name(setup_resolver):
+    """Test stored names are interned for identity-fast lookups."""
+    resolver, _, _ = setup_resolver
+
+    name = "".join(["P", "1"])
+    resolver.store_named(name, (1, 2))
+
+    stored = next(key for key in resolver.named_coordinates if key == "P1")
+    assert stored is sys.intern("P1")
+
+
 def test_store_named_overwrites(setup_resolver):
     """Test storing named coordinate overwrites existing one."""
     resolver, _, _ = setup_resolver
@@ -209,6 +242,16 @@ def test_store_named_overwrites(setup_resolver):
     assert result == (999, 999)
 
 
+def test_resolve_cartesian_float_literals(setup_resolver):
+    """Test float literals resolve like their string and int forms."""
+    resolver, _, _ = setup_resolver
+
+    expected = resolver.resolve(Coordinate(system="cartesian", values=["1.5", "-2"]))
+
+    assert resolver.resolve(Coordinate(system="cartesian", values=[1.5, -2.0])) == expected
+    assert resolver.resolve(Coordinate(system="cartesian", values=[1.5, -2])) == expected
+
+
 def test_resolve_cartesian_with_expressions(setup_resolver):
     """Test Cartesian coordinates with expression values."""
     resolver, _, _ = setup_resolver
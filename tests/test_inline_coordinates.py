@@ -1,21 +1,6 @@
 """Tests for inline coordinate definitions in paths."""
 
-import pytest
-
-from tikz2svg.parser.parser import TikzParser
-from tikz2svg.svg.converter import SVGConverter
-
-
-@pytest.fixture
-def parser():
-    """Create parser instance."""
-    return TikzParser()
-
-
-@pytest.fixture
-def converter():
-    """Create converter instance."""
-    return SVGConverter()
+from .helpers import assert_svg_ok
 
 
 class TestInlineCoordinates:
@@ -32,8 +17,7 @@ class TestInlineCoordinates:
         ast = parser.parse(tikz)
         svg = converter.convert(ast)
 
-        assert "<svg" in svg
-        assert "<path" in svg
+        assert_svg_ok(svg)
         # Should have two paths
         assert svg.count("<path") == 2
 
@@ -138,8 +122,7 @@ class TestInlineCoordinates:
         ast = parser.parse(tikz)
         svg = converter.convert(ast)
 
-        assert "<svg" in svg
-        assert "<path" in svg
+        assert_svg_ok(svg, min_paths=1)
 
     def test_inline_coordinate_overwrites(self, parser, converter):
         """Test that redefining a coordinate overwrites the previous definition."""
@@ -8,28 +8,62 @@ from tikz2svg.parser.ast_nodes import DrawStatement, ForeachLoop, Path
 from tikz2svg.svg.loop_expander import ForeachLoopExpander
 from tikz2svg.svg.option_processor import OptionProcessor
 
+# Element returned by MockConverter; tests that only count elements compare
+# against it instead of building a distinct string per visited statement
+_ELEM = object()
+
 
 class MockConverter:
     """Mock converter for testing loop expander."""
 
     def __init__(self):
-        self.context = EvaluationContext()
-        self.evaluator = MathEvaluator(self.context)
+        self._context = EvaluationContext()
+        self.evaluator = MathEvaluator(self._context)
         self.visited_statements = []
+        self.compiled_statements = []
+
+    @property
+    def context(self):
+        """Current context; setting it re-points the shared evaluator like SVGConverter."""
+        return self._context
+
+    @context.setter
+    def context(self, context):
+        self._context = context
+        self.evaluator.context = context
 
     def visit_statement(self, stmt):
         """Mock visit_statement that records calls."""
         self.visited_statements.append(stmt)
-        return f"<element-{len(self.visited_statements)}/>"
+        return _ELEM
 
+    def compile_statement(self, stmt):
+        """Bind a statement to visit_statement like SVGConverter, recording the call."""
+        self.compiled_statements.append(stmt)
+        visit = self.visit_statement
+        return lambda: visit(stmt)
 
-@pytest.fixture
-def setup_expander():
-    """Create ForeachLoopExpander with dependencies."""
+
+@pytest.fixture(scope="module")
+def expander():
+    """Create ForeachLoopExpander with dependencies, shared by the module.
+
+    The expander keeps no per-loop state, so one instance serves every test.
+    """
     evaluator = MathEvaluator()
     option_processor = OptionProcessor(evaluator)
-    expander = ForeachLoopExpander(option_processor)
-    converter = MockConverter()
+    return ForeachLoopExpander(option_processor)
+
+
+@pytest.fixture
+def converter():
+    """Create a fresh mock converter (context and recorded statements)."""
+    return MockConverter()
+
+
+@pytest.fixture
+def setup_expander(expander, converter):
+    """Pair the shared expander with a per-test converter."""
     return expander, converter
 
 
@@ -51,7 +85,23 @@ def test_simple_loop_single_variable(setup_expander):
 
     # Should expand 3 iterations × 2 statements = 6 elements
     assert len(result) == 6
-    assert all(elem.startswith("<element-") for elem in result)
+    assert all(elem is _ELEM for elem in result)
+    assert len(converter.visited_statements) == 6
+
+
+def test_body_compiled_once(setup_expander):
+    """Test body statements are bound once per loop, not once per iteration."""
+    expander, converter = setup_expander
+    body = [
+        DrawStatement(command="draw", options={}, path=Path()),
+        DrawStatement(command="fill", options={}, path=Path()),
+    ]
+    loop = ForeachLoop(variables=["i"], values=[1, 2, 3, 4], body=body, evaluate_clause=None)
+
+    expander.expand(loop, converter)
+
+    assert converter.compiled_statements == body
+    assert converter.visited_statements == body * 4
 
 
 def test_loop_with_variable_evaluation(setup_expander):
@@ -92,6 +142,46 @@ def test_loop_with_multiple_variables(setup_expander):
     assert len(result) == 3
 
 
+def test_loop_with_backslash_variable_names(setup_expander):
+    """Test loop and evaluate targets given as \\name are stored without the backslash."""
+    expander, converter = setup_expander
+
+    loop = ForeachLoop(
+        variables=["\\i"],
+        values=[1, 2],
+        body=[DrawStatement(command="draw", options={}, path=Path())],
+        evaluate_clause={"target": "\\half", "expression": "\\i / 2"},
+    )
+
+    seen = []
+
+    def capture(stmt):
+        seen.append(dict(converter.context.variables))
+        return "elem"
+
+    converter.visit_statement = capture
+    expander.expand(loop, converter)
+
+    assert seen == [{"i": 1, "half": 0.5}, {"i": 2, "half": 1.0}]
+
+
+def test_loop_with_many_values(setup_expander):
+    """Test a long loop yields one element per statement and iteration."""
+    expander, converter = setup_expander
+
+    loop = ForeachLoop(
+        variables=["i"],
+        values=list(range(10_000)),
+        body=[DrawStatement(command="draw", options={}, path=Path())],
+        evaluate_clause=None,
+    )
+
+    result = expander.expand(loop, converter)
+
+    assert len(result) == 10_000
+    assert all(elem is _ELEM for elem in result)
+
+
 def test_loop_with_evaluate_clause(setup_expander):
     """Test foreach loop with evaluate clause."""
     expander, converter = setup_expander
@@ -118,6 +208,29 @@ def test_loop_with_evaluate_clause(setup_expander):
     assert evaluated_values == [2, 4, 6]
 
 
+def test_loop_with_multiple_variables_and_evaluate_clause(setup_expander):
+    """Test evaluate clause sees every paired loop variable."""
+    expander, converter = setup_expander
+
+    loop = ForeachLoop(
+        variables=["x", "y"],
+        values=[(1, 2), (3, 4)],
+        body=[DrawStatement(command="draw", options={}, path=Path())],
+        evaluate_clause={"target": "sum", "expression": "\\x + \\y"},
+    )
+
+    sums = []
+
+    def capture_sum(stmt):
+        sums.append(converter.context.get_variable("sum"))
+        return "elem"
+
+    converter.visit_statement = capture_sum
+    expander.expand(loop, converter)
+
+    assert sums == [3, 7]
+
+
 def test_loop_context_isolation(setup_expander):
     """Test that loop iterations have isolated contexts."""
     expander, converter = setup_expander
@@ -142,6 +255,31 @@ def test_loop_context_isolation(setup_expander):
     assert "i" not in converter.context.variables
 
 
+def test_loop_iterations_do_not_share_variables(setup_expander):
+    """Test that variables set in one iteration are gone in the next."""
+    expander, converter = setup_expander
+    seen = []
+
+    def visit(stmt):
+        seen.append(converter.context.get_variable("leak"))
+        converter.context.set_variable("leak", 1)
+        return "<element/>"
+
+    converter.visit_statement = visit
+
+    loop = ForeachLoop(
+        variables=["i"],
+        values=[1, 2, 3],
+        body=[DrawStatement(command="draw", options={}, path=Path())],
+        evaluate_clause=None,
+    )
+
+    expander.expand(loop, converter)
+
+    assert seen == [None, None, None]
+    assert "leak" not in converter.context.variables
+
+
 def test_loop_context_restoration(setup_expander):
     """Test that context is properly restored after loop."""
     expander, converter = setup_expander
@@ -190,6 +328,20 @@ def test_loop_with_no_body_statements(setup_expander):
     assert result == []
 
 
+def test_empty_loop_skips_child_context(setup_expander, monkeypatch):
+    """Test loops with nothing to run never create a child context."""
+    expander, converter = setup_expander
+
+    def fail(*args):
+        raise AssertionError("child context created")
+
+    monkeypatch.setattr(EvaluationContext, "create_child_context", fail)
+
+    for values, body in (([], [DrawStatement(command="draw", options={}, path=Path())]), ([1], [])):
+        loop = ForeachLoop(variables=["i"], values=values, body=body, evaluate_clause=None)
+        assert expander.expand(loop, converter) == []
+
+
 def test_loop_filters_none_elements(setup_expander):
     """Test that None elements from visit_statement are filtered out."""
     expander, converter = setup_expander
@@ -0,0 +1,159 @@
+"""Unit tests for MathEvaluator."""
+
+import math
+
+import pytest
+
+from tikz2svg.evaluator.context import EvaluationContext
+from tikz2svg.evaluator.fast_eval import compile_arithmetic
+from tikz2svg.evaluator.math_eval import (
+    MathEvaluator,
+    _compile_expression,
+    _cos_degrees,
+    _evaluate_constant,
+    fold_constant,
+    is_constant_expression,
+)
+
+
+@pytest.fixture
+def context():
+    """Create evaluation context."""
+    return EvaluationContext()
+
+
+@pytest.fixture
+def evaluator(context):
+    """Create math evaluator."""
+    return MathEvaluator(context)
+
+
+class TestCompiledExpressions:
+    """Test expressions compiled once and reused across variable values."""
+
+    def test_same_expression_new_values(self, evaluator, context):
+        """Test a cached expression picks up the current variable values."""
+        results = []
+        for value in (1, 2, 3):
+            context.set_variable("base", value)
+            results.append(evaluator.evaluate("\\base*2"))
+        assert results == [2.0, 4.0, 6.0]
+
+    def test_compiles_once(self, evaluator, context):
+        """Test repeated evaluation hits the compile cache."""
+        expr = "\\step*7+1"
+        _compile_expression(expr)
+        hits = _compile_expression.cache_info().hits
+        for value in range(5):
+            context.set_variable("step", value)
+            evaluator.evaluate(expr)
+        assert _compile_expression.cache_info().hits == hits + 5
+
+    def test_trig_uses_degrees(self, evaluator, context):
+        """Test trig arguments are still converted from degrees."""
+        context.set_variable("angle", 90)
+        assert evaluator.evaluate("sin(\\angle)") == pytest.approx(1.0)
+        assert evaluator.evaluate("2*cos(\\angle*2)") == pytest.approx(-2.0)
+
+    def test_trig_nested_parentheses(self, evaluator, context):
+        """Test a parenthesised trig argument is converted as a whole."""
+        context.set_variable("i", 2)
+        assert evaluator.evaluate("cos((\\i+1)*30)") == pytest.approx(0.0)
+
+    def test_trig_results_cached(self, evaluator, context):
+        """Test repeated angles across loop iterations reuse the cached result."""
+        context.set_variable("i", 3)
+        evaluator.evaluate("cos(\\i*60)")
+        hits = _cos_degrees.cache_info().hits
+        assert evaluator.evaluate("cos(180+\\i-3)") == pytest.approx(-1.0)
+        assert _cos_degrees.cache_info().hits == hits + 1
+
+    def test_functions(self, evaluator, context):
+        """Test LaTeX functions work with bound variables."""
+        context.set_variable("n", 16)
+        assert evaluator.evaluate("sqrt(\\n)+abs(-1)") == 5.0
+        assert evaluator.evaluate("exp(\\n-16)") == math.exp(0)
+
+    def test_bare_name_beside_function(self, evaluator, context):
+        """Test compiled expressions read bare names from the context, including parents."""
+        context.set_variable("w", 9)
+        child = context.create_child_context()
+        child.set_variable("i", 1)
+        evaluator.context = child
+        assert evaluator.evaluate("sqrt(w)+\\i") == 4.0
+        with pytest.raises(ValueError):
+            evaluator.evaluate("sqrt(nothere)+\\i")
+
+    def test_string_value_falls_back_to_substitution(self, evaluator, context):
+        """Test non-numeric values are still substituted textually."""
+        context.set_variable("expr", "1+2")
+        assert evaluator.evaluate("\\expr*2") == 5.0
+
+    def test_undefined_variable_raises(self, evaluator):
+        """Test undefined variables still fail with ValueError."""
+        with pytest.raises(ValueError):
+            evaluator.evaluate("\\missing+1")
+
+    def test_juxtaposed_number_falls_back(self, evaluator, context):
+        """Test expressions that only parse after substitution still work."""
+        context.set_variable("d", 5)
+        assert evaluator.evaluate("1\\d") == 15.0
+
+
+class TestConstantExpressions:
+    """Test memoization of expressions that do not depend on variables."""
+
+    @pytest.mark.parametrize(
+        "expr,constant",
+        [("2*3", True), ("sqrt(2)+1", True), ("\\x+1", False), ("x*2", False), ("pi", False)],
+    )
+    def test_is_constant_expression(self, expr, constant):
+        """Test only literals, operators and known functions count as constant."""
+        assert is_constant_expression(expr) is constant
+
+    def test_repeated_constant_hits_cache(self):
+        """Test a constant is evaluated once across evaluator instances."""
+        assert MathEvaluator().evaluate("7*6") == 42.0
+        hits = _evaluate_constant.cache_info().hits
+        assert MathEvaluator().evaluate("7*6") == 42.0
+        assert _evaluate_constant.cache_info().hits == hits + 1
+
+    @pytest.mark.parametrize(
+        "expr,folded",
+        [("(1+2)*3", 9.0), ("sqrt(16)", 4.0), ("\\r*2", "\\r*2"), ("2 + + )", "2 + + )")],
+    )
+    def test_fold_constant(self, expr, folded):
+        """Test only valid constant expressions are folded to their value."""
+        assert fold_constant(expr) == folded
+
+    def test_invalid_constant_still_raises(self, evaluator):
+        """Test a memoized failure raises ValueError every time."""
+        for _ in range(2):
+            with pytest.raises(ValueError, match="2 \\+ \\+ \\)"):
+                evaluator.evaluate("2 + + )")
+
+
+class TestArithmeticFastPath:
+    """Test plain arithmetic compiled without MathEvaluator's rewriting."""
+
+    @pytest.mark.parametrize("expr", ["2*3", "-x**2+1.5/(y)", "7//2%3"])
+    def test_plain_arithmetic_compiles(self, expr):
+        """Test numbers, names and arithmetic operators are accepted."""
+        assert compile_arithmetic(expr) is not None
+
+    @pytest.mark.parametrize(
+        "expr", ["sqrt(2)", "math.pi", "2^3", "x<1", "True", "'a'*2", "().__class__", "2 + +"]
+    )
+    def test_other_expressions_rejected(self, expr):
+        """Test calls, attributes, non-arithmetic operators and literals are refused."""
+        assert compile_arithmetic(expr) is None
+
+    def test_bare_names_read_context(self, evaluator, context):
+        """Test bare names resolve to context variables on the fast path."""
+        context.set_variable("w", 4)
+        assert evaluator.evaluate("w*w-1") == 15.0
+
+    def test_unknown_name_raises(self, evaluator):
+        """Test an undefined bare name still fails with ValueError."""
+        with pytest.raises(ValueError):
+            evaluator.evaluate("nothere*2")
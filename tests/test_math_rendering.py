@@ -1,8 +1,16 @@
 """Tests for LaTeX math mode rendering using ziamath."""
 
+import sys
+
 import pytest
 
-from tikz2svg.svg.math_renderer import ZIAMATH_AVAILABLE, MathRenderer
+from tikz2svg.svg import math_renderer
+from tikz2svg.svg.math_renderer import (
+    ZIAMATH_AVAILABLE,
+    MathRenderer,
+    _render_cached,
+    _ziamath,
+)
 
 
 class TestMathRendererAvailability:
@@ -151,6 +159,20 @@ class TestMathRendering:
         assert svg is None
         assert text == ""
 
+    def test_render_without_dollar_skips_regex(self, monkeypatch):
+        """Test labels without "$" never reach the math regex."""
+
+        class NoSearch:
+            def search(self, text):
+                raise AssertionError("regex used")
+
+        monkeypatch.setattr(math_renderer, "_MATH_RE", NoSearch())
+        assert MathRenderer().render("Plain text") == ("Plain text", None)
+
+    def test_render_single_dollar(self):
+        """Test a lone "$" is not treated as math."""
+        assert MathRenderer().render("Cost: 5$") == ("Cost: 5$", None)
+
     def test_render_with_text_around_math(self):
         """Test rendering when math is within text."""
         renderer = MathRenderer()
@@ -159,6 +181,23 @@ class TestMathRendering:
         assert svg is not None
         assert "<svg" in svg
 
+    def test_render_repeated_expression_is_cached(self):
+        """Test the same expression is rendered by ziamath only once."""
+        renderer = MathRenderer()
+        _, first = renderer.render("$z_{cached}$")
+        hits = _render_cached.cache_info().hits
+
+        _, second = renderer.render("Label $z_{cached}$")
+
+        assert second == first
+        assert _render_cached.cache_info().hits == hits + 1
+
+    def test_ziamath_imported_once(self):
+        """Test the lazily imported ziamath module is reused across renders."""
+        MathRenderer().render("$w$")
+        assert _ziamath() is _ziamath()
+        assert sys.modules["ziamath"] is _ziamath()
+
 
 class TestMathRenderingDisabled:
     """Test math rendering when disabled."""
@@ -224,24 +263,31 @@ class TestExtractPlainText:
         plain = renderer.extract_plain_text("$x$ and $y$")
         assert plain == "x and y"
 
+    def test_extract_plain_text_empty(self):
+        """Test extraction from empty text and None."""
+        renderer = MathRenderer()
+        assert renderer.extract_plain_text("") == ""
+        assert renderer.extract_plain_text(None) is None
+
 
 class TestMathRenderingIntegration:
     """Integration tests with TikZ parser and converter."""
 
+    @pytest.fixture(autouse=True)
+    def reset_state(self, parser, converter):
+        """Clear macros and named coordinates left by the previous test."""
+        parser.reset()
+        converter.reset()
+
     @pytest.mark.skipif(not ZIAMATH_AVAILABLE, reason="ziamath not available")
-    def test_node_with_math(self):
+    def test_node_with_math(self, parser, converter):
         """Test rendering a node with math content."""
-        from tikz2svg.parser.parser import TikzParser
-        from tikz2svg.svg.converter import SVGConverter
-
         tikz_code = r"""
 \begin{tikzpicture}
 \node at (0,0) {$x^2$};
 \end{tikzpicture}
 """
-        parser = TikzParser()
         ast = parser.parse(tikz_code)
-        converter = SVGConverter()
         svg = converter.convert(ast)
 
         assert svg is not None
@@ -250,19 +296,14 @@ class TestMathRenderingIntegration:
         assert "<g transform=" in svg
 
     @pytest.mark.skipif(not ZIAMATH_AVAILABLE, reason="ziamath not available")
-    def test_inline_node_with_math(self):
+    def test_inline_node_with_math(self, parser, converter):
         """Test rendering inline node labels with math."""
-        from tikz2svg.parser.parser import TikzParser
-        from tikz2svg.svg.converter import SVGConverter
-
         tikz_code = r"""
 \begin{tikzpicture}
 \draw (0,0) -- (1,1) node[right] {$\alpha$};
 \end{tikzpicture}
 """
-        parser = TikzParser()
         ast = parser.parse(tikz_code)
-        converter = SVGConverter()
         svg = converter.convert(ast)
 
         assert svg is not None
@@ -272,20 +313,15 @@ class TestMathRenderingIntegration:
         assert "<g transform=" in svg
 
     @pytest.mark.skipif(not ZIAMATH_AVAILABLE, reason="ziamath not available")
-    def test_multiple_nodes_with_math(self):
+    def test_multiple_nodes_with_math(self, parser, converter):
         """Test rendering multiple nodes with different math expressions."""
-        from tikz2svg.parser.parser import TikzParser
-        from tikz2svg.svg.converter import SVGConverter
-
         tikz_code = r"""
 \begin{tikzpicture}
 \node at (0,0) {$i^0$};
 \node at (1,1) {$\mathcal{I}^+$};
 \end{tikzpicture}
 """
-        parser = TikzParser()
         ast = parser.parse(tikz_code)
-        converter = SVGConverter()
         svg = converter.convert(ast)
 
         assert svg is not None
@@ -293,19 +329,14 @@ class TestMathRenderingIntegration:
         # Should contain two embedded math SVGs
         assert svg.count("<g transform=") >= 2
 
-    def test_node_without_math_fallback(self):
+    def test_node_without_math_fallback(self, parser, converter):
         """Test that nodes without math still render correctly."""
-        from tikz2svg.parser.parser import TikzParser
-        from tikz2svg.svg.converter import SVGConverter
-
         tikz_code = r"""
 \begin{tikzpicture}
 \node at (0,0) {Plain text};
 \end{tikzpicture}
 """
-        parser = TikzParser()
         ast = parser.parse(tikz_code)
-        converter = SVGConverter()
         svg = converter.convert(ast)
 
         assert svg is not None
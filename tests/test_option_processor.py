@@ -7,14 +7,21 @@ from tikz2svg.evaluator.math_eval import MathEvaluator
 from tikz2svg.svg.option_processor import OptionProcessor
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def setup_processor():
-    """Create OptionProcessor with evaluator."""
+    """Create OptionProcessor with evaluator, shared by the module."""
     evaluator = MathEvaluator()
     processor = OptionProcessor(evaluator)
     return processor, evaluator
 
 
+@pytest.fixture(autouse=True)
+def reset_variables(setup_processor):
+    """Forget variables set by the previous test on the shared evaluator."""
+    _, evaluator = setup_processor
+    evaluator.context.variables.clear()
+
+
 def test_process_simple_values(setup_processor):
     """Test processing options with simple values."""
     processor, _ = setup_processor
@@ -50,15 +57,17 @@ def test_process_variable_reference(setup_processor):
     assert result["value"] == 42
 
 
-def test_process_expression_with_operators(setup_processor):
-    """Test processing expressions with operators."""
+@pytest.mark.parametrize(
+    "expr,expected",
+    [("2*3", 6), ("10+5", 15), ("10/2", 5), ("10-3", 7), ("(2+3)*4", 20)],
+)
+def test_process_arithmetic_expression(setup_processor, expr, expected):
+    """Test processing expressions with operators and parentheses."""
     processor, _ = setup_processor
 
-    options = {"width": "2*3", "height": "10+5"}
-    result = processor.process(options)
+    result = processor.process({"value": expr})
 
-    assert result["width"] == 6
-    assert result["height"] == 15
+    assert result["value"] == expected
 
 
 def test_process_expression_with_backslash(setup_processor):
@@ -74,16 +83,6 @@ def test_process_expression_with_backslash(setup_processor):
     assert result["radius"] == 10
 
 
-def test_process_expression_with_parentheses(setup_processor):
-    """Test processing expressions with parentheses."""
-    processor, _ = setup_processor
-
-    options = {"value": "(2+3)*4"}
-    result = processor.process(options)
-
-    assert result["value"] == 20
-
-
 def test_process_reserved_words(setup_processor):
     """Test that reserved words (true, false, none) are not evaluated as variables."""
     processor, _ = setup_processor
@@ -152,13 +151,12 @@ def test_safe_evaluate_default_evaluator(setup_processor):
     assert result == 20
 
 
-def test_safe_evaluate_non_string(setup_processor):
+@pytest.mark.parametrize("value", [42, 3.14, None])
+def test_safe_evaluate_non_string(setup_processor, value):
     """Test safe_evaluate with non-string value returns it unchanged."""
     processor, _ = setup_processor
 
-    assert processor.safe_evaluate(42) == 42
-    assert processor.safe_evaluate(3.14) == 3.14
-    assert processor.safe_evaluate(None) is None
+    assert processor.safe_evaluate(value) is value
 
 
 def test_safe_evaluate_invalid_expression(setup_processor):
@@ -169,6 +167,28 @@ def test_safe_evaluate_invalid_expression(setup_processor):
     assert result == "invalid!!!"
 
 
+def test_safe_evaluate_unbound_name_skips_evaluator(setup_processor, monkeypatch):
+    """Test bare names without a variable are returned without evaluating."""
+    processor, evaluator = setup_processor
+
+    def fail(expr):
+        raise AssertionError(f"evaluated {expr!r}")
+
+    monkeypatch.setattr(evaluator, "evaluate", fail)
+
+    assert processor.safe_evaluate("red") == "red"
+    assert processor.process({"color": "blue"}) == {"color": "blue"}
+
+
+@pytest.mark.parametrize("value,expected", [("x", 10.0), ("True", 1.0), ("inf", float("inf"))])
+def test_safe_evaluate_names_that_evaluate(setup_processor, value, expected):
+    """Test bound variables, keywords and float words are still evaluated."""
+    processor, evaluator = setup_processor
+    evaluator.context.set_variable("x", 10)
+
+    assert processor.safe_evaluate(value) == expected
+
+
 def test_safe_evaluate_empty_string(setup_processor):
     """Test safe_evaluate with empty string."""
     processor, _ = setup_processor
@@ -200,23 +220,3 @@ def test_process_variable_evaluation_failure(setup_processor):
 
     # Should try as variable (fail), then keep original
     assert result["value"] == "notavar"
-
-
-def test_process_expression_evaluation_with_division(setup_processor):
-    """Test expression with division operator."""
-    processor, _ = setup_processor
-
-    options = {"value": "10/2"}
-    result = processor.process(options)
-
-    assert result["value"] == 5
-
-
-def test_process_expression_evaluation_with_subtraction(setup_processor):
-    """Test expression with subtraction operator."""
-    processor, _ = setup_processor
-
-    options = {"value": "10-3"}
-    result = processor.process(options)
-
-    assert result["value"] == 7
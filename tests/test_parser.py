@@ -1,15 +1,26 @@
 """Unit tests for TikZ parser."""
 
+import pickle
+import subprocess
+import sys
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import field
+from typing import Any, List, Optional
+
 import pytest
 
+from tikz2svg.parser import parser as parser_module
 from tikz2svg.parser.ast_nodes import *
-from tikz2svg.parser.parser import TikzParser
+from tikz2svg.parser.ast_nodes import _slotted_dataclass
+from tikz2svg.parser.parser import TikzParser, _parse_memo
+
+_SIMPLE_LINE = r"\begin{tikzpicture}\draw (0,0) -- (1,1);\end{tikzpicture}"
 
 
-@pytest.fixture
-def parser():
-    """Create parser instance."""
-    return TikzParser()
+def _fail_parse(tikz_code):
+    """Stand-in for TikzParser._parse_source in tests expecting a cache hit."""
+    raise AssertionError("source was parsed again")
 
 
 class TestBasicParsing:
@@ -24,7 +35,7 @@ class TestBasicParsing:
 
     def test_simple_line(self, parser):
         """Test parsing simple line."""
-        tikz = r"\begin{tikzpicture}\draw (0,0) -- (1,1);\end{tikzpicture}"
+        tikz = _SIMPLE_LINE
         ast = parser.parse(tikz)
         assert isinstance(ast, TikzPicture)
         assert len(ast.statements) == 1
@@ -53,6 +64,35 @@ class TestCoordinates:
         # First coordinate is implicit start point, check destination
         assert len(stmt.path.segments) >= 1
 
+    def test_repeated_cartesian_is_shared(self, parser):
+        """Test the same cartesian coordinate is parsed into one shared node."""
+        ast = parser.parse(r"\begin{tikzpicture}\draw (0,0) -- (1,1) -- (0,0);\end{tikzpicture}")
+        first, second, third = (seg.destination for seg in ast.statements[0].path.segments)
+        assert first is third
+        assert first is not second
+        assert first.values == (0.0, 0.0)
+
+    def test_cartesian_factory_is_typed(self):
+        """Test equal values of different types give distinct coordinates."""
+        assert Coordinate.cartesian(1, 2) is Coordinate.cartesian(1, 2)
+        assert Coordinate.cartesian(1.0, 2.0).values == (1.0, 2.0)
+        assert type(Coordinate.cartesian(1.0, 2.0).values[0]) is float
+
+    @pytest.mark.parametrize(
+        "coordinate,values",
+        [
+            pytest.param("(1+1,(2+3)*4)", (2.0, 20.0), id="arithmetic"),
+            pytest.param("(sqrt(4),sin(30)*2)", (2.0, pytest.approx(1.0)), id="functions"),
+            pytest.param(r"(\x*2,-1)", ("\\x*2", -1.0), id="variable"),
+            pytest.param("(30:4/2)", (30.0, 2.0), id="polar"),
+        ],
+    )
+    def test_constant_values_are_folded(self, parser, coordinate, values):
+        """Test constant coordinate values are evaluated at parse time."""
+        tikz = rf"\begin{{tikzpicture}}\draw (0,0) -- {coordinate};\end{{tikzpicture}}"
+        ast = parser.parse(tikz)
+        assert ast.statements[0].path.segments[1].destination.values == values
+
     def test_negative_coordinates(self, parser):
         """Test negative coordinates."""
         tikz = r"\begin{tikzpicture}\draw (-1,-1) -- (1,1);\end{tikzpicture}"
@@ -86,6 +126,16 @@ class TestOptions:
         assert "color" in stmt.options
         assert stmt.options["color"] == "red"
 
+    def test_options_are_interned(self, parser):
+        """Test option keys and string values are interned."""
+        tikz = r"\begin{tikzpicture}\draw[thick, draw=violet] (0,0) -- (1,1);\end{tikzpicture}"
+        options = parser.parse(tikz).statements[0].options
+        keys = {key: key for key in options}
+
+        assert keys["thick"] is sys.intern("thick")
+        assert keys["draw"] is sys.intern("draw")
+        assert options["draw"] is sys.intern("violet")
+
     def test_multiple_options(self, parser):
         """Test multiple options."""
         tikz = r"\begin{tikzpicture}\draw[red,thick] (0,0) -- (1,1);\end{tikzpicture}"
@@ -155,3 +205,240 @@ class TestCoordinateDefinition:
         stmt = ast.statements[0]
         assert isinstance(stmt, CoordinateDefinition)
         assert stmt.name == "A"
+
+    def test_names_are_interned(self, parser):
+        """Test coordinate definition and reference names are interned."""
+        tikz = r"\begin{tikzpicture}\coordinate (Pq) at (1,2);\draw (0,0) -- (Pq);\end{tikzpicture}"
+        ast = parser.parse(tikz)
+        definition, draw = ast.statements
+        assert definition.name is sys.intern("Pq")
+        assert draw.path.segments[1].destination.name is sys.intern("Pq")
+
+
+class TestSimpleDraws:
+    """Test draws without inline labels are marked for the converter's fast path."""
+
+    @pytest.mark.parametrize(
+        "path,simple",
+        [
+            ("(0,0) -- (1,1) -- cycle", True),
+            ("(0,0) circle (1)", True),
+            ("(0,0) -- (1,1) coordinate (B)", False),
+            ("(0,0) node {a} -- (1,1)", False),
+        ],
+    )
+    def test_is_simple(self, parser, path, simple):
+        """Test only paths with inline coordinate or node labels are not simple."""
+        tikz = r"\begin{tikzpicture}\draw[red] %s;\end{tikzpicture}" % path
+        assert parser.parse(tikz).statements[0].is_simple is simple
+
+
+class TestReset:
+    """Test parser reuse."""
+
+    def test_reset_forgets_macros(self, parser):
+        """Test macros from a previous parse are dropped by reset()."""
+        parser.parse(r"\begin{tikzpicture}\def\R{2}\draw (0,0) -- (\R,1);\end{tikzpicture}")
+        assert parser.preprocessor.macro_expander.get_macro("R") is not None
+
+        parser.reset()
+
+        assert parser.preprocessor.macro_expander.get_macro("R") is None
+
+
+class TestPickling:
+    """Test parsers can be sent to worker processes."""
+
+    def test_round_trip_keeps_macros(self, parser):
+        """Test an unpickled parser keeps its macros and parses with a rebuilt grammar."""
+        parser.parse(r"\begin{tikzpicture}\def\W{3}\end{tikzpicture}")
+
+        clone = pickle.loads(pickle.dumps(parser))
+
+        assert clone.parser is not parser.parser
+        assert clone.preprocessor.macro_expander.get_macro("W") is not None
+        assert clone.parse(_SIMPLE_LINE) == parser.parse(_SIMPLE_LINE)
+
+
+class TestGrammarCache:
+    """Test where the analysed grammar tables are cached."""
+
+    def test_tables_cached_in_private_user_directory(self, tmp_path, monkeypatch):
+        """Test the tables go to a user-only directory under the cache home."""
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+
+        fresh = TikzParser()
+
+        cache_dir = tmp_path / "tikz2svg"
+        assert (cache_dir / "grammar.lalr.cache").is_file()
+        assert cache_dir.stat().st_mode & 0o077 == 0
+        assert fresh.parse(_SIMPLE_LINE) == TikzParser().parse(_SIMPLE_LINE)
+
+    def test_unusable_cache_home_rebuilds_tables(self, tmp_path, monkeypatch):
+        """Test a cache home that cannot hold directories still gives a parser."""
+        blocker = tmp_path / "file"
+        blocker.write_text("")
+        monkeypatch.setenv("XDG_CACHE_HOME", str(blocker))
+
+        assert TikzParser().parse(_SIMPLE_LINE) is not None
+
+
+class TestParseCache:
+    """Test memoization of repeated sources."""
+
+    def test_repeated_source_returns_equal_copies(self, parser, monkeypatch):
+        """Test a cache hit yields an equal but independent tree."""
+        tikz = r"\begin{tikzpicture}\draw (0,0) -- (3,1);\end{tikzpicture}"
+        first = parser.parse(tikz)
+        monkeypatch.setattr(parser, "_parse_source", _fail_parse)
+
+        second = parser.parse(tikz)
+
+        assert second == first
+        assert second is not first
+        assert second.statements[0].path is not first.statements[0].path
+
+    def test_copies_keep_names_and_sharing(self, parser):
+        """Test a cache hit keeps interned names and coordinates shared within the tree."""
+        tikz = r"\begin{tikzpicture}\coordinate (Qr) at (1,2);\draw (Qr) -- (5,5) -- (5,5);\end{tikzpicture}"
+        parser.parse(tikz)
+
+        definition, draw = parser.parse(tikz).statements
+        named, second, third = (seg.destination for seg in draw.path.segments)
+
+        assert definition.name is sys.intern("Qr")
+        assert named.name is definition.name
+        assert second is third
+
+    def test_shared_between_parsers(self, parser):
+        """Test a source parsed by one parser is a cache hit for a new one."""
+        tikz = r"\begin{tikzpicture}\draw (0,0) -- (3,2);\end{tikzpicture}"
+        first = parser.parse(tikz)
+        other = TikzParser()
+        other._parse_source = _fail_parse
+
+        assert other.parse(tikz) == first
+
+    def test_cache_hit_registers_macros(self, parser):
+        """Test macros defined by a cached source are defined again on a hit."""
+        tikz = r"\begin{tikzpicture}\def\S{2}\draw (0,0) -- (\S,\S);\end{tikzpicture}"
+        parser.parse(tikz)
+        parser.reset()
+
+        parser.parse(tikz)
+
+        assert parser.preprocessor.macro_expander.get_macro("S") is not None
+
+    def test_not_cached_while_macros_defined(self, parser):
+        """Test sources are parsed directly when earlier macros could change them."""
+        parser.parse(r"\begin{tikzpicture}\def\T{1}\end{tikzpicture}")
+        tikz = r"\begin{tikzpicture}\draw (0,0) -- (\T,2);\end{tikzpicture}"
+
+        parser.parse(tikz)
+
+        assert tikz not in _parse_memo
+
+    def test_least_recently_used_evicted(self, parser, monkeypatch):
+        """Test the memo keeps at most its size, dropping the oldest entry."""
+        monkeypatch.setattr(parser_module, "_parse_memo", OrderedDict())
+        monkeypatch.setattr(parser_module, "_PARSE_CACHE_SIZE", 2)
+        sources = [
+            rf"\begin{{tikzpicture}}\draw (0,0) -- ({i},1);\end{{tikzpicture}}" for i in "123"
+        ]
+        parser.parse(sources[0])
+        parser.parse(sources[1])
+        parser.parse(sources[0])
+
+        parser.parse(sources[2])
+
+        assert list(parser_module._parse_memo) == [sources[0], sources[2]]
+
+    def test_concurrent_parsers_share_memo(self, monkeypatch):
+        """Test parsers in several threads keep the shared memo consistent."""
+        monkeypatch.setattr(parser_module, "_parse_memo", OrderedDict())
+        monkeypatch.setattr(parser_module, "_PARSE_CACHE_SIZE", 4)
+        sources = [
+            rf"\begin{{tikzpicture}}\draw (0,0) -- ({i},1);\end{{tikzpicture}}" for i in range(8)
+        ]
+        expected = [TikzParser()._parse_source(source) for source in sources]
+
+        def parse_all(thread_parser):
+            return [thread_parser.parse(source) for source in sources * 5]
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            results = list(pool.map(parse_all, [TikzParser() for _ in range(4)]))
+
+        assert all(result == expected * 5 for result in results)
+        assert len(parser_module._parse_memo) == 4
+
+
+class TestNodeLayout:
+    """Test AST node memory layout."""
+
+    def test_nodes_are_slotted(self, parser):
+        """Test parsed nodes carry no per-instance __dict__."""
+        ast = parser.parse(_SIMPLE_LINE)
+        draw = ast.statements[0]
+        nodes = [ast, draw, draw.path, draw.path.segments[0], draw.path.segments[0].destination]
+        assert not any(hasattr(node, "__dict__") for node in nodes)
+
+    def test_path_sequences_are_tuples(self, parser):
+        """Test parsed segments and coordinate values are frozen into tuples."""
+        ast = parser.parse(r"\begin{tikzpicture}\draw (0,0) -- (90:1) -- cycle;\end{tikzpicture}")
+        path = ast.statements[0].path
+        assert isinstance(path.segments, tuple)
+        assert [seg.destination.values for seg in path.segments[:2]] == [(0.0, 0.0), (90.0, 1.0)]
+
+    def test_control_points_are_tuples(self, parser):
+        """Test Bezier controls are tuples and plain segments share the empty tuple."""
+        tikz = (
+            r"\begin{tikzpicture}\draw (0,0) .. controls (1,1) and (2,1) .. (3,0);\end{tikzpicture}"
+        )
+        start, curve = parser.parse(tikz).statements[0].path.segments
+        assert curve.operation["points"] == (
+            Coordinate.cartesian(1.0, 1.0),
+            Coordinate.cartesian(2.0, 1.0),
+        )
+        assert start.control_points is curve.control_points == ()
+
+    def test_slots_backport(self):
+        """Test the pre-3.10 slots backport keeps dataclass behaviour."""
+        base = _slotted_dataclass(type("Base", (), {}))
+
+        @_slotted_dataclass
+        class Leaf(base):
+            kind: str
+            items: List[Any] = field(default_factory=list)
+            label: Optional[str] = None
+
+        leaf = Leaf("x")
+
+        assert not hasattr(leaf, "__dict__")
+        assert leaf == Leaf("x", [], None)
+        assert repr(leaf).endswith("Leaf(kind='x', items=[], label=None)")
+        assert Leaf("y").items is not leaf.items
+        with pytest.raises(AttributeError):
+            leaf.extra = 1
+
+
+class TestLazyExports:
+    """Test the package exports are only imported when accessed."""
+
+    def test_ast_nodes_import_skips_parser_and_converter(self):
+        """Test importing the AST nodes loads neither Lark nor the SVG package."""
+        code = (
+            "import sys, tikz2svg.parser.ast_nodes, tikz2svg;"
+            "print(sorted(m for m in ('lark', 'tikz2svg.svg') if m in sys.modules));"
+            "tikz2svg.SVGConverter;"
+            "print('tikz2svg.svg' in sys.modules)"
+        )
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+
+        assert result.stdout.split("\n")[:2] == ["[]", "True"]
+
+    def test_unknown_attribute_raises(self):
+        """Test names outside the lazy exports still raise AttributeError."""
+        import tikz2svg.parser
+
+        assert tikz2svg.parser.TikzParser is TikzParser
+        assert not hasattr(tikz2svg.parser, "Missing")
@@ -5,20 +5,28 @@ import pytest
 from tikz2svg.evaluator.math_eval import MathEvaluator
 from tikz2svg.parser.ast_nodes import Coordinate, Path, PathSegment
 from tikz2svg.svg.coordinate_resolver import CoordinateResolver
-from tikz2svg.svg.geometry import CoordinateTransformer
+from tikz2svg.svg.geometry import make_transformer
 from tikz2svg.svg.path_renderer import PathRenderer
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def setup_renderer():
-    """Create PathRenderer with dependencies."""
+    """Create PathRenderer with dependencies, shared by the module."""
     evaluator = MathEvaluator()
-    transformer = CoordinateTransformer(scale=1.0, offset_x=250, offset_y=250)
+    transformer = make_transformer(scale=1.0, offset_x=250, offset_y=250)
     resolver = CoordinateResolver(transformer, evaluator, {})
     renderer = PathRenderer(resolver, transformer)
     return renderer, resolver, transformer
 
 
+@pytest.fixture(autouse=True)
+def reset_resolver(setup_renderer):
+    """Clear named coordinates and variables left by the previous test."""
+    _, resolver, _ = setup_renderer
+    resolver.named_coordinates.clear()
+    resolver.evaluator.context.variables.clear()
+
+
 def test_render_simple_line(setup_renderer):
     """Test rendering a simple line path."""
     renderer, resolver, transformer = setup_renderer
@@ -79,6 +87,17 @@ def test_render_circle_as_path(setup_renderer):
     assert result[2].startswith("A")
 
 
+def test_render_circle_as_path_commands(setup_renderer):
+    """Test the exact commands of a circle path."""
+    renderer, _, _ = setup_renderer
+
+    assert renderer._render_circle_as_path((100, 100.5), 50) == [
+        "M 50.00 100.5",
+        "A 50.00 50.00 0 1 0 150.00 100.5",
+        "A 50.00 50.00 0 1 0 50.00 100.5",
+    ]
+
+
 def test_render_circle_operation(setup_renderer):
     """Test circle operation in path."""
     renderer, _, _ = setup_renderer
@@ -97,6 +116,32 @@ def test_render_circle_operation(setup_renderer):
     assert "A" in result
 
 
+def test_circle_reuses_resolved_center(setup_renderer, monkeypatch):
+    """Test a circle at the coordinate just drawn to resolves it only once."""
+    renderer, resolver, _ = setup_renderer
+    center = Coordinate(system="cartesian", values=("\\x", "1"))
+    resolver.evaluator.context.set_variable("x", 2)
+    path = Path(
+        segments=(
+            PathSegment(operation="start", destination=center),
+            PathSegment(operation={"_type": "circle", "spec": {"radius": 1.0}}, destination=center),
+        )
+    )
+    resolved = []
+    resolve = resolver.resolve
+    monkeypatch.setattr(
+        resolver, "resolve", lambda coord, *args: resolved.append(coord) or resolve(coord, *args)
+    )
+
+    result = renderer.render_path(path)
+
+    assert resolved == [center]
+    assert (
+        result
+        == "M 252.00 249.00 M 251.00 249.0 A 1.00 1.00 0 1 0 253.00 249.0 A 1.00 1.00 0 1 0 251.00 249.0"
+    )
+
+
 def test_render_bezier_cubic(setup_renderer):
     """Test cubic Bezier curve with two control points."""
     renderer, _, _ = setup_renderer
@@ -160,6 +205,14 @@ def test_render_simple_curve(setup_renderer):
     assert "50" in result
 
 
+def test_render_simple_curve_exact(setup_renderer):
+    """Test curve and fallback line commands are formatted to two decimals."""
+    renderer, _, _ = setup_renderer
+
+    assert renderer._render_simple_curve(100, 50.005, (0, 0)) == "Q 50.00 25.00 100.00 50.01"
+    assert renderer._render_simple_curve(1.5, -2, None) == "L 1.50 -2.00"
+
+
 def test_render_simple_curve_no_current_pos(setup_renderer):
     """Test simple curve falls back to line without current position."""
     renderer, _, _ = setup_renderer
@@ -226,6 +279,18 @@ def test_render_rectangle(setup_renderer):
     assert result[3] == "Z"  # Close path
 
 
+def test_render_rectangle_commands(setup_renderer):
+    """Test the exact commands of a rectangle path."""
+    renderer, _, _ = setup_renderer
+
+    assert renderer._render_rectangle(1, 2, (3.333, 4)) == [
+        "L 1.00 4.00",
+        "L 1.00 2.00",
+        "L 3.33 2.00",
+        "Z",
+    ]
+
+
 def test_render_rectangle_no_current_pos(setup_renderer):
     """Test rectangle without current position returns empty."""
     renderer, _, _ = setup_renderer
@@ -249,6 +314,27 @@ def test_render_grid(setup_renderer):
     assert any("L" in cmd for cmd in result)
 
 
+def test_render_grid_lines(setup_renderer):
+    """Test grid emits one vertical and horizontal line per step, ends included."""
+    renderer, _, _ = setup_renderer
+
+    # Default step is 28.35 at scale 1.0
+    result = renderer._render_grid(56.7, 28.35, (0, 0))
+
+    assert result == [
+        "M 0.00 0.00",
+        "L 0.00 28.35",
+        "M 28.35 0.00",
+        "L 28.35 28.35",
+        "M 56.70 0.00",
+        "L 56.70 28.35",
+        "M 0.00 0.00",
+        "L 56.70 0.00",
+        "M 0.00 28.35",
+        "L 56.70 28.35",
+    ]
+
+
 def test_render_grid_no_current_pos(setup_renderer):
     """Test grid without current position returns empty."""
     renderer, _, _ = setup_renderer
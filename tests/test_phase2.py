@@ -3,14 +3,9 @@
 import pytest
 
 from tikz2svg.parser.ast_nodes import *
-from tikz2svg.parser.parser import TikzParser
 from tikz2svg.svg.converter import SVGConverter
 
-
-@pytest.fixture
-def parser():
-    """Create parser instance."""
-    return TikzParser()
+from .helpers import assert_svg_ok
 
 
 @pytest.fixture
@@ -62,8 +57,7 @@ class TestArcs:
         ast = parser.parse(tikz)
         svg = converter.convert(ast)
 
-        assert "<svg" in svg
-        assert "<path" in svg
+        assert_svg_ok(svg, min_paths=1)
 
     def test_arc_with_options(self, parser, converter):
         """Test arc with radius options."""
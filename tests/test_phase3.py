@@ -2,100 +2,47 @@
 
 import pytest
 
-from tikz2svg.parser.ast_nodes import *
-from tikz2svg.parser.parser import TikzParser
-from tikz2svg.svg.converter import SVGConverter
+from .helpers import assert_svg_ok
 
-
-@pytest.fixture
-def parser():
-    """Create parser instance."""
-    return TikzParser()
-
-
-@pytest.fixture
-def converter():
-    """Create converter instance."""
-    return SVGConverter()
+# Line from the origin to the coordinate under test
+_LINE_TO = r"\begin{tikzpicture}\draw (0,0) -- %s;\end{tikzpicture}"
 
 
 class TestBasicArithmetic:
     """Test basic arithmetic operations."""
 
-    def test_addition_in_coordinate(self, parser, converter):
-        """Test addition in coordinates."""
-        tikz = r"\begin{tikzpicture}\draw (0,0) -- (1+1,2);\end{tikzpicture}"
-        ast = parser.parse(tikz)
-        svg = converter.convert(ast)
-
-        assert "<svg" in svg
-        assert "<path" in svg
-
-    def test_subtraction_in_coordinate(self, parser, converter):
-        """Test subtraction in coordinates."""
-        tikz = r"\begin{tikzpicture}\draw (0,0) -- (3-1,4-2);\end{tikzpicture}"
-        ast = parser.parse(tikz)
-        svg = converter.convert(ast)
-
-        assert "<svg" in svg
+    @pytest.mark.parametrize(
+        "coordinate",
+        [
+            pytest.param("(1+1,2)", id="addition"),
+            pytest.param("(3-1,4-2)", id="subtraction"),
+            pytest.param("(2*3,1*5)", id="multiplication"),
+            pytest.param("(6/2,8/4)", id="division"),
+            pytest.param("(2*3+1,10/2-1)", id="mixed"),
+        ],
+    )
+    def test_arithmetic_in_coordinate(self, render, coordinate):
+        """Test arithmetic expressions in coordinates."""
+        svg = render(_LINE_TO % coordinate).svg
 
-    def test_multiplication_in_coordinate(self, parser, converter):
-        """Test multiplication in coordinates."""
-        tikz = r"\begin{tikzpicture}\draw (0,0) -- (2*3,1*5);\end{tikzpicture}"
-        ast = parser.parse(tikz)
-        svg = converter.convert(ast)
-
-        assert "<svg" in svg
-
-    def test_division_in_coordinate(self, parser, converter):
-        """Test division in coordinates."""
-        tikz = r"\begin{tikzpicture}\draw (0,0) -- (6/2,8/4);\end{tikzpicture}"
-        ast = parser.parse(tikz)
-        svg = converter.convert(ast)
-
-        assert "<svg" in svg
-
-    def test_mixed_operations(self, parser, converter):
-        """Test mixed arithmetic operations."""
-        tikz = r"\begin{tikzpicture}\draw (0,0) -- (2*3+1,10/2-1);\end{tikzpicture}"
-        ast = parser.parse(tikz)
-        svg = converter.convert(ast)
-
-        assert "<svg" in svg
+        assert_svg_ok(svg, min_paths=1)
 
 
 class TestMathFunctions:
     """Test mathematical functions."""
 
-    def test_sqrt_function(self, parser, converter):
-        """Test sqrt function."""
-        tikz = r"\begin{tikzpicture}\draw (0,0) -- (sqrt(4),sqrt(9));\end{tikzpicture}"
-        ast = parser.parse(tikz)
-        svg = converter.convert(ast)
-
-        assert "<svg" in svg
-
-    def test_sin_function(self, parser, converter):
-        """Test sin function."""
-        tikz = r"\begin{tikzpicture}\draw (0,0) -- (sin(30),sin(90));\end{tikzpicture}"
-        ast = parser.parse(tikz)
-        svg = converter.convert(ast)
-
-        assert "<svg" in svg
-
-    def test_cos_function(self, parser, converter):
-        """Test cos function."""
-        tikz = r"\begin{tikzpicture}\draw (0,0) -- (cos(0),cos(90));\end{tikzpicture}"
-        ast = parser.parse(tikz)
-        svg = converter.convert(ast)
-
-        assert "<svg" in svg
-
-    def test_tan_function(self, parser, converter):
-        """Test tan function."""
-        tikz = r"\begin{tikzpicture}\draw (0,0) -- (tan(45),1);\end{tikzpicture}"
-        ast = parser.parse(tikz)
-        svg = converter.convert(ast)
+    @pytest.mark.parametrize(
+        "coordinate",
+        [
+            pytest.param("(sqrt(4),sqrt(9))", id="sqrt"),
+            pytest.param("(sin(30),sin(90))", id="sin"),
+            pytest.param("(cos(0),cos(90))", id="cos"),
+            pytest.param("(tan(45),1)", id="tan"),
+        ],
+    )
+    def test_function_in_coordinate(self, render, coordinate):
+        """Test math functions in coordinates."""
+        svg = render(_LINE_TO % coordinate).svg
 
         assert "<svg" in svg
 
@@ -103,7 +50,7 @@ class TestMathFunctions:
 class TestVariables:
     """Test variable definitions and usage."""
 
-    def test_pgfmathsetmacro(self, parser, converter):
+    def test_pgfmathsetmacro(self, render):
         """Test pgfmathsetmacro variable definition."""
         tikz = r"""
         \begin{tikzpicture}
@@ -111,12 +58,25 @@ class TestVariables:
         \draw (0,0) circle (\r);
         \end{tikzpicture}
         """
-        ast = parser.parse(tikz)
-        svg = converter.convert(ast)
+        svg = render(tikz).svg
 
         assert "<svg" in svg
 
-    def test_variable_in_coordinate(self, parser, converter):
+    def test_pgfmathsetmacro_body_kept_verbatim(self, parser, converter):
+        """Test functions, parentheses and references survive into the macro body."""
+        tikz = (
+            r"\begin{tikzpicture}\pgfmathsetmacro{\a}{3}"
+            r"\pgfmathsetmacro{\c}{sqrt(\a*\a + 16)}\pgfmathsetmacro{\d}{(1+2)*3}"
+            r"\end{tikzpicture}"
+        )
+        ast = parser.parse(tikz)
+        converter.convert(ast)
+
+        assert [stmt.body for stmt in ast.statements] == ["3", r"sqrt(\a*\a + 16)", "(1+2)*3"]
+        assert converter.context.get_variable("c") == 5.0
+        assert converter.context.get_variable("d") == 9.0
+
+    def test_variable_in_coordinate(self, render):
         """Test variable usage in coordinates."""
         tikz = r"""
         \begin{tikzpicture}
@@ -125,12 +85,11 @@ class TestVariables:
         \draw (0,0) -- (\x,\y);
         \end{tikzpicture}
         """
-        ast = parser.parse(tikz)
-        svg = converter.convert(ast)
+        svg = render(tikz).svg
 
         assert "<svg" in svg
 
-    def test_variable_with_expression(self, parser, converter):
+    def test_variable_with_expression(self, render):
         """Test variable with mathematical expression."""
         tikz = r"""
         \begin{tikzpicture}
@@ -138,12 +97,11 @@ class TestVariables:
         \draw (0,0) circle (\r);
         \end{tikzpicture}
         """
-        ast = parser.parse(tikz)
-        svg = converter.convert(ast)
+        svg = render(tikz).svg
 
         assert "<svg" in svg
 
-    def test_variable_arithmetic(self, parser, converter):
+    def test_variable_arithmetic(self, render):
         """Test arithmetic with variables."""
         tikz = r"""
         \begin{tikzpicture}
@@ -151,8 +109,7 @@ class TestVariables:
         \draw (0,0) -- (2*\r,\r+1);
         \end{tikzpicture}
         """
-        ast = parser.parse(tikz)
-        svg = converter.convert(ast)
+        svg = render(tikz).svg
 
         assert "<svg" in svg
 
@@ -160,23 +117,21 @@ class TestVariables:
 class TestComplexExpressions:
     """Test complex mathematical expressions."""
 
-    def test_nested_functions(self, parser, converter):
+    def test_nested_functions(self, render):
         """Test nested function calls."""
         tikz = r"\begin{tikzpicture}\draw (0,0) -- (sqrt(sin(30)),1);\end{tikzpicture}"
-        ast = parser.parse(tikz)
-        svg = converter.convert(ast)
+        svg = render(tikz).svg
 
         assert "<svg" in svg
 
-    def test_parentheses(self, parser, converter):
+    def test_parentheses(self, render):
         """Test parentheses in expressions."""
         tikz = r"\begin{tikzpicture}\draw (0,0) -- ((2+3)*4,(10-5)/2);\end{tikzpicture}"
-        ast = parser.parse(tikz)
-        svg = converter.convert(ast)
+        svg = render(tikz).svg
 
         assert "<svg" in svg
 
-    def test_expression_in_options(self, parser, converter):
+    def test_expression_in_options(self, render):
         """Test expressions in options."""
         tikz = r"""
         \begin{tikzpicture}
@@ -184,8 +139,7 @@ class TestComplexExpressions:
         \draw[line width=\w] (0,0) -- (1,1);
         \end{tikzpicture}
         """
-        ast = parser.parse(tikz)
-        svg = converter.convert(ast)
+        svg = render(tikz).svg
 
         assert "<svg" in svg
 
@@ -193,7 +147,7 @@ class TestComplexExpressions:
 class TestIntegration:
     """Integration tests combining multiple features."""
 
-    def test_complex_drawing_with_math(self, parser, converter):
+    def test_complex_drawing_with_math(self, render):
         """Test complex drawing with mathematical expressions."""
         tikz = r"""
         \begin{tikzpicture}
@@ -203,13 +157,12 @@ class TestIntegration:
         \draw (0,0) circle (\r);
         \end{tikzpicture}
         """
-        ast = parser.parse(tikz)
-        svg = converter.convert(ast)
+        svg, paths = render(tikz)
 
         assert "<svg" in svg
-        assert svg.count("<path") >= 2
+        assert paths >= 2
 
-    def test_multiple_variables(self, parser, converter):
+    def test_multiple_variables(self, render):
         """Test multiple variable definitions."""
         tikz = r"""
         \begin{tikzpicture}
@@ -219,7 +172,6 @@ class TestIntegration:
         \draw (0,0) -- (\a,0) -- (\a,\b) -- cycle;
         \end{tikzpicture}
         """
-        ast = parser.parse(tikz)
-        svg = converter.convert(ast)
+        svg = render(tikz).svg
 
         assert "<svg" in svg
@@ -1,80 +1,59 @@
 """Tests for Phase 4 features: Control Flow."""
 
-import pytest
-
-from tikz2svg.parser.ast_nodes import *
-from tikz2svg.parser.parser import TikzParser
-from tikz2svg.svg.converter import SVGConverter
-
-
-@pytest.fixture
-def parser():
-    """Create parser instance."""
-    return TikzParser()
+from array import array
 
-
-@pytest.fixture
-def converter():
-    """Create converter instance."""
-    return SVGConverter()
+import pytest
 
 
 class TestForeachBasic:
     """Test basic foreach loop functionality."""
 
-    def test_foreach_simple_list(self, parser, converter):
-        """Test foreach with simple number list."""
-        tikz = r"""
-        \begin{tikzpicture}
-        \foreach \i in {1,2,3} {
-            \draw (\i,0) circle (0.1);
-        }
-        \end{tikzpicture}
-        """
-        ast = parser.parse(tikz)
-        svg = converter.convert(ast)
+    @pytest.mark.parametrize(
+        "values,body,expected_paths",
+        [
+            pytest.param("{1,2,3}", r"\draw (\i,0) circle (0.1);", 3, id="list"),
+            pytest.param("{0,...,4}", r"\draw (\i,0) -- (\i,1);", 5, id="range"),
+            pytest.param("{0,2,...,8}", r"\draw (\i,0) circle (0.2);", 5, id="range-with-step"),
+        ],
+    )
+    def test_foreach_draws_each_value(self, render, values, body, expected_paths):
+        """Test foreach over a list or range draws one path per value."""
+        svg, paths = render(
+            rf"\begin{{tikzpicture}}\foreach \i in {values} {{{body}}}\end{{tikzpicture}}"
+        )
 
         assert "<svg" in svg
-        # Should have 3 circles
-        assert svg.count("<path") >= 3
+        assert paths >= expected_paths
 
-    def test_foreach_range(self, parser, converter):
-        """Test foreach with range notation."""
-        tikz = r"""
-        \begin{tikzpicture}
-        \foreach \i in {0,...,4} {
-            \draw (\i,0) -- (\i,1);
-        }
-        \end{tikzpicture}
-        """
-        ast = parser.parse(tikz)
-        svg = converter.convert(ast)
+    def test_foreach_range_values_are_packed(self, parser):
+        """Test expanded numeric ranges are stored as a float array."""
+        tikz = r"\begin{tikzpicture}\foreach \i in {0,2,...,8} {\draw (\i,0) -- (1,1);}\end{tikzpicture}"
+        loop = parser.parse(tikz).statements[0]
 
-        assert "<svg" in svg
-        # Should have 5 lines
-        assert svg.count("<path") >= 5
+        assert isinstance(loop.values, array)
+        assert list(loop.values) == [0.0, 2.0, 4.0, 6.0, 8.0]
 
-    def test_foreach_range_with_step(self, parser, converter):
-        """Test foreach with explicit step."""
-        tikz = r"""
-        \begin{tikzpicture}
-        \foreach \i in {0,2,...,8} {
-            \draw (\i,0) circle (0.2);
-        }
-        \end{tikzpicture}
-        """
-        ast = parser.parse(tikz)
-        svg = converter.convert(ast)
+    @pytest.mark.parametrize(
+        "values,expected",
+        [
+            pytest.param("{0,0.1,...,1}", 11, id="fractional-step"),
+            pytest.param("{5,...,1}", 0, id="empty"),
+            pytest.param("{5,4,...,1}", 5, id="descending"),
+        ],
+    )
+    def test_foreach_range_length(self, parser, values, expected):
+        """Test ranges are sized exactly and end on their last value."""
+        tikz = rf"\begin{{tikzpicture}}\foreach \i in {values} {{\draw (\i,0) -- (1,1);}}\end{{tikzpicture}}"
+        loop = parser.parse(tikz).statements[0]
 
-        assert "<svg" in svg
-        # Should have 5 circles (0,2,4,6,8)
-        assert svg.count("<path") >= 5
+        assert len(loop.values) == expected
+        assert list(loop.values[-1:]) == ([1.0] if expected else [])
 
 
 class TestForeachVariables:
     """Test foreach loop variable substitution."""
 
-    def test_variable_in_coordinate(self, parser, converter):
+    def test_variable_in_coordinate(self, render):
         """Test loop variable used in coordinates."""
         tikz = r"""
         \begin{tikzpicture}
@@ -83,13 +62,27 @@ class TestForeachVariables:
         }
         \end{tikzpicture}
         """
-        ast = parser.parse(tikz)
-        svg = converter.convert(ast)
+        svg, paths = render(tikz)
 
         assert "<svg" in svg
-        assert svg.count("<path") >= 3
+        assert paths >= 3
+
+    def test_variable_values_reach_coordinates(self, render):
+        """Test each iteration resolves coordinates with its own variable value."""
+        tikz = r"""
+        \begin{tikzpicture}
+        \foreach \i in {1,2} {
+            \draw (\i,0) -- (0,\i);
+        }
+        \end{tikzpicture}
+        """
+        svg = render(tikz).svg
+
+        # One unit is 28.35px from the 250,250 origin
+        assert 'd="M 278.35 250.00 L 250.00 221.65"' in svg
+        assert 'd="M 306.70 250.00 L 250.00 193.30"' in svg
 
-    def test_variable_in_expression(self, parser, converter):
+    def test_variable_in_expression(self, render):
         """Test loop variable in mathematical expression."""
         tikz = r"""
         \begin{tikzpicture}
@@ -98,13 +91,12 @@ class TestForeachVariables:
         }
         \end{tikzpicture}
         """
-        ast = parser.parse(tikz)
-        svg = converter.convert(ast)
+        svg, paths = render(tikz)
 
         assert "<svg" in svg
-        assert svg.count("<path") >= 3
+        assert paths >= 3
 
-    def test_multiple_variables(self, parser, converter):
+    def test_multiple_variables(self, render):
         """Test foreach with multiple variables."""
         tikz = r"""
         \begin{tikzpicture}
@@ -113,17 +105,16 @@ class TestForeachVariables:
         }
         \end{tikzpicture}
         """
-        ast = parser.parse(tikz)
-        svg = converter.convert(ast)
+        svg, paths = render(tikz)
 
         assert "<svg" in svg
-        assert svg.count("<path") >= 3
+        assert paths >= 3
 
 
 class TestForeachEvaluate:
     """Test foreach with evaluate clause."""
 
-    def test_evaluate_basic(self, parser, converter):
+    def test_evaluate_basic(self, render):
         """Test basic evaluate clause."""
         tikz = r"""
         \begin{tikzpicture}
@@ -132,13 +123,12 @@ class TestForeachEvaluate:
         }
         \end{tikzpicture}
         """
-        ast = parser.parse(tikz)
-        svg = converter.convert(ast)
+        svg = render(tikz).svg
 
         assert "<svg" in svg
         # Circles should be at x=0, x=2, x=4
 
-    def test_evaluate_with_expression(self, parser, converter):
+    def test_evaluate_with_expression(self, render):
         """Test evaluate with complex expression."""
         tikz = r"""
         \begin{tikzpicture}
@@ -147,8 +137,7 @@ class TestForeachEvaluate:
         }
         \end{tikzpicture}
         """
-        ast = parser.parse(tikz)
-        svg = converter.convert(ast)
+        svg = render(tikz).svg
 
         assert "<svg" in svg
 
@@ -156,7 +145,7 @@ class TestForeachEvaluate:
 class TestNestedLoops:
     """Test nested foreach loops."""
 
-    def test_nested_loops_simple(self, parser, converter):
+    def test_nested_loops_simple(self, render):
         """Test simple nested loops."""
         tikz = r"""
         \begin{tikzpicture}
@@ -167,14 +156,13 @@ class TestNestedLoops:
         }
         \end{tikzpicture}
         """
-        ast = parser.parse(tikz)
-        svg = converter.convert(ast)
+        svg, paths = render(tikz)
 
         assert "<svg" in svg
         # Should have 4 circles (2x2 grid)
-        assert svg.count("<path") >= 4
+        assert paths >= 4
 
-    def test_nested_loops_with_variables(self, parser, converter):
+    def test_nested_loops_with_variables(self, render):
         """Test nested loops using both loop variables."""
         tikz = r"""
         \begin{tikzpicture}
@@ -185,18 +173,17 @@ class TestNestedLoops:
         }
         \end{tikzpicture}
         """
-        ast = parser.parse(tikz)
-        svg = converter.convert(ast)
+        svg, paths = render(tikz)
 
         assert "<svg" in svg
         # Should have 6 lines (3x2)
-        assert svg.count("<path") >= 6
+        assert paths >= 6
 
 
 class TestIntegration:
     """Integration tests combining multiple features."""
 
-    def test_loop_with_math_and_variables(self, parser, converter):
+    def test_loop_with_math_and_variables(self, render):
         """Test loop with mathematical expressions and variables."""
         tikz = r"""
         \begin{tikzpicture}
@@ -206,12 +193,11 @@ class TestIntegration:
         }
         \end{tikzpicture}
         """
-        ast = parser.parse(tikz)
-        svg = converter.convert(ast)
+        svg = render(tikz).svg
 
         assert "<svg" in svg
 
-    def test_complex_foreach_pattern(self, parser, converter):
+    def test_complex_foreach_pattern(self, render):
         """Test complex foreach usage."""
         tikz = r"""
         \begin{tikzpicture}
@@ -220,13 +206,12 @@ class TestIntegration:
         }
         \end{tikzpicture}
         """
-        ast = parser.parse(tikz)
-        svg = converter.convert(ast)
+        svg = render(tikz).svg
 
         assert "<svg" in svg
         # Should have 8 lines radiating from origin
 
-    def test_grid_with_foreach(self, parser, converter):
+    def test_grid_with_foreach(self, render):
         """Test creating a grid with foreach."""
         tikz = r"""
         \begin{tikzpicture}
@@ -237,9 +222,8 @@ class TestIntegration:
         }
         \end{tikzpicture}
         """
-        ast = parser.parse(tikz)
-        svg = converter.convert(ast)
+        svg, paths = render(tikz)
 
         assert "<svg" in svg
         # Should have 16 circles (4x4 grid)
-        assert svg.count("<path") >= 16
+        assert paths >= 16
@@ -2,40 +2,24 @@
 
 import pytest
 
-from tikz2svg.parser.ast_nodes import *
-from tikz2svg.parser.parser import TikzParser
-from tikz2svg.svg.converter import SVGConverter
-
-
-@pytest.fixture
-def parser():
-    """Create parser instance."""
-    return TikzParser()
-
-
-@pytest.fixture
-def converter():
-    """Create converter instance."""
-    return SVGConverter()
+from .helpers import assert_svg_ok
 
 
 class TestPolarCoordinates:
     """Test polar coordinate system."""
 
-    def test_polar_basic(self, parser, converter):
+    def test_polar_basic(self, render):
         """Test basic polar coordinates."""
         tikz = r"""
         \begin{tikzpicture}
         \draw (0:1) -- (90:1) -- (180:1) -- (270:1) -- cycle;
         \end{tikzpicture}
         """
-        ast = parser.parse(tikz)
-        svg = converter.convert(ast)
+        svg = render(tikz).svg
 
-        assert "<svg" in svg
-        assert "<path" in svg
+        assert_svg_ok(svg, min_paths=1)
 
-    def test_polar_with_expressions(self, parser, converter):
+    def test_polar_with_expressions(self, render):
         """Test polar coordinates with mathematical expressions."""
         tikz = r"""
         \begin{tikzpicture}
@@ -44,14 +28,13 @@ class TestPolarCoordinates:
         }
         \end{tikzpicture}
         """
-        ast = parser.parse(tikz)
-        svg = converter.convert(ast)
+        svg, paths = render(tikz)
 
         assert "<svg" in svg
         # Should have 6 lines
-        assert svg.count("<path") >= 6
+        assert paths >= 6
 
-    def test_polar_with_variable_radius(self, parser, converter):
+    def test_polar_with_variable_radius(self, render):
         """Test polar coordinates with variable radius."""
         tikz = r"""
         \begin{tikzpicture}
@@ -59,8 +42,7 @@ class TestPolarCoordinates:
         \draw (45:\r) circle (0.1);
         \end{tikzpicture}
         """
-        ast = parser.parse(tikz)
-        svg = converter.convert(ast)
+        svg = render(tikz).svg
 
         assert "<svg" in svg
 
@@ -68,7 +50,7 @@ class TestPolarCoordinates:
 class TestNamedCoordinates:
     """Test named coordinate system."""
 
-    def test_named_coordinate_definition(self, parser, converter):
+    def test_named_coordinate_definition(self, render):
         """Test defining and using named coordinates."""
         tikz = r"""
         \begin{tikzpicture}
@@ -77,13 +59,11 @@ class TestNamedCoordinates:
         \draw (A) -- (B);
         \end{tikzpicture}
         """
-        ast = parser.parse(tikz)
-        svg = converter.convert(ast)
+        svg = render(tikz).svg
 
-        assert "<svg" in svg
-        assert "<path" in svg
+        assert_svg_ok(svg, min_paths=1)
 
-    def test_named_coordinates_in_loop(self, parser, converter):
+    def test_named_coordinates_in_loop(self, render):
         """Test named coordinates created in loops."""
         tikz = r"""
         \begin{tikzpicture}
@@ -93,12 +73,11 @@ class TestNamedCoordinates:
         \draw (P0) -- (P1) -- (P2);
         \end{tikzpicture}
         """
-        ast = parser.parse(tikz)
-        svg = converter.convert(ast)
+        svg = render(tikz).svg
 
         assert "<svg" in svg
 
-    def test_node_as_coordinate(self, parser, converter):
+    def test_node_as_coordinate(self, render):
         """Test using node names as coordinates."""
         tikz = r"""
         \begin{tikzpicture}
@@ -107,8 +86,7 @@ class TestNamedCoordinates:
         \draw (A) -- (B);
         \end{tikzpicture}
         """
-        ast = parser.parse(tikz)
-        svg = converter.convert(ast)
+        svg = render(tikz).svg
 
         assert "<svg" in svg
 
@@ -116,102 +94,64 @@ class TestNamedCoordinates:
 class TestRelativeCoordinates:
     """Test relative coordinate system."""
 
-    def test_relative_plus_plus(self, parser, converter):
-        """Test ++ relative coordinates (updates current position)."""
-        tikz = r"""
-        \begin{tikzpicture}
-        \draw (0,0) -- ++(1,0) -- ++(0,1) -- ++(-1,0) -- cycle;
-        \end{tikzpicture}
-        """
-        ast = parser.parse(tikz)
-        svg = converter.convert(ast)
-
-        assert "<svg" in svg
-        assert "<path" in svg
-
-    def test_relative_plus(self, parser, converter):
-        """Test + relative coordinates (doesn't update position)."""
-        tikz = r"""
-        \begin{tikzpicture}
-        \draw (1,1) -- +(0,1) -- +(1,0);
-        \end{tikzpicture}
-        """
-        ast = parser.parse(tikz)
-        svg = converter.convert(ast)
-
-        assert "<svg" in svg
-
-    def test_relative_mixed(self, parser, converter):
-        """Test mixing absolute and relative coordinates."""
-        tikz = r"""
-        \begin{tikzpicture}
-        \draw (0,0) -- ++(1,1) -- (2,0) -- ++(0,1);
-        \end{tikzpicture}
-        """
-        ast = parser.parse(tikz)
-        svg = converter.convert(ast)
-
-        assert "<svg" in svg
+    @pytest.mark.parametrize(
+        "path",
+        [
+            # ++ updates the current position, + does not
+            pytest.param("(0,0) -- ++(1,0) -- ++(0,1) -- ++(-1,0) -- cycle", id="plus-plus"),
+            pytest.param("(1,1) -- +(0,1) -- +(1,0)", id="plus"),
+            pytest.param("(0,0) -- ++(1,1) -- (2,0) -- ++(0,1)", id="mixed"),
+            pytest.param("(0,0) -- ++(0:1) -- ++(90:1) -- ++(180:1)", id="polar"),
+        ],
+    )
+    def test_relative_path(self, render, path):
+        """Test paths using relative coordinates."""
+        svg = render(rf"\begin{{tikzpicture}}\draw {path};\end{{tikzpicture}}").svg
 
-    def test_relative_polar(self, parser, converter):
-        """Test relative coordinates with polar system."""
-        tikz = r"""
-        \begin{tikzpicture}
-        \draw (0,0) -- ++(0:1) -- ++(90:1) -- ++(180:1);
-        \end{tikzpicture}
-        """
-        ast = parser.parse(tikz)
-        svg = converter.convert(ast)
-
-        assert "<svg" in svg
+        assert_svg_ok(svg, min_paths=1)
 
 
 class TestNodeAnchors:
     """Test node anchor positions."""
 
-    def test_cardinal_anchors(self, parser, converter):
-        """Test north, south, east, west anchors."""
-        tikz = r"""
-        \begin{tikzpicture}
-        \node[draw] (box) at (0,0) {Box};
-        \draw (box.north) -- (0,1);
-        \draw (box.south) -- (0,-1);
-        \draw (box.east) -- (1,0);
-        \draw (box.west) -- (-1,0);
-        \end{tikzpicture}
-        """
-        ast = parser.parse(tikz)
-        svg = converter.convert(ast)
-
-        assert "<svg" in svg
-
-    def test_corner_anchors(self, parser, converter):
-        """Test north east, north west, etc. anchors."""
-        tikz = r"""
-        \begin{tikzpicture}
-        \node[draw] (box) at (0,0) {Box};
-        \draw (box.north east) -- (1,1);
-        \draw (box.north west) -- (-1,1);
-        \draw (box.south east) -- (1,-1);
-        \draw (box.south west) -- (-1,-1);
-        \end{tikzpicture}
-        """
-        ast = parser.parse(tikz)
-        svg = converter.convert(ast)
-
-        assert "<svg" in svg
-
-    def test_center_anchor(self, parser, converter):
-        """Test center and default anchors."""
-        tikz = r"""
-        \begin{tikzpicture}
-        \node[draw] (box) at (1,1) {Text};
-        \draw (0,0) -- (box.center);
-        \draw (2,2) -- (box);
-        \end{tikzpicture}
-        """
-        ast = parser.parse(tikz)
-        svg = converter.convert(ast)
+    @pytest.mark.parametrize(
+        "at,draws",
+        [
+            pytest.param(
+                "(0,0)",
+                r"""
+                \draw (box.north) -- (0,1);
+                \draw (box.south) -- (0,-1);
+                \draw (box.east) -- (1,0);
+                \draw (box.west) -- (-1,0);
+                """,
+                id="cardinal",
+            ),
+            pytest.param(
+                "(0,0)",
+                r"""
+                \draw (box.north east) -- (1,1);
+                \draw (box.north west) -- (-1,1);
+                \draw (box.south east) -- (1,-1);
+                \draw (box.south west) -- (-1,-1);
+                """,
+                id="corner",
+            ),
+            pytest.param(
+                "(1,1)",
+                r"""
+                \draw (0,0) -- (box.center);
+                \draw (2,2) -- (box);
+                """,
+                id="center",
+            ),
+        ],
+    )
+    def test_anchors(self, render, at, draws):
+        """Test drawing to anchors of a named node."""
+        svg = render(
+            rf"\begin{{tikzpicture}}\node[draw] (box) at {at} {{Box}};{draws}\end{{tikzpicture}}"
+        ).svg
 
         assert "<svg" in svg
 
@@ -219,7 +159,7 @@ class TestNodeAnchors:
 class TestCoordinateCalculations:
     """Test coordinate calculations and modifiers."""
 
-    def test_calc_midpoint(self, parser, converter):
+    def test_calc_midpoint(self, render):
         """Test calculating midpoint between coordinates."""
         tikz = r"""
         \begin{tikzpicture}
@@ -228,12 +168,11 @@ class TestCoordinateCalculations:
         \draw (A) -- (B);
         \end{tikzpicture}
         """
-        ast = parser.parse(tikz)
-        svg = converter.convert(ast)
+        svg = render(tikz).svg
 
         assert "<svg" in svg
 
-    def test_perpendicular_coordinates(self, parser, converter):
+    def test_perpendicular_coordinates(self, render):
         """Test |- and -| path connectors."""
         tikz = r"""
         \begin{tikzpicture}
@@ -241,17 +180,16 @@ class TestCoordinateCalculations:
         \draw (0,0) |- (2,2);
         \end{tikzpicture}
         """
-        ast = parser.parse(tikz)
-        svg = converter.convert(ast)
+        svg, paths = render(tikz)
 
         assert "<svg" in svg
-        assert svg.count("<path") >= 2
+        assert paths >= 2
 
 
 class TestIntegration:
     """Integration tests combining coordinate systems."""
 
-    def test_mixed_coordinate_systems(self, parser, converter):
+    def test_mixed_coordinate_systems(self, render):
         """Test mixing different coordinate systems."""
         tikz = r"""
         \begin{tikzpicture}
@@ -259,12 +197,11 @@ class TestIntegration:
         \draw (A) -- ++(1,0) -- ++(90:1) -- (0,1);
         \end{tikzpicture}
         """
-        ast = parser.parse(tikz)
-        svg = converter.convert(ast)
+        svg = render(tikz).svg
 
         assert "<svg" in svg
 
-    def test_complex_shape_with_polar(self, parser, converter):
+    def test_complex_shape_with_polar(self, render):
         """Test complex shape using polar coordinates."""
         tikz = r"""
         \begin{tikzpicture}
@@ -273,19 +210,17 @@ class TestIntegration:
         }
         \end{tikzpicture}
         """
-        ast = parser.parse(tikz)
-        svg = converter.convert(ast)
+        svg = render(tikz).svg
 
         assert "<svg" in svg
 
-    def test_relative_with_foreach(self, parser, converter):
+    def test_relative_with_foreach(self, render):
         """Test relative coordinates in loops."""
         tikz = r"""
         \begin{tikzpicture}
         \draw (0,0) \foreach \i in {1,...,4} { -- ++(\i*0.5,0.5) };
         \end{tikzpicture}
         """
-        ast = parser.parse(tikz)
-        svg = converter.convert(ast)
+        svg = render(tikz).svg
 
         assert "<svg" in svg
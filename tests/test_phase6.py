@@ -2,60 +2,35 @@
 
 import pytest
 
-from tikz2svg.parser.ast_nodes import *
-from tikz2svg.parser.parser import TikzParser
-from tikz2svg.svg.converter import SVGConverter
+from .helpers import assert_svg_ok
 
-
-@pytest.fixture
-def parser():
-    """Create parser instance."""
-    return TikzParser()
-
-
-@pytest.fixture
-def converter():
-    """Create converter instance."""
-    return SVGConverter()
-
-
-class TestScopes:
-    """Test scope environment functionality."""
-
-    def test_basic_scope(self, parser, converter):
-        """Test basic scope creation."""
-        tikz = r"""
+_SCOPE_CASES = (
+    pytest.param(
+        r"""
         \begin{tikzpicture}
         \begin{scope}
             \draw (0,0) -- (1,1);
         \end{scope}
         \end{tikzpicture}
-        """
-        ast = parser.parse(tikz)
-        svg = converter.convert(ast)
-
-        assert "<svg" in svg
-        assert "<path" in svg
-
-    def test_scope_with_options(self, parser, converter):
-        """Test scope with style options."""
-        tikz = r"""
+        """,
+        id="basic_scope",
+    ),
+    # Both lines should inherit red color and thick style
+    pytest.param(
+        r"""
         \begin{tikzpicture}
         \begin{scope}[red,thick]
             \draw (0,0) -- (1,1);
             \draw (1,0) -- (0,1);
         \end{scope}
         \end{tikzpicture}
-        """
-        ast = parser.parse(tikz)
-        svg = converter.convert(ast)
-
-        assert "<svg" in svg
-        # Both lines should inherit red color and thick style
-
-    def test_nested_scopes(self, parser, converter):
-        """Test nested scopes with option inheritance."""
-        tikz = r"""
+        """,
+        id="scope_with_options",
+    ),
+    # Outer line should be red
+    # Inner line should be red and thick
+    pytest.param(
+        r"""
         \begin{tikzpicture}
         \begin{scope}[red]
             \draw (0,0) -- (1,0);
@@ -64,64 +39,47 @@ class TestScopes:
             \end{scope}
         \end{scope}
         \end{tikzpicture}
-        """
-        ast = parser.parse(tikz)
-        svg = converter.convert(ast)
-
-        assert "<svg" in svg
-        # Outer line should be red
-        # Inner line should be red and thick
-
-    def test_scope_option_override(self, parser, converter):
-        """Test that local options override scope options."""
-        tikz = r"""
+        """,
+        id="nested_scopes",
+    ),
+    # Line should be blue (local overrides scope)
+    pytest.param(
+        r"""
         \begin{tikzpicture}
         \begin{scope}[red]
             \draw[blue] (0,0) -- (1,1);
         \end{scope}
         \end{tikzpicture}
-        """
-        ast = parser.parse(tikz)
-        svg = converter.convert(ast)
-
-        assert "<svg" in svg
-        # Line should be blue (local overrides scope)
-
-    def test_scope_with_transformations(self, parser, converter):
-        """Test scope with transformation options."""
-        tikz = r"""
+        """,
+        id="scope_option_override",
+    ),
+    pytest.param(
+        r"""
         \begin{tikzpicture}
         \begin{scope}[scale=2]
             \draw (0,0) -- (1,1);
         \end{scope}
         \end{tikzpicture}
-        """
-        ast = parser.parse(tikz)
-        svg = converter.convert(ast)
-
-        assert "<svg" in svg
+        """,
+        id="scope_with_transformations",
+    ),
+)
 
 
-class TestClipping:
-    """Test clipping path functionality."""
-
-    def test_clip_simple(self, parser, converter):
-        """Test basic clipping path."""
-        tikz = r"""
+_CLIP_CASES = (
+    # Should have clipPath definition
+    pytest.param(
+        r"""
         \begin{tikzpicture}
         \clip (0,0) rectangle (2,2);
         \draw (0,0) -- (3,3);
         \end{tikzpicture}
-        """
-        ast = parser.parse(tikz)
-        svg = converter.convert(ast)
-
-        assert "<svg" in svg
-        # Should have clipPath definition
-
-    def test_clip_in_scope(self, parser, converter):
-        """Test clipping within a scope."""
-        tikz = r"""
+        """,
+        id="clip_simple",
+    ),
+    # First line should be clipped, second should not
+    pytest.param(
+        r"""
         \begin{tikzpicture}
         \begin{scope}
             \clip (0,0) circle (1);
@@ -129,48 +87,36 @@ class TestClipping:
         \end{scope}
         \draw (0,0) -- (2,-2);
         \end{tikzpicture}
-        """
-        ast = parser.parse(tikz)
-        svg = converter.convert(ast)
-
-        assert "<svg" in svg
-        # First line should be clipped, second should not
-
-    def test_clip_circle(self, parser, converter):
-        """Test clipping with circle."""
-        tikz = r"""
+        """,
+        id="clip_in_scope",
+    ),
+    pytest.param(
+        r"""
         \begin{tikzpicture}
         \clip (0,0) circle (1);
         \fill[red] (-2,-2) rectangle (2,2);
         \end{tikzpicture}
-        """
-        ast = parser.parse(tikz)
-        svg = converter.convert(ast)
+        """,
+        id="clip_circle",
+    ),
+)
 
-        assert "<svg" in svg
-
-
-class TestLayers:
-    """Test layer management functionality."""
 
-    def test_layer_declaration(self, parser, converter):
-        """Test layer declaration."""
-        tikz = r"""
+_LAYER_CASES = (
+    pytest.param(
+        r"""
         \begin{tikzpicture}
         \pgfdeclarelayer{background}
         \pgfdeclarelayer{foreground}
         \pgfsetlayers{background,main,foreground}
         \draw (0,0) -- (1,1);
         \end{tikzpicture}
-        """
-        ast = parser.parse(tikz)
-        svg = converter.convert(ast)
-
-        assert "<svg" in svg
-
-    def test_layer_usage(self, parser, converter):
-        """Test drawing on different layers."""
-        tikz = r"""
+        """,
+        id="layer_declaration",
+    ),
+    # Background should be rendered first
+    pytest.param(
+        r"""
         \begin{tikzpicture}
         \pgfdeclarelayer{background}
         \pgfsetlayers{background,main}
@@ -180,16 +126,11 @@ class TestLayers:
         \end{pgfonlayer}
         \draw (0,1) -- (1,0);
         \end{tikzpicture}
-        """
-        ast = parser.parse(tikz)
-        svg = converter.convert(ast)
-
-        assert "<svg" in svg
-        # Background should be rendered first
-
-    def test_nested_layers(self, parser, converter):
-        """Test multiple layer switches."""
-        tikz = r"""
+        """,
+        id="layer_usage",
+    ),
+    pytest.param(
+        r"""
         \begin{tikzpicture}
         \pgfdeclarelayer{back}
         \pgfdeclarelayer{front}
@@ -205,65 +146,49 @@ class TestLayers:
             \draw[green] (0,1) -- (1,0);
         \end{pgfonlayer}
         \end{tikzpicture}
-        """
-        ast = parser.parse(tikz)
-        svg = converter.convert(ast)
-
-        assert "<svg" in svg
+        """,
+        id="nested_layers",
+    ),
+)
 
 
-class TestStyleInheritance:
-    """Test style inheritance and composition."""
-
-    def test_style_definition(self, parser, converter):
-        """Test defining and using styles."""
-        tikz = r"""
+_STYLE_CASES = (
+    pytest.param(
+        r"""
         \begin{tikzpicture}[every node/.style={draw,circle}]
         \node at (0,0) {A};
         \node at (1,1) {B};
         \end{tikzpicture}
-        """
-        ast = parser.parse(tikz)
-        svg = converter.convert(ast)
-
-        assert "<svg" in svg
-
-    def test_scope_style_inheritance(self, parser, converter):
-        """Test that styles are inherited in scopes."""
-        tikz = r"""
+        """,
+        id="style_definition",
+    ),
+    pytest.param(
+        r"""
         \begin{tikzpicture}
         \tikzset{myline/.style={red,thick}}
         \begin{scope}
             \draw[myline] (0,0) -- (1,1);
         \end{scope}
         \end{tikzpicture}
-        """
-        ast = parser.parse(tikz)
-        svg = converter.convert(ast)
-
-        assert "<svg" in svg
-
-    def test_tikzpicture_default_options(self, parser, converter):
-        """Test default options on tikzpicture."""
-        tikz = r"""
+        """,
+        id="scope_style_inheritance",
+    ),
+    # Both lines should be thick and blue
+    pytest.param(
+        r"""
         \begin{tikzpicture}[thick,blue]
         \draw (0,0) -- (1,1);
         \draw (0,1) -- (1,0);
         \end{tikzpicture}
-        """
-        ast = parser.parse(tikz)
-        svg = converter.convert(ast)
-
-        assert "<svg" in svg
-        # Both lines should be thick and blue
-
+        """,
+        id="tikzpicture_default_options",
+    ),
+)
 
-class TestIntegration:
-    """Integration tests combining multiple advanced features."""
 
-    def test_scopes_and_clipping(self, parser, converter):
-        """Test scopes with clipping."""
-        tikz = r"""
+_INTEGRATION_CASES = (
+    pytest.param(
+        r"""
         \begin{tikzpicture}
         \begin{scope}[red]
             \clip (0,0) rectangle (1,1);
@@ -271,15 +196,11 @@ class TestIntegration:
         \end{scope}
         \draw[blue] (0,0) -- (2,-2);
         \end{tikzpicture}
-        """
-        ast = parser.parse(tikz)
-        svg = converter.convert(ast)
-
-        assert "<svg" in svg
-
-    def test_layers_and_scopes(self, parser, converter):
-        """Test layers within scopes."""
-        tikz = r"""
+        """,
+        id="scopes_and_clipping",
+    ),
+    pytest.param(
+        r"""
         \begin{tikzpicture}
         \pgfdeclarelayer{bg}
         \pgfsetlayers{bg,main}
@@ -291,15 +212,11 @@ class TestIntegration:
             \draw[red] (0,0) -- (2,2);
         \end{scope}
         \end{tikzpicture}
-        """
-        ast = parser.parse(tikz)
-        svg = converter.convert(ast)
-
-        assert "<svg" in svg
-
-    def test_complex_nesting(self, parser, converter):
-        """Test complex nesting of scopes and features."""
-        tikz = r"""
+        """,
+        id="layers_and_scopes",
+    ),
+    pytest.param(
+        r"""
         \begin{tikzpicture}[scale=1]
         \begin{scope}[red,thick]
             \draw (0,0) rectangle (2,2);
@@ -309,15 +226,11 @@ class TestIntegration:
             \end{scope}
         \end{scope}
         \end{tikzpicture}
-        """
-        ast = parser.parse(tikz)
-        svg = converter.convert(ast)
-
-        assert "<svg" in svg
-
-    def test_scope_with_loops(self, parser, converter):
-        """Test scopes with foreach loops."""
-        tikz = r"""
+        """,
+        id="complex_nesting",
+    ),
+    pytest.param(
+        r"""
         \begin{tikzpicture}
         \foreach \i in {0,...,2} {
             \begin{scope}[xshift=\i cm]
@@ -325,8 +238,52 @@ class TestIntegration:
             \end{scope}
         }
         \end{tikzpicture}
-        """
-        ast = parser.parse(tikz)
-        svg = converter.convert(ast)
+        """,
+        id="scope_with_loops",
+    ),
+)
+
+
+class TestScopes:
+    """Test scope environment functionality."""
+
+    @pytest.mark.parametrize("tikz", _SCOPE_CASES)
+    def test_scope(self, render, tikz):
+        """Test scope examples convert to SVG with their paths."""
+        assert_svg_ok(render(tikz).svg, min_paths=1)
+
+
+class TestClipping:
+    """Test clipping path functionality."""
+
+    @pytest.mark.parametrize("tikz", _CLIP_CASES)
+    def test_clip(self, render, tikz):
+        """Test clipping examples convert to SVG with their paths."""
+        assert_svg_ok(render(tikz).svg, min_paths=1)
+
+
+class TestLayers:
+    """Test layer management functionality."""
+
+    @pytest.mark.parametrize("tikz", _LAYER_CASES)
+    def test_layers(self, render, tikz):
+        """Test layer examples convert to SVG with their paths."""
+        assert_svg_ok(render(tikz).svg, min_paths=1)
+
+
+class TestStyleInheritance:
+    """Test style inheritance and composition."""
+
+    @pytest.mark.parametrize("tikz", _STYLE_CASES)
+    def test_style(self, render, tikz):
+        """Test style examples convert to SVG."""
+        assert_svg_ok(render(tikz).svg)
+
+
+class TestIntegration:
+    """Integration tests combining multiple advanced features."""
 
-        assert "<svg" in svg
+    @pytest.mark.parametrize("tikz", _INTEGRATION_CASES)
+    def test_combined_features(self, render, tikz):
+        """Test examples combining scopes, clipping, layers and loops convert to SVG paths."""
+        assert_svg_ok(render(tikz).svg, min_paths=1)
@@ -2,117 +2,77 @@
 
 import pytest
 
-from tikz2svg.parser.ast_nodes import *
-from tikz2svg.parser.parser import TikzParser
-from tikz2svg.svg.converter import SVGConverter
+from tikz2svg.evaluator.macro_expander import MacroExpander, _substitute_params
 
+from .helpers import assert_svg_ok
 
-@pytest.fixture
-def parser():
-    """Create parser instance."""
-    return TikzParser()
-
-
-@pytest.fixture
-def converter():
-    """Create converter instance."""
-    return SVGConverter()
-
-
-class TestSimpleMacros:
-    """Test simple macro definitions and expansion."""
-
-    def test_def_basic(self, parser, converter):
-        """Test basic \\def macro."""
-        tikz = r"""
+_SIMPLE_MACRO_CASES = (
+    # Line should be red
+    pytest.param(
+        r"""
         \begin{tikzpicture}
         \def\mycolor{red}
         \draw[\mycolor] (0,0) -- (1,1);
         \end{tikzpicture}
-        """
-        ast = parser.parse(tikz)
-        svg = converter.convert(ast)
-
-        assert "<svg" in svg
-        # Line should be red
-
-    def test_def_multiple(self, parser, converter):
-        """Test multiple \\def macros."""
-        tikz = r"""
+        """,
+        id="def_basic",
+    ),
+    pytest.param(
+        r"""
         \begin{tikzpicture}
         \def\mycolor{blue}
         \def\mythickness{thick}
         \draw[\mycolor,\mythickness] (0,0) -- (1,1);
         \end{tikzpicture}
-        """
-        ast = parser.parse(tikz)
-        svg = converter.convert(ast)
-
-        assert "<svg" in svg
-
-    def test_def_numeric(self, parser, converter):
-        """Test \\def with numeric values."""
-        tikz = r"""
+        """,
+        id="def_multiple",
+    ),
+    pytest.param(
+        r"""
         \begin{tikzpicture}
         \def\radius{2}
         \draw (0,0) circle (\radius);
         \end{tikzpicture}
-        """
-        ast = parser.parse(tikz)
-        svg = converter.convert(ast)
+        """,
+        id="def_numeric",
+    ),
+)
 
-        assert "<svg" in svg
 
-
-class TestParametricMacros:
-    """Test parametric macros with \\newcommand."""
-
-    def test_newcommand_one_param(self, parser, converter):
-        """Test \\newcommand with one parameter."""
-        tikz = r"""
+_PARAMETRIC_MACRO_CASES = (
+    # Should have 2 circles
+    pytest.param(
+        r"""
         \begin{tikzpicture}
         \newcommand{\mycircle}[1]{\draw (0,0) circle (#1);}
         \mycircle{1}
         \mycircle{2}
         \end{tikzpicture}
-        """
-        ast = parser.parse(tikz)
-        svg = converter.convert(ast)
-
-        assert "<svg" in svg
-        # Should have 2 circles
-
-    def test_newcommand_two_params(self, parser, converter):
-        """Test \\newcommand with two parameters."""
-        tikz = r"""
+        """,
+        id="newcommand_one_param",
+    ),
+    pytest.param(
+        r"""
         \begin{tikzpicture}
         \newcommand{\drawline}[2]{\draw (#1) -- (#2);}
         \drawline{0,0}{1,1}
         \drawline{0,1}{1,0}
         \end{tikzpicture}
-        """
-        ast = parser.parse(tikz)
-        svg = converter.convert(ast)
-
-        assert "<svg" in svg
-
-    def test_newcommand_three_params(self, parser, converter):
-        """Test \\newcommand with three parameters."""
-        tikz = r"""
+        """,
+        id="newcommand_two_params",
+    ),
+    pytest.param(
+        r"""
         \begin{tikzpicture}
         \newcommand{\coloredcircle}[3]{\draw[#1] (#2) circle (#3);}
         \coloredcircle{red}{0,0}{1}
         \coloredcircle{blue}{2,0}{0.5}
         \end{tikzpicture}
-        """
-        ast = parser.parse(tikz)
-        svg = converter.convert(ast)
-
-        assert "<svg" in svg
-
-    def test_newcommand_complex_body(self, parser, converter):
-        """Test \\newcommand with complex body."""
-        tikz = r"""
+        """,
+        id="newcommand_three_params",
+    ),
+    pytest.param(
+        r"""
         \begin{tikzpicture}
         \newcommand{\square}[1]{
             \draw (#1) -- ++(1,0) -- ++(0,1) -- ++(-1,0) -- cycle;
@@ -120,149 +80,113 @@ class TestParametricMacros:
         \square{0,0}
         \square{2,0}
         \end{tikzpicture}
-        """
-        ast = parser.parse(tikz)
-        svg = converter.convert(ast)
-
-        assert "<svg" in svg
+        """,
+        id="newcommand_complex_body",
+    ),
+)
 
 
-class TestMacroExpansion:
-    """Test macro expansion and substitution."""
-
-    def test_macro_in_macro(self, parser, converter):
-        """Test macro used inside another macro."""
-        tikz = r"""
+_EXPANSION_CASES = (
+    pytest.param(
+        r"""
         \begin{tikzpicture}
         \def\myradius{1}
         \newcommand{\mycircle}[1]{\draw (#1) circle (\myradius);}
         \mycircle{0,0}
         \end{tikzpicture}
-        """
-        ast = parser.parse(tikz)
-        svg = converter.convert(ast)
-
-        assert "<svg" in svg
-
-    def test_macro_expansion_order(self, parser, converter):
-        """Test that macros are expanded in correct order."""
-        tikz = r"""
+        """,
+        id="macro_in_macro",
+    ),
+    pytest.param(
+        r"""
         \begin{tikzpicture}
         \def\size{2}
         \def\halfsize{1}
         \draw (0,0) circle (\size);
         \draw (0,0) circle (\halfsize);
         \end{tikzpicture}
-        """
-        ast = parser.parse(tikz)
-        svg = converter.convert(ast)
-
-        assert "<svg" in svg
-
-    def test_macro_redefinition(self, parser, converter):
-        """Test that later macro definitions override earlier ones."""
-        tikz = r"""
+        """,
+        id="macro_expansion_order",
+    ),
+    pytest.param(
+        r"""
         \begin{tikzpicture}
         \def\mycolor{red}
         \draw[\mycolor] (0,0) -- (1,0);
         \def\mycolor{blue}
         \draw[\mycolor] (0,1) -- (1,1);
         \end{tikzpicture}
-        """
-        ast = parser.parse(tikz)
-        svg = converter.convert(ast)
-
-        assert "<svg" in svg
-
+        """,
+        id="macro_redefinition",
+    ),
+)
 
-class TestMacroScoping:
-    """Test macro scoping in different contexts."""
 
-    def test_macro_in_scope(self, parser, converter):
-        """Test macro defined inside scope."""
-        tikz = r"""
+_SCOPING_CASES = (
+    pytest.param(
+        r"""
         \begin{tikzpicture}
         \begin{scope}
             \def\mycolor{red}
             \draw[\mycolor] (0,0) -- (1,1);
         \end{scope}
         \end{tikzpicture}
-        """
-        ast = parser.parse(tikz)
-        svg = converter.convert(ast)
-
-        assert "<svg" in svg
-
-    def test_macro_in_loop(self, parser, converter):
-        """Test macro used inside foreach loop."""
-        tikz = r"""
+        """,
+        id="macro_in_scope",
+    ),
+    pytest.param(
+        r"""
         \begin{tikzpicture}
         \def\radius{0.5}
         \foreach \i in {0,1,2} {
             \draw (\i,0) circle (\radius);
         }
         \end{tikzpicture}
-        """
-        ast = parser.parse(tikz)
-        svg = converter.convert(ast)
-
-        assert "<svg" in svg
+        """,
+        id="macro_in_loop",
+    ),
+)
 
 
-class TestComplexMacros:
-    """Test complex macro patterns."""
-
-    def test_macro_with_coordinates(self, parser, converter):
-        """Test macro that expands to coordinates."""
-        tikz = r"""
+_COMPLEX_MACRO_CASES = (
+    pytest.param(
+        r"""
         \begin{tikzpicture}
         \def\start{0,0}
         \def\end{2,2}
         \draw (\start) -- (\end);
         \end{tikzpicture}
-        """
-        ast = parser.parse(tikz)
-        svg = converter.convert(ast)
-
-        assert "<svg" in svg
-
-    def test_macro_with_path(self, parser, converter):
-        """Test macro that expands to path operations."""
-        tikz = r"""
+        """,
+        id="macro_with_coordinates",
+    ),
+    pytest.param(
+        r"""
         \begin{tikzpicture}
         \newcommand{\triangle}[1]{
             (#1) -- ++(1,0) -- ++(0,1) -- cycle
         }
         \draw \triangle{0,0};
         \end{tikzpicture}
-        """
-        ast = parser.parse(tikz)
-        svg = converter.convert(ast)
-
-        assert "<svg" in svg
-
-    def test_nested_macro_calls(self, parser, converter):
-        """Test nested macro calls."""
-        tikz = r"""
+        """,
+        id="macro_with_path",
+    ),
+    pytest.param(
+        r"""
         \begin{tikzpicture}
         \newcommand{\pos}[1]{#1,#1}
         \newcommand{\drawat}[1]{\draw (\pos{#1}) circle (0.5);}
         \drawat{0}
         \drawat{2}
         \end{tikzpicture}
-        """
-        ast = parser.parse(tikz)
-        svg = converter.convert(ast)
+        """,
+        id="nested_macro_calls",
+    ),
+)
 
-        assert "<svg" in svg
 
-
-class TestIntegration:
-    """Integration tests combining macros with other features."""
-
-    def test_macros_with_math(self, parser, converter):
-        """Test macros combined with mathematical expressions."""
-        tikz = r"""
+_INTEGRATION_CASES = (
+    pytest.param(
+        r"""
         \begin{tikzpicture}
         \pgfmathsetmacro{\r}{2}
         \newcommand{\drawcircle}[1]{\draw (#1*\r,0) circle (0.5);}
@@ -270,29 +194,21 @@ class TestIntegration:
             \drawcircle{\i}
         }
         \end{tikzpicture}
-        """
-        ast = parser.parse(tikz)
-        svg = converter.convert(ast)
-
-        assert "<svg" in svg
-
-    def test_macros_with_styles(self, parser, converter):
-        """Test macros defining styles."""
-        tikz = r"""
+        """,
+        id="macros_with_math",
+    ),
+    pytest.param(
+        r"""
         \begin{tikzpicture}
         \def\mystyle{red,thick}
         \draw[\mystyle] (0,0) -- (1,1);
         \draw[\mystyle] (0,1) -- (1,0);
         \end{tikzpicture}
-        """
-        ast = parser.parse(tikz)
-        svg = converter.convert(ast)
-
-        assert "<svg" in svg
-
-    def test_complex_macro_usage(self, parser, converter):
-        """Test complex real-world macro pattern."""
-        tikz = r"""
+        """,
+        id="macros_with_styles",
+    ),
+    pytest.param(
+        r"""
         \begin{tikzpicture}
         \def\n{5}
         \newcommand{\vertex}[1]{
@@ -302,8 +218,110 @@ class TestIntegration:
             \vertex{\i}
         }
         \end{tikzpicture}
-        """
-        ast = parser.parse(tikz)
-        svg = converter.convert(ast)
+        """,
+        id="complex_macro_usage",
+    ),
+)
+
+
+class TestSimpleMacros:
+    """Test simple macro definitions and expansion."""
+
+    @pytest.mark.parametrize("tikz", _SIMPLE_MACRO_CASES)
+    def test_def(self, render, tikz):
+        """Test \\def examples convert to SVG."""
+        assert_svg_ok(render(tikz).svg)
+
+
+class TestParametricMacros:
+    """Test parametric macros with \\newcommand."""
+
+    @pytest.mark.parametrize("tikz", _PARAMETRIC_MACRO_CASES)
+    def test_newcommand(self, render, tikz):
+        """Test \\newcommand examples convert to SVG."""
+        assert_svg_ok(render(tikz).svg)
+
+
+class TestMacroExpansion:
+    """Test macro expansion and substitution."""
+
+    @pytest.mark.parametrize("tikz", _EXPANSION_CASES)
+    def test_expansion(self, render, tikz):
+        """Test nested and redefined macros convert to SVG."""
+        assert_svg_ok(render(tikz).svg)
+
+
+class TestMacroScoping:
+    """Test macro scoping in different contexts."""
+
+    @pytest.mark.parametrize("tikz", _SCOPING_CASES)
+    def test_scoping(self, render, tikz):
+        """Test macros used in scopes and loops convert to SVG."""
+        assert_svg_ok(render(tikz).svg)
+
+
+class TestComplexMacros:
+    """Test complex macro patterns."""
+
+    @pytest.mark.parametrize("tikz", _COMPLEX_MACRO_CASES)
+    def test_complex_macro(self, render, tikz):
+        """Test macros expanding to coordinates and paths convert to SVG."""
+        assert_svg_ok(render(tikz).svg)
+
+
+class TestIntegration:
+    """Integration tests combining macros with other features."""
+
+    @pytest.mark.parametrize("tikz", _INTEGRATION_CASES)
+    def test_combined_features(self, render, tikz):
+        """Test macros combined with math and styles convert to SVG."""
+        assert_svg_ok(render(tikz).svg)
+
+
+class TestDefinitionExtraction:
+    """Test macro definitions pulled out of the source text."""
+
+    def test_definitions_in_source_order(self):
+        """Test a later definition wins and a nested \\def stays in its command body."""
+        expander = MacroExpander()
+        text = expander.extract_definitions(
+            r"\newcommand{\a}{x}\def\b{1}\newcommand{\b}[1]{\def\c{#1}}\def\a{y}rest"
+        )
+
+        assert text == "rest"
+        assert expander.macros == {
+            "a": {"params": 0, "body": "y"},
+            "b": {"params": 1, "body": r"\def\c{#1}"},
+        }
 
-        assert "<svg" in svg
+    def test_repeated_call_reuses_substitution(self):
+        """Test identical calls substitute once, and a redefinition is not served stale."""
+        expander = MacroExpander()
+        expander.add_macro("pt", "(#1,#2)", params=2)
+        hits = _substitute_params.cache_info().hits
+
+        assert expander.expand_all(r"\pt{1}{2} -- \pt{1}{2}") == "(1,2) -- (1,2)"
+        assert _substitute_params.cache_info().hits == hits + 1
+
+        expander.add_macro("pt", "(#2,#1)", params=2)
+        assert expander.expand_all(r"\pt{1}{2}") == "(2,1)"
+
+    @pytest.mark.parametrize(
+        "text,expanded",
+        [
+            pytest.param(r"\c \cfoo \c1", r"red blue red1", id="whole_names"),
+            pytest.param(r"\c{x} \c[1]", r"\c{x} \c[1]", id="command_syntax_kept"),
+            pytest.param(r"\pt{3}{4}{5} \pt{1}", r"(3,4){5} \pt{1}", id="arguments"),
+            pytest.param(r"\c{\pt{1}{\c}}", r"\c{(1,red)}", id="inside_braces"),
+            pytest.param(r"\two", "(red,red)", id="backslash_body"),
+        ],
+    )
+    def test_expand_all(self, text, expanded):
+        """Test call sites are found by whole macro name in a single scan per level."""
+        expander = MacroExpander()
+        expander.add_macro("c", "red")
+        expander.add_macro("cfoo", "blue")
+        expander.add_macro("pt", "(#1,#2)", params=2)
+        expander.add_macro("two", r"\pt{\c}{\c}")
+
+        assert expander.expand_all(text) == expanded
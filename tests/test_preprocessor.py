@@ -0,0 +1,97 @@
+"""Unit tests for TikzPreprocessor."""
+
+import pytest
+
+from tikz2svg.parser.preprocessor import TikzPreprocessor
+
+
+@pytest.fixture
+def preprocessor():
+    """Create preprocessor."""
+    return TikzPreprocessor()
+
+
+class TestRemoveComments:
+    """Test LaTeX comment removal."""
+
+    def test_strips_comment_to_end_of_line(self, preprocessor):
+        """Test comment is removed but the line break is kept."""
+        assert preprocessor.remove_comments("a % note\nb") == "a \nb"
+
+    def test_keeps_escaped_percent(self, preprocessor):
+        """Test \\% is not treated as a comment."""
+        code = "\\node {50\\%}; % note"
+        assert preprocessor.remove_comments(code) == "\\node {50\\%}; "
+
+    def test_comment_only_lines(self, preprocessor):
+        """Test every line is handled independently."""
+        assert preprocessor.remove_comments("%a\n%b\nc") == "\n\nc"
+
+
+class TestExtractTikzpicture:
+    """Test tikzpicture environment extraction."""
+
+    def test_extracts_all_environments(self, preprocessor):
+        """Test multiple environments are joined by newlines."""
+        code = (
+            "\\begin{document}\n"
+            "\\begin{tikzpicture}A\\end{tikzpicture}\n"
+            "text\n"
+            "\\begin{tikzpicture}\nB\n\\end{tikzpicture}\n"
+            "\\end{document}"
+        )
+        assert preprocessor.extract_tikzpicture(code) == (
+            "\\begin{tikzpicture}A\\end{tikzpicture}\n"
+            "\\begin{tikzpicture}\nB\n\\end{tikzpicture}"
+        )
+
+    def test_without_environment_returns_input(self, preprocessor):
+        """Test code without tikzpicture is returned unchanged."""
+        assert preprocessor.extract_tikzpicture("\\draw (0,0);") == "\\draw (0,0);"
+
+
+class TestNormalizeWhitespace:
+    """Test whitespace normalization."""
+
+    def test_strips_lines_and_drops_blank_ones(self, preprocessor):
+        """Test lines are stripped and empty lines removed."""
+        code = "\n  \\draw (0,0);  \n\n \t \n\t\\fill (1,1);\r\n"
+        assert preprocessor.normalize_whitespace(code) == "\\draw (0,0);\n\\fill (1,1);"
+
+    def test_keeps_inner_whitespace(self, preprocessor):
+        """Test whitespace inside a line is preserved."""
+        assert preprocessor.normalize_whitespace("a  b\n c\td ") == "a  b\nc\td"
+
+
+class TestStripAndExtract:
+    """Test the fused comment removal and environment extraction."""
+
+    @pytest.mark.parametrize(
+        "code",
+        [
+            "\\draw (0,0); % no environment",
+            "pre\\begin{tikzpicture}\n\\draw (0,0); % c\n\\end{tikzpicture}post",
+            "\\begin{tikzpicture}A % \\end{tikzpicture}\nB\\end{tikzpicture}",
+            "% \\begin{tikzpicture}\n\\begin{tikzpicture}A\\end{tikzpicture}",
+            "\\begin{tikzpicture}A\\end{tikzpicture}\\begin{tikzpicture}B",
+            "\\begin{tikzpicture}\\begin{tikzpicture}A\\end{tikzpicture}\\end{tikzpicture}",
+            "\\begin{tikzpicture}50\\% % x\n\\end{tikzpicture}",
+        ],
+    )
+    def test_matches_separate_passes(self, preprocessor, code):
+        """Test result is the same as running both passes in sequence."""
+        expected = preprocessor.extract_tikzpicture(preprocessor.remove_comments(code))
+        assert preprocessor.strip_and_extract(code) == expected
+
+    def test_comment_does_not_close_environment(self, preprocessor):
+        """Test \\end{tikzpicture} inside a comment is ignored."""
+        code = "\\begin{tikzpicture}A % \\end{tikzpicture}\nB\\end{tikzpicture}"
+        assert preprocessor.strip_and_extract(code) == "\\begin{tikzpicture}A \nB\\end{tikzpicture}"
+
+    def test_without_comments(self, preprocessor):
+        """Test the comment-free fast path still extracts environments."""
+        code = "x\\begin{tikzpicture}\\draw (0,0);\\end{tikzpicture}y"
+        assert (
+            preprocessor.strip_and_extract(code)
+            == "\\begin{tikzpicture}\\draw (0,0);\\end{tikzpicture}"
+        )
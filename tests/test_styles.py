@@ -2,7 +2,7 @@
 
 import pytest
 
-from tikz2svg.svg.styles import StyleConverter
+from tikz2svg.svg.styles import _STYLE_CACHE_SIZE, StyleConverter
 
 
 @pytest.fixture
@@ -92,6 +92,32 @@ def test_convert_filldraw_with_colors(converter):
     assert "fill: #0000FF" in result
 
 
+def test_convert_reuses_style_for_equal_options(converter):
+    """Test equal options and command return the already built style."""
+    first = converter.convert({"color": "red", "thick": True}, "draw")
+    assert converter.convert({"color": "red", "thick": True}, "draw") is first
+    assert converter.convert({"color": "red", "thick": True}, "fill") != first
+
+
+def test_convert_cache_keeps_value_types_apart(converter):
+    """Test equal values of different types are not served from one entry."""
+    assert "opacity: 1.0;" in converter.convert({"opacity": 1.0}, "draw") + ";"
+    assert "opacity: 1;" in converter.convert({"opacity": 1}, "draw") + ";"
+
+
+def test_convert_unhashable_option(converter):
+    """Test options holding unhashable values are still converted."""
+    result = converter.convert({"color": "red", "shift": [1, 2]}, "draw")
+    assert "stroke: #FF0000" in result
+
+
+def test_convert_cache_is_bounded(converter):
+    """Test the style cache evicts old entries instead of growing without bound."""
+    for i in range(_STYLE_CACHE_SIZE + 10):
+        converter.convert({"line width": i}, "draw")
+    assert len(converter._styles) == _STYLE_CACHE_SIZE
+
+
 # Test convert_text_style() method
 
 
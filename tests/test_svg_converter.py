@@ -1,10 +1,16 @@
 """Tests for SVG converter."""
 
+import pickle
+import sys
+
 import pytest
 
+from tikz2svg.parser.ast_nodes import DrawStatement, Layer, Scope, TikzPicture, _ast_dataclass
 from tikz2svg.parser.parser import TikzParser
 from tikz2svg.svg.converter import SVGConverter
 
+from .helpers import assert_svg_ok
+
 
 @pytest.fixture
 def parser():
@@ -27,8 +33,7 @@ class TestBasicConversion:
         ast = parser.parse(tikz)
         svg = converter.convert(ast)
 
-        assert "<svg" in svg
-        assert "<path" in svg
+        assert_svg_ok(svg, min_paths=1)
         assert "d=" in svg
 
     def test_multiple_lines(self, parser, converter):
@@ -37,8 +42,7 @@ class TestBasicConversion:
         ast = parser.parse(tikz)
         svg = converter.convert(ast)
 
-        assert "<svg" in svg
-        assert "<path" in svg
+        assert_svg_ok(svg, min_paths=1)
         # Should have M, L, L, L commands
         assert "M" in svg
         assert "L" in svg
@@ -89,8 +93,7 @@ class TestCoordinateSystems:
         ast = parser.parse(tikz)
         svg = converter.convert(ast)
 
-        assert "<svg" in svg
-        assert "<path" in svg
+        assert_svg_ok(svg, min_paths=1)
 
     def test_named_coordinates(self, parser, converter):
         """Test named coordinates."""
@@ -105,6 +108,136 @@ class TestCoordinateSystems:
 
         assert "<path" in svg
 
+    def test_reset_clears_named_coordinates(self, parser, converter):
+        """Test reset() forgets coordinates from a previous conversion."""
+        tikz = r"\begin{tikzpicture}\coordinate (A) at (1,1);\end{tikzpicture}"
+        converter.convert(parser.parse(tikz))
+        assert "A" in converter.named_coordinates
+
+        converter.reset()
+
+        assert converter.named_coordinates == {}
+        assert converter.coord_resolver.named_coordinates is converter.named_coordinates
+
+    def test_path_count(self, parser, converter):
+        """Test path_count matches the drawn paths of the last document."""
+        tikz = r"""\begin{tikzpicture}
+\draw (0,0) -- (1,1);
+\foreach \i in {1,2,3} { \draw (\i,0) circle (0.5); }
+\node at (0,0) {x};
+\end{tikzpicture}"""
+        svg = converter.convert(parser.parse(tikz))
+
+        assert converter.path_count == 4
+        assert svg.count("<path") == converter.path_count
+
+        converter.convert(
+            parser.parse(r"\begin{tikzpicture}\draw (0,0) -- (1,0);\end{tikzpicture}")
+        )
+        assert converter.path_count == 1
+
+    def test_compile_statement(self, parser, converter):
+        """Test a compiled statement renders like visit_statement, unknown ones compile to None."""
+        stmt = parser.parse(
+            r"\begin{tikzpicture}\draw (0,0) -- (2,1);\end{tikzpicture}"
+        ).statements[0]
+
+        assert converter.compile_statement(stmt)() == converter.visit_statement(stmt)
+        assert converter.compile_statement(object()) is None
+
+    def test_statement_subclass_dispatch(self, parser, converter):
+        """Test subclasses of statement types use their base type's visitor."""
+
+        @_ast_dataclass
+        class LabelledDraw(DrawStatement):
+            label: str = ""
+
+        draw = parser.parse(
+            r"\begin{tikzpicture}\draw (0,0) -- (2,1);\end{tikzpicture}"
+        ).statements[0]
+        labelled = LabelledDraw(command=draw.command, path=draw.path, label="x")
+
+        assert converter.visit_statement(labelled) == converter.visit_statement(draw)
+        assert converter.compile_statement(labelled)() == converter.visit_statement(draw)
+
+    def test_dispatch_honours_subclass_override(self, parser):
+        """Test statements, scopes and layers dispatch to visit methods overridden in a subclass."""
+
+        class StubConverter(SVGConverter):
+            def visit_draw_statement(self, stmt):
+                return "<draw/>"
+
+            def visit_scope(self, scope):
+                return "<SCOPE/>"
+
+            def visit_layer(self, layer):
+                return "<LAYER/>"
+
+        stmt = parser.parse(r"\begin{tikzpicture}\draw (0,0) -- (1,1);\end{tikzpicture}")
+        svg = StubConverter().convert(
+            TikzPicture(statements=[Scope(statements=stmt.statements), Layer(name="top")])
+        )
+
+        assert StubConverter().visit_statement(stmt.statements[0]) == "<draw/>"
+        assert "<SCOPE/>" in svg
+        assert "<LAYER/>" in svg
+
+    def test_deep_nesting_without_recursion(self, parser, converter):
+        """Test scopes nested past the recursion limit still convert, innermost first."""
+        draw = parser.parse(r"\begin{tikzpicture}\draw (0,0) -- (1,1);\end{tikzpicture}")
+        group = Layer(name="top", statements=draw.statements)
+        for _ in range(sys.getrecursionlimit()):
+            group = Scope(statements=[Scope(), group])
+
+        svg = converter.convert(TikzPicture(statements=[group]))
+
+        assert svg.count("<g ") == sys.getrecursionlimit() + 1
+        assert svg.index('<g data-layer="top">') > svg.rindex("<g style=")
+
+    def test_document_layout(self, parser):
+        """Test the document wraps its elements, and keeps a blank line when empty."""
+        converter = SVGConverter(width=40, height=30)
+        header = (
+            '<svg xmlns="http://www.w3.org/2000/svg" width="40" height="30" viewBox="0 0 40 30">'
+        )
+
+        assert converter.convert(TikzPicture()) == header + "\n  \n</svg>"
+        svg = converter.convert(
+            parser.parse(r"\begin{tikzpicture}\node {a};\node {b};\end{tikzpicture}")
+        )
+        assert svg.startswith(header + "\n  <text ")
+        assert svg.count("</text>\n  <text ") == 1
+        assert svg.endswith("</text>\n</svg>")
+
+    def test_pickle_round_trip(self, parser, converter):
+        """Test an unpickled converter renders the same document."""
+        ast = parser.parse(r"\begin{tikzpicture}\draw[red] (0,0) -- (1,2);\end{tikzpicture}")
+
+        clone = pickle.loads(pickle.dumps(converter))
+
+        assert clone.convert(ast) == converter.convert(ast)
+
+    def test_converters_share_transformer(self):
+        """Test converters with the same canvas settings reuse one transformer."""
+        first, second = SVGConverter(), SVGConverter()
+        assert first.coord_transformer is second.coord_transformer
+        assert SVGConverter(width=400).coord_transformer is not first.coord_transformer
+        assert not hasattr(first.coord_transformer, "__dict__")
+
+    def test_shared_transformer_is_read_only(self):
+        """Test a shared transformer rejects changes and unpickles to the cached instance."""
+        transformer = SVGConverter().coord_transformer
+        with pytest.raises(AttributeError):
+            transformer.scale = 1.0
+        assert transformer.scale == 28.35
+        assert pickle.loads(pickle.dumps(transformer)) is transformer
+
+    def test_child_contexts_are_slotted(self, converter):
+        """Test the per-scope evaluation contexts carry no per-instance __dict__."""
+        child = converter.context.create_child_context()
+        assert child.parent is converter.context
+        assert not hasattr(child, "__dict__")
+
 
 class TestIntegration:
     """Integration tests with real files."""
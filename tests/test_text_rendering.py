@@ -6,6 +6,8 @@ from tikz2svg.parser.parser import TikzParser
 from tikz2svg.svg.converter import SVGConverter
 from tikz2svg.svg.math_renderer import ZIAMATH_AVAILABLE
 
+_TEXT_NODE = r"\begin{tikzpicture}\node at (0,0) {text};\end{tikzpicture}"
+
 
 class TestTextAnchors:
     """Test text anchor positioning (left, right, above, below)."""
@@ -193,7 +195,7 @@ class TestTextSize:
 
     def test_default_text_size(self):
         """Test default text size is 10px."""
-        tikz = r"\begin{tikzpicture}\node at (0,0) {text};\end{tikzpicture}"
+        tikz = _TEXT_NODE
         parser = TikzParser()
         ast = parser.parse(tikz)
         converter = SVGConverter()
@@ -203,7 +205,7 @@ class TestTextSize:
 
     def test_text_size_not_12px(self):
         """Test text size is not the old default of 12px."""
-        tikz = r"\begin{tikzpicture}\node at (0,0) {text};\end{tikzpicture}"
+        tikz = _TEXT_NODE
         parser = TikzParser()
         ast = parser.parse(tikz)
         converter = SVGConverter()
@@ -22,7 +22,29 @@ pipeline with a pure Python solution using Lark parser and proper AST representa
 __version__ = "0.1.0"
 __author__ = "Lucas Bruand"
 
-from .parser.parser import TikzParser
-from .svg.converter import SVGConverter
+from importlib import import_module
+from typing import Any, List
+
+# Exported classes and the modules defining them, imported only when used:
+# the parser pulls in Lark and the converter the whole SVG package, while
+# importing e.g. tikz2svg.parser.ast_nodes needs neither
+_LAZY_EXPORTS = {"TikzParser": ".parser.parser", "SVGConverter": ".svg.converter"}
 
 __all__ = ["TikzParser", "SVGConverter", "__version__"]
+
+
+def __getattr__(name: str) -> Any:
+    """Import the parser and converter classes on first access (PEP 562).
+
+    The imported class is cached in the module globals, so later lookups
+    bypass this hook.
+    """
+    if (module := _LAZY_EXPORTS.get(name)) is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = globals()[name] = getattr(import_module(module, __name__), name)
+    return value
+
+
+def __dir__() -> List[str]:
+    """List the lazy exports alongside the module's own names."""
+    return sorted({*globals(), *_LAZY_EXPORTS})
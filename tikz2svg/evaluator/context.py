@@ -6,6 +6,9 @@ from typing import Any, Dict, Optional
 class EvaluationContext:
     """Manages variable and coordinate scope during evaluation."""
 
+    # A child context is created for every scope and loop iteration
+    __slots__ = ("parent", "variables", "coordinates")
+
     def __init__(self, parent: Optional["EvaluationContext"] = None):
         """
         Initialize evaluation context.
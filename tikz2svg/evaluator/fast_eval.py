@@ -0,0 +1,61 @@
+"""Fast path for plain arithmetic expressions."""
+
+import ast
+from functools import lru_cache
+from types import CodeType
+from typing import Optional
+
+# Operators of plain arithmetic; anything else (calls, attributes, bitwise
+# operators, comparisons) is left to MathEvaluator's rewriting path
+_ALLOWED_OPERATORS = (
+    ast.Add,
+    ast.Sub,
+    ast.Mult,
+    ast.Div,
+    ast.FloorDiv,
+    ast.Mod,
+    ast.Pow,
+    ast.UAdd,
+    ast.USub,
+)
+
+_ALLOWED_NODES = (
+    ast.Expression,
+    ast.BinOp,
+    ast.UnaryOp,
+    ast.Constant,
+    ast.Name,
+    ast.Load,
+) + _ALLOWED_OPERATORS
+
+
+def _is_arithmetic(tree: ast.AST) -> bool:
+    """Check that a parsed expression only uses numbers, names and arithmetic."""
+    return all(
+        isinstance(node, _ALLOWED_NODES)
+        and not (isinstance(node, ast.Constant) and type(node.value) not in (int, float))
+        for node in ast.walk(tree)
+    )
+
+
+@lru_cache(maxsize=1024)
+def compile_arithmetic(expr: str) -> Optional[CodeType]:
+    """
+    Compile an expression that is plain arithmetic over numbers and names.
+
+    Such expressions need none of MathEvaluator's rewriting (no \\name
+    references, LaTeX functions or degree conversion), so Python can compile
+    them directly. Bare names are looked up among the context variables.
+
+    Args:
+        expr: Expression string
+
+    Returns:
+        Code object for eval(), or None if the expression is not plain
+        arithmetic
+    """
+    try:
+        tree = ast.parse(expr, mode="eval")
+    except (SyntaxError, ValueError):
+        tree = None
+    return compile(tree, "<tikz>", "eval") if tree and _is_arithmetic(tree) else None
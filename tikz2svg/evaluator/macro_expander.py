@@ -1,7 +1,65 @@
 """Macro expansion for TikZ/LaTeX macros."""
 
 import re
-from typing import Dict, Optional
+from functools import lru_cache
+from typing import Dict, FrozenSet, Optional, Tuple
+
+# Macro definitions, matched in a single pass:
+# - \def\name{body} (body without braces)
+# - \newcommand{\name}[N]{body} and \newcommand{\name}{body} (one level of
+#   nested braces in the body)
+_DEFINITION_RE = re.compile(
+    r"\\def\\(?P<def_name>\w+)\{(?P<def_body>[^}]*)\}"
+    r"|\\newcommand\{\\(?P<cmd_name>\w+)\}(?:\[(?P<cmd_params>\d+)\])?"
+    r"\{(?P<cmd_body>(?:[^{}]|\{[^{}]*\})*)\}"
+)
+
+
+# One braced macro argument (simple version: no nested braces in arguments)
+_ARG_RE = re.compile(r"\{([^{}]*)\}")
+
+
+@lru_cache(maxsize=64)
+def _macro_call_re(
+    signatures: FrozenSet[Tuple[str, int]],
+) -> Tuple["re.Pattern[str]", Tuple[Tuple[str, str], ...]]:
+    """Compile one regex matching a call to any of the given macros.
+
+    Each (name, params) signature is one alternative, so a single scan finds
+    every call site. Longer names are tried first and a name must not run on
+    into more letters, so \\mycolor never matches inside \\mycolorfoo. A
+    parameterless macro must not be followed by { or [ (that is another
+    command's syntax); a parametric one must be followed by all of its braced
+    arguments.
+
+    Returns:
+        The regex, and (group, macro name) pairs naming the last group of each
+        alternative: m<i> for parameterless macros, a<i> holding the braced
+        arguments of parametric ones
+    """
+    ordered = sorted(signatures, key=lambda signature: (-len(signature[0]), signature))
+    alternatives = [
+        rf"(?P<m{i}>{re.escape(name)})(?![A-Za-z])"
+        + (rf"(?P<a{i}>(?:\{{[^{{}}]*\}}){{{params}}})" if params else r"(?![{\[])")
+        for i, (name, params) in enumerate(ordered)
+    ]
+    groups = tuple(
+        (f"a{i}" if params else f"m{i}", name) for i, (name, params) in enumerate(ordered)
+    )
+    return re.compile(r"\\(?:" + "|".join(alternatives) + ")"), groups
+
+
+@lru_cache(maxsize=1024)
+def _substitute_params(body: str, args: Tuple[str, ...]) -> str:
+    """Replace #1, #2, etc. in a macro body with its arguments.
+
+    Memoized: repeated calls with the same arguments, within a figure or
+    across figures, are substituted once. The key holds the body rather than
+    the macro name, so a redefined macro never reuses a stale expansion.
+    """
+    for i, arg_value in enumerate(args, 1):
+        body = body.replace(f"#{i}", arg_value)
+    return body
 
 
 class MacroExpander:
@@ -50,88 +108,52 @@ class MacroExpander:
         Returns:
             Text with macro definitions removed
         """
-        # Extract \def\name{body}
-        def_pattern = r"\\def\\(\w+)\{([^}]*)\}"
-
-        def extract_def(match):
-            name = match.group(1)
-            body = match.group(2)
-            self.macros[name] = {"params": 0, "body": body}
-            return ""  # Remove from text
+        # One left-to-right scan over every kind of definition
 
-        text = re.sub(def_pattern, extract_def, text)
-
-        # Extract \newcommand{\name}[N]{body}
-        # Pattern: \newcommand{\name}[number]{body}
-        newcmd_pattern = r"\\newcommand\{\\(\w+)\}\[(\d+)\]\{((?:[^{}]|\{[^{}]*\})*)\}"
-
-        def extract_newcommand(match):
-            name = match.group(1)
-            params = int(match.group(2))
-            body = match.group(3)
+        def extract(match):
+            if (name := match.group("def_name")) is not None:
+                params, body = 0, match.group("def_body")
+            else:
+                name = match.group("cmd_name")
+                params, body = int(match.group("cmd_params") or 0), match.group("cmd_body")
             self.macros[name] = {"params": params, "body": body}
             return ""  # Remove from text
 
-        text = re.sub(newcmd_pattern, extract_newcommand, text)
-
-        # Also extract \newcommand{\name}{body} (no parameters)
-        newcmd_no_params_pattern = r"\\newcommand\{\\(\w+)\}\{((?:[^{}]|\{[^{}]*\})*)\}"
-
-        def extract_newcommand_no_params(match):
-            name = match.group(1)
-            body = match.group(2)
-            self.macros[name] = {"params": 0, "body": body}
-            return ""  # Remove from text
-
-        text = re.sub(newcmd_no_params_pattern, extract_newcommand_no_params, text)
-
-        return text
+        return _DEFINITION_RE.sub(extract, text)
 
     def expand_all(self, text: str, depth: int = 0) -> str:
-        """Recursively expand all macro references in text.
+        """Expand all macro references in text, including nested ones.
 
         Args:
             text: Text containing macro references
-            depth: Current recursion depth
+            depth: Expansion levels already applied (at most max_depth in total)
 
         Returns:
             Text with all macros expanded
         """
-        if depth >= self.max_depth:
-            return text
-
-        original = text
-
-        # Expand each macro
-        for name, macro in self.macros.items():
-            if macro["params"] == 0:
-                # Simple macro: just replace \name with body
-                # Use negative lookahead to avoid matching \name{ (which would be a command)
-                # Only match \name followed by space, punctuation, or end of string
-                # But NOT followed by { or [
-                pattern = r"\\" + name + r"(?![{\[])"
-                text = re.sub(pattern, macro["body"], text)
-            else:
-                # Parametric macro: \name{arg1}{arg2}...
-                # Build pattern to capture N arguments
-                arg_pattern = r"\{([^{}]*)\}"  # Simple version: assumes no nested braces in args
-                full_pattern = r"\\" + name + arg_pattern * macro["params"]
-
-                def substitute_params(match, macro_data=macro):
-                    """Substitute parameters in macro body."""
-                    body = macro_data["body"]
-                    # Replace #1, #2, etc. with actual arguments
-                    for i in range(1, macro_data["params"] + 1):
-                        param_marker = f"#{i}"
-                        arg_value = match.group(i)
-                        body = body.replace(param_marker, arg_value)
-                    return body
-
-                text = re.sub(full_pattern, substitute_params, text)
-
-        # If text changed, recursively expand (for nested macros)
-        if text != original:
-            text = self.expand_all(text, depth + 1)
+        if self.macros:
+            # One scan per level finds the call sites of every defined macro.
+            # Definitions do not change while expanding, so the regex and the
+            # bodies by group name are looked up once for all levels
+            signatures = frozenset((name, macro["params"]) for name, macro in self.macros.items())
+            pattern, groups = _macro_call_re(signatures)
+            bodies = {group: self.macros[name]["body"] for group, name in groups}
+
+            def expand_call(match):
+                """Expand one call site: a group named a<i> holds arguments."""
+                group = match.lastgroup
+                body = bodies[group]
+                if group[0] == "a":
+                    body = _substitute_params(body, tuple(_ARG_RE.findall(match.group(group))))
+                return body
+
+            # Rescan while the text changes (for nested macros)
+            pending = depth < self.max_depth
+            while pending:
+                expanded = pattern.sub(expand_call, text)
+                depth += 1
+                pending = expanded != text and depth < self.max_depth
+                text = expanded
 
         return text
 
@@ -2,9 +2,61 @@
 
 import math
 import re
-from typing import Any, Optional
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple, Union
 
 from .context import EvaluationContext
+from .fast_eval import compile_arithmetic
+
+_VARIABLE_RE = re.compile(r"\\([a-zA-Z_][a-zA-Z0-9_]*)")
+
+_IDENTIFIER_RE = re.compile(r"[A-Za-z_]\w*")
+
+# Identifiers read as names, i.e. not attributes (math.sqrt) or exponents (1e5)
+_NAME_RE = re.compile(r"(?<![.\w])[A-Za-z_]\w*")
+
+# Prefix of the identifiers that stand in for \var references in compiled code
+_PLACEHOLDER_PREFIX = "_tikzvar_"
+
+
+# TikZ trig functions take degrees. They are memoized: foreach loops keep
+# evaluating them over the same few angles (\i*45, \i*60, ...)
+@lru_cache(maxsize=1024)
+def _sin_degrees(angle: float) -> float:
+    """Sine of an angle in degrees."""
+    return math.sin(math.radians(angle))
+
+
+@lru_cache(maxsize=1024)
+def _cos_degrees(angle: float) -> float:
+    """Cosine of an angle in degrees."""
+    return math.cos(math.radians(angle))
+
+
+@lru_cache(maxsize=1024)
+def _tan_degrees(angle: float) -> float:
+    """Tangent of an angle in degrees."""
+    return math.tan(math.radians(angle))
+
+
+# Names the trig functions are rewritten to, as exposed to eval()
+_TRIG_FUNCTIONS = {
+    "_tikz_sin": _sin_degrees,
+    "_tikz_cos": _cos_degrees,
+    "_tikz_tan": _tan_degrees,
+}
+
+# Names every expression may use besides its variables. Shared by all
+# evaluations of compiled expressions, which never assign to their globals
+_EVAL_GLOBALS = {
+    "__builtins__": {},
+    "math": math,
+    "abs": abs,
+    "round": round,
+    "min": min,
+    "max": max,
+    **_TRIG_FUNCTIONS,
+}
 
 
 class MathEvaluator:
@@ -13,9 +65,9 @@ class MathEvaluator:
     # Map LaTeX math functions to Python math functions
     FUNCTION_MAP = {
         "sqrt": "math.sqrt",
-        "sin": "math.sin",
-        "cos": "math.cos",
-        "tan": "math.tan",
+        "sin": "_tikz_sin",
+        "cos": "_tikz_cos",
+        "tan": "_tikz_tan",
         "abs": "abs",
         "exp": "math.exp",
         "ln": "math.log",
@@ -59,12 +111,45 @@ class MathEvaluator:
         except ValueError:
             pass
 
-        # Process the expression
-        processed = self._process_expression(expr)
+        if is_constant_expression(expr):
+            # Constant expressions never read the context, so the outcome
+            # (value or error) is memoized across evaluators
+            result, error = _evaluate_constant(expr)
+            if error is not None:
+                raise ValueError(error)
+        else:
+            result = self._evaluate_expression(expr)
+
+        return result
+
+    def _evaluate_expression(self, expr: str) -> float:
+        """
+        Evaluate a non-numeric expression against the current context.
+
+        Args:
+            expr: Stripped expression string
+
+        Returns:
+            Evaluated result as float
+
+        Raises:
+            ValueError: If expression cannot be evaluated
+        """
+        # Plain arithmetic is compiled by Python directly. Otherwise reuse the
+        # compiled form when every referenced variable is numeric, and fall
+        # back to textual substitution as a last resort
+        arithmetic = "\\" not in expr and compile_arithmetic(expr)
+        compiled = None if arithmetic else _compile_expression(expr)
+        bindings = self._numeric_bindings(*compiled[1:]) if compiled else None
 
         # Evaluate safely
         try:
-            result = self._safe_eval(processed)
+            if arithmetic:
+                result = eval(arithmetic, {"__builtins__": {}}, self.context.get_all_variables())
+            elif compiled is None or bindings is None:
+                result = self._safe_eval(self._process_expression(expr))
+            else:
+                result = eval(compiled[0], _EVAL_GLOBALS, bindings)
             return float(result)
         except Exception as e:
             raise ValueError(f"Failed to evaluate expression '{expr}': {e}") from e
@@ -82,12 +167,10 @@ class MathEvaluator:
         # Replace variables with their values
         expr = self._replace_variables(expr)
 
-        # Replace LaTeX functions with Python equivalents
+        # Replace LaTeX functions with Python equivalents (trig functions
+        # become their degree-based versions)
         expr = self._replace_functions(expr)
 
-        # Convert degrees to radians for trig functions
-        expr = self._handle_trig_degrees(expr)
-
         return expr
 
     def _replace_variables(self, expr: str) -> str:
@@ -100,8 +183,6 @@ class MathEvaluator:
         Returns:
             Expression with variables replaced
         """
-        # Find all variable references (\varname)
-        var_pattern = r"\\([a-zA-Z_][a-zA-Z0-9_]*)"
 
         def replace_var(match):
             var_name = match.group(1)
@@ -114,7 +195,7 @@ class MathEvaluator:
             # Convert value to string for substitution
             return str(value)
 
-        return re.sub(var_pattern, replace_var, expr)
+        return _VARIABLE_RE.sub(replace_var, expr)
 
     def _replace_functions(self, expr: str) -> str:
         """
@@ -136,28 +217,48 @@ class MathEvaluator:
 
         return expr
 
-    def _handle_trig_degrees(self, expr: str) -> str:
+    def _numeric_bindings(
+        self, names: Tuple[str, ...], bare_names: Tuple[str, ...]
+    ) -> Optional[Dict[str, Any]]:
         """
-        Convert degree arguments to radians for trig functions.
-
-        TikZ uses degrees by default for trig functions.
+        Look up the values of the variables of a compiled expression.
 
         Args:
-            expr: Expression with trig functions
+            names: Variable names referenced as \\name
+            bare_names: Other names the expression reads, which may be
+                context variables
+
+        Returns:
+            Local names for eval(), mapping placeholder identifiers and the
+            defined bare names to values, or None if a \\name variable is
+            undefined or not numeric
+        """
+        bindings = {_PLACEHOLDER_PREFIX + name: self.context.get_variable(name) for name in names}
+        numeric = all(
+            isinstance(value, (int, float)) and not isinstance(value, bool)
+            for value in bindings.values()
+        )
+        bindings.update(
+            (name, value)
+            for name in bare_names
+            if (value := self.context.get_variable(name)) is not None
+        )
+        return bindings if numeric else None
+
+    def _namespace(self) -> Dict[str, Any]:
+        """
+        Build the restricted namespace used for eval of substituted text.
 
         Returns:
-            Expression with degree-to-radian conversions
+            Namespace dictionary
         """
-        # Pattern to match trig functions with their arguments
-        trig_pattern = r"math\.(sin|cos|tan)\s*\(([^)]+)\)"
+        # Create a restricted namespace
+        safe_namespace = dict(_EVAL_GLOBALS)
 
-        def convert_to_radians(match):
-            func = match.group(1)
-            arg = match.group(2)
-            # Convert degrees to radians: radians = degrees * pi / 180
-            return f"math.{func}(math.radians({arg}))"
+        # Add all variables from context
+        safe_namespace.update(self.context.get_all_variables())
 
-        return re.sub(trig_pattern, convert_to_radians, expr)
+        return safe_namespace
 
     def _safe_eval(self, expr: str) -> Any:
         """
@@ -172,21 +273,8 @@ class MathEvaluator:
         Raises:
             ValueError: If evaluation fails
         """
-        # Create a restricted namespace
-        safe_namespace = {
-            "__builtins__": {},
-            "math": math,
-            "abs": abs,
-            "round": round,
-            "min": min,
-            "max": max,
-        }
-
-        # Add all variables from context
-        safe_namespace.update(self.context.get_all_variables())
-
         try:
-            result = eval(expr, safe_namespace)
+            result = eval(expr, self._namespace())
             return result
         except Exception as e:
             raise ValueError(f"Evaluation error: {e}") from e
@@ -208,3 +296,100 @@ class MathEvaluator:
             return self.evaluate(value)
 
         return 0.0
+
+
+# Context-free instance whose rewriting helpers are shared by the compile cache
+_COMPILER = MathEvaluator()
+
+
+@lru_cache(maxsize=1024)
+def _compile_expression(expr: str) -> Optional[Tuple[Any, Tuple[str, ...], Tuple[str, ...]]]:
+    """
+    Compile an expression once, independently of variable values.
+
+    Each \\name reference becomes a placeholder identifier bound at eval time,
+    so the same code object serves every foreach iteration. The code runs
+    with the shared _EVAL_GLOBALS, so only the names it reads need binding.
+
+    Args:
+        expr: Raw expression
+
+    Returns:
+        Tuple of (code object, referenced variable names, bare names that
+        may be context variables), or None if the expression only makes
+        sense after textual substitution
+    """
+    names = tuple(dict.fromkeys(_VARIABLE_RE.findall(expr)))
+    processed = _VARIABLE_RE.sub(lambda m: _PLACEHOLDER_PREFIX + m.group(1), expr)
+    processed = _COMPILER._replace_functions(processed)
+    bare_names = tuple(
+        dict.fromkeys(
+            name
+            for name in _NAME_RE.findall(processed)
+            if name not in _EVAL_GLOBALS and not name.startswith(_PLACEHOLDER_PREFIX)
+        )
+    )
+    try:
+        compiled = (compile(processed, "<tikz>", "eval"), names, bare_names)
+    except (SyntaxError, ValueError):
+        compiled = None
+    return compiled
+
+
+def is_constant_expression(expr: str) -> bool:
+    """
+    Check whether an expression's value cannot depend on any variable.
+
+    Variables are referenced as \\name, but they are also exposed to eval()
+    by bare name, so any identifier other than a known function could be one.
+
+    Args:
+        expr: Expression string
+
+    Returns:
+        True if the expression only uses literals, operators and functions
+    """
+    return "\\" not in expr and all(
+        name in MathEvaluator.FUNCTION_MAP for name in _IDENTIFIER_RE.findall(expr)
+    )
+
+
+def fold_constant(expr: str) -> Union[float, str]:
+    """
+    Evaluate an expression ahead of time if it cannot depend on any variable.
+
+    Lets the parser store literal coordinates such as (2*3,sqrt(4)) as
+    floats, so the converter never evaluates them.
+
+    Args:
+        expr: Expression string
+
+    Returns:
+        The value as a float for a valid constant expression, otherwise the
+        expression unchanged
+    """
+    folded: Union[float, str]
+    if is_constant_expression(expr) and (outcome := _evaluate_constant(expr))[1] is None:
+        folded = outcome[0]
+    else:
+        folded = expr
+    return folded
+
+
+@lru_cache(maxsize=4096)
+def _evaluate_constant(expr: str) -> Tuple[float, Optional[str]]:
+    """
+    Evaluate a constant expression once.
+
+    Args:
+        expr: Expression for which is_constant_expression() holds
+
+    Returns:
+        Tuple of (result, error message); the message is None on success
+    """
+    outcome: Tuple[float, Optional[str]]
+    try:
+        outcome = (_COMPILER._evaluate_expression(expr), None)
+    except ValueError as e:
+        outcome = (0.0, str(e))
+    return outcome
@@ -1,6 +1,28 @@
 """TikZ parser package."""
 
+from importlib import import_module
+from typing import Any, List
+
 from .ast_nodes import *
-from .parser import TikzParser
+
+# TikzParser builds on Lark, so it is imported on first use; the AST nodes
+# are small and needed by every caller
+_LAZY_EXPORTS = {"TikzParser": ".parser"}
 
 __all__ = ["TikzParser"]
+
+
+def __getattr__(name: str) -> Any:
+    """Import TikzParser on first access (PEP 562).
+
+    The imported class is cached in the module globals.
+    """
+    if (module := _LAZY_EXPORTS.get(name)) is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = globals()[name] = getattr(import_module(module, __name__), name)
+    return value
+
+
+def __dir__() -> List[str]:
+    """List the lazy exports alongside the module's own names."""
+    return sorted({*globals(), *_LAZY_EXPORTS})
@@ -1,17 +1,73 @@
 """AST node classes for TikZ representation."""
 
-from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional
-
-
-@dataclass
+import copy
+import sys
+from dataclasses import dataclass, field, fields
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+
+def _slotted_dataclass(cls):
+    """Backport of dataclass(slots=True) for Python < 3.10.
+
+    Rebuilds the dataclass with __slots__ for the fields it declares itself;
+    inherited fields are already slotted by the base class. Defaults live in
+    the generated __init__, so the class attributes holding them are dropped.
+    """
+    cls = dataclass(cls)
+    own_fields = tuple(cls.__dict__.get("__annotations__", {}))
+    namespace = {
+        key: value
+        for key, value in cls.__dict__.items()
+        if key not in own_fields and key not in ("__dict__", "__weakref__")
+    }
+    namespace["__slots__"] = own_fields
+    slotted = type(cls)(cls.__name__, cls.__bases__, namespace)
+    slotted.__qualname__ = cls.__qualname__
+    return slotted
+
+
+# Slotted nodes have no per-instance __dict__: smaller, and faster attribute
+# access while the converter walks the tree
+if TYPE_CHECKING:
+    # Type checkers only recognise the dataclass decorator itself (under any
+    # import name); slots do not change the generated __init__
+    from dataclasses import dataclass as _ast_dataclass
+else:
+    _ast_dataclass = dataclass(slots=True) if sys.version_info >= (3, 10) else _slotted_dataclass
+
+
+# Dataclass field names by node class, filled in on a class's first copy
+_FIELD_NAMES: Dict[type, Tuple[str, ...]] = {}
+
+
+def _field_names(cls: type) -> Tuple[str, ...]:
+    """Names of a node class's dataclass fields, in declaration order."""
+    if (names := _FIELD_NAMES.get(cls)) is None:
+        names = _FIELD_NAMES[cls] = tuple(f.name for f in fields(cls))
+    return names
+
+
+@_ast_dataclass
 class ASTNode:
     """Base class for all AST nodes."""
 
-    pass
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "ASTNode":
+        """Copy the node field by field.
 
+        TikzParser.parse() deep-copies every memoized tree; going through the
+        generic __reduce_ex__ protocol is over twice as slow for slotted
+        dataclasses. Strings are shared as usual, so interned names stay
+        interned.
+        """
+        clone = object.__new__(type(self))
+        memo[id(self)] = clone
+        for name in _field_names(type(self)):
+            setattr(clone, name, copy.deepcopy(getattr(self, name), memo))
+        return clone
 
-@dataclass
+
+@_ast_dataclass
 class TikzPicture(ASTNode):
     """Root node representing a tikzpicture environment."""
 
@@ -19,44 +75,64 @@ class TikzPicture(ASTNode):
     statements: List[ASTNode] = field(default_factory=list)
 
 
-@dataclass
+@_ast_dataclass
 class Coordinate(ASTNode):
     """Represents a coordinate in any system."""
 
     system: str  # 'cartesian', 'polar', 'named', '3d', 'relative'
-    values: List[Any] = field(default_factory=list)  # Can be float or str (for expressions)
+    values: Tuple[Any, ...] = ()  # Can be float or str (for expressions)
     name: Optional[str] = None
     modifiers: Dict[str, Any] = field(default_factory=dict)  # shift, rotate, etc.
 
+    @classmethod
+    def cartesian(cls, x: Any, y: Any) -> "Coordinate":
+        """Return the shared cartesian coordinate (x, y).
+
+        The same (x, y) always yields the same instance, handed to every
+        caller using that literal. It must not be mutated, and that includes
+        its modifiers dict: a change would silently apply to all of them.
+        Derive a new node instead, e.g. dataclasses.replace(coord,
+        modifiers={...}) with a fresh dict.
+        """
+        return _cartesian(x, y)
+
+
+# typed: 1, 1.0 and "1" are equal or alike as keys but distinct coordinates
+@lru_cache(maxsize=4096, typed=True)
+def _cartesian(x: Any, y: Any) -> Coordinate:
+    """Build a cartesian coordinate once per distinct (x, y); see Coordinate.cartesian()."""
+    return Coordinate(system="cartesian", values=(x, y))
+
 
-@dataclass
+@_ast_dataclass
 class PathSegment(ASTNode):
     """A single segment in a path."""
 
     operation: str  # '--', '..', 'arc', 'circle', 'rectangle', etc.
     destination: Optional[Coordinate] = None
-    control_points: List[Coordinate] = field(default_factory=list)
+    control_points: Tuple[Coordinate, ...] = ()
     options: Dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
+@_ast_dataclass
 class Path(ASTNode):
     """A complete path with multiple segments."""
 
-    segments: List[PathSegment] = field(default_factory=list)
+    segments: Tuple[PathSegment, ...] = ()
     closed: bool = False
 
 
-@dataclass
+@_ast_dataclass
 class DrawStatement(ASTNode):
     """A \\draw, \\fill, or \\filldraw command."""
 
     command: str  # 'draw', 'fill', 'filldraw', 'clip'
     options: Dict[str, Any] = field(default_factory=dict)
     path: Path = field(default_factory=Path)
+    is_simple: bool = False  # Set by the parser when no segment has inline labels
 
 
-@dataclass
+@_ast_dataclass
 class Node(ASTNode):
     """A \\node command."""
 
@@ -66,7 +142,7 @@ class Node(ASTNode):
     options: Dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
+@_ast_dataclass
 class CoordinateDefinition(ASTNode):
     """A \\coordinate command defining a named point."""
 
@@ -75,7 +151,7 @@ class CoordinateDefinition(ASTNode):
     options: Dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
+@_ast_dataclass
 class Scope(ASTNode):
     """A scope environment with inherited options."""
 
@@ -83,17 +159,17 @@ class Scope(ASTNode):
     statements: List[ASTNode] = field(default_factory=list)
 
 
-@dataclass
+@_ast_dataclass
 class ForeachLoop(ASTNode):
     """A \\foreach loop."""
 
     variables: List[str] = field(default_factory=list)
     values: List[Any] = field(default_factory=list)
-    evaluate_clause: Optional[str] = None
+    evaluate_clause: Optional[Dict[str, str]] = None
     body: List[ASTNode] = field(default_factory=list)
 
 
-@dataclass
+@_ast_dataclass
 class MacroDefinition(ASTNode):
     """A macro definition (\\def, \\newcommand, \\pgfmathsetmacro)."""
 
@@ -103,7 +179,7 @@ class MacroDefinition(ASTNode):
     macro_type: str = "def"  # 'def', 'newcommand', 'pgfmathsetmacro'
 
 
-@dataclass
+@_ast_dataclass
 class Layer(ASTNode):
     """A pgfonlayer environment."""
 
@@ -111,21 +187,21 @@ class Layer(ASTNode):
     statements: List[ASTNode] = field(default_factory=list)
 
 
-@dataclass
+@_ast_dataclass
 class LayerDeclaration(ASTNode):
     """A layer declaration (\\pgfdeclarelayer)."""
 
     name: str = ""
 
 
-@dataclass
+@_ast_dataclass
 class LayerSet(ASTNode):
     """Layer ordering specification (\\pgfsetlayers)."""
 
     layers: List[str] = field(default_factory=list)
 
 
-@dataclass
+@_ast_dataclass
 class StyleDefinition(ASTNode):
     """Style definition (\\tikzset)."""
 
@@ -1,12 +1,71 @@
 """TikZ parser using Lark."""
 
-from pathlib import Path
+import copy
+import dataclasses
+import math
+import os
+import sys
+import threading
+from array import array
+from collections import OrderedDict
+from typing import Any, Dict, Tuple, Union
 
 from lark import Lark, Token, Transformer
 
+from ..evaluator.math_eval import fold_constant
 from .ast_nodes import *
 from .preprocessor import TikzPreprocessor
 
+# Sources longer than this are parsed directly rather than memoized
+_PARSE_CACHE_MAX_SOURCE = 8192
+
+# Number of memoized parses kept, least recently used evicted first
+_PARSE_CACHE_SIZE = 256
+
+# (AST, macros defined) by source, shared by every TikzParser: all instances
+# use the same grammar and preprocessing, so a fresh parser hits it as well
+_parse_memo: "OrderedDict[str, Tuple[TikzPicture, Dict[str, Any]]]" = OrderedDict()
+
+# Guards _parse_memo, whose lookups reorder it, across threads
+_parse_memo_lock = threading.Lock()
+
+
+def _lark_cache() -> Union[str, bool]:
+    """Return the file Lark should keep the analysed LALR tables in.
+
+    Lark's own default (cache=True) is a predictable name in the shared temp
+    directory, so the tables go to a private per-user cache directory instead.
+    Lark checks the grammar hash stored in the file, so a fixed name is safe.
+    Without a usable cache directory the tables are rebuilt every time.
+    """
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    cache_dir = os.path.join(cache_home, "tikz2svg")
+    try:
+        os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+        cache: Union[str, bool] = os.path.join(cache_dir, "grammar.lalr.cache")
+    except OSError:
+        cache = False
+    return cache
+
+
+def _build_parser() -> Lark:
+    """Build the Lark parser for the TikZ grammar."""
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), "grammar.lark")) as f:
+        grammar = f.read()
+
+    # Caching the analysed LALR tables lets later processes skip building them
+    return Lark(grammar, parser="lalr", transformer=TikzTransformer(), cache=_lark_cache())
+
+
+def _intern_text(value: Any) -> Any:
+    """Intern an option key or string value; other values pass through.
+
+    A handful of option names and values ("red", "thick", "fill") recur in
+    every figure. Interned, the AST shares one object per spelling and the
+    style cache compares its keys by identity.
+    """
+    return sys.intern(str(value)) if isinstance(value, str) else value
+
 
 class TikzTransformer(Transformer):
     """Transforms Lark parse tree into TikZ AST."""
@@ -51,7 +110,10 @@ class TikzTransformer(Transformer):
             elif isinstance(item, Path):
                 path = item
 
-        return DrawStatement(command=command, options=options, path=path or Path())
+        path = path or Path()
+        # Segment options only carry inline coordinate and node labels
+        is_simple = not any(segment.options for segment in path.segments)
+        return DrawStatement(command=command, options=options, path=path, is_simple=is_simple)
 
     def draw_stmt(self, items):
         """Transform draw statement."""
@@ -156,7 +218,7 @@ class TikzTransformer(Transformer):
 
             i += 1
 
-        return Path(segments=segments)
+        return Path(segments=tuple(segments))
 
     def _expand_inline_foreach(self, foreach_dict):
         """Expand inline foreach loop into path elements.
@@ -215,15 +277,11 @@ class TikzTransformer(Transformer):
             New coordinate with variables substituted
         """
         if isinstance(element, Coordinate):
-            # Create a copy with substituted values
-            new_values = []
-            for val in element.values:
-                if isinstance(val, str):
-                    # Try to substitute variables in the string
-                    substituted = self._substitute_vars_in_expr(val, var_map)
-                    new_values.append(substituted)
-                else:
-                    new_values.append(val)
+            # Create a copy, substituting variables in the string values
+            new_values = tuple(
+                self._substitute_vars_in_expr(val, var_map) if isinstance(val, str) else val
+                for val in element.values
+            )
 
             return Coordinate(
                 system=element.system,
@@ -391,7 +449,7 @@ class TikzTransformer(Transformer):
         for item in items:
             if isinstance(item, Coordinate):
                 controls.append(item)
-        return {"_type": "controls", "points": controls}
+        return {"_type": "controls", "points": tuple(controls)}
 
     def inline_foreach_path(self, items):
         """Transform inline foreach within path.
@@ -406,8 +464,8 @@ class TikzTransformer(Transformer):
         seen_list = False
 
         for item in items:
-            if isinstance(item, list) and len(item) > 0:
-                # First list is variables, second is values
+            if isinstance(item, (list, array)) and len(item) > 0:
+                # First list is variables, second is values (a list or a range array)
                 if not seen_list:
                     variables = item
                     seen_list = True
@@ -462,7 +520,7 @@ class TikzTransformer(Transformer):
                 values=inner_coord.values,
                 modifiers={"operator": operator, "inner_system": inner_coord.system},
             )
-        return Coordinate(system="relative", values=[0, 0], modifiers={"operator": operator})
+        return Coordinate(system="relative", values=(0, 0), modifiers={"operator": operator})
 
     def coordinate(self, items):
         """Transform coordinate specification."""
@@ -474,30 +532,32 @@ class TikzTransformer(Transformer):
 
     def cartesian_coord(self, items):
         """Transform Cartesian coordinate."""
-        # Keep as strings for later evaluation
-        x = str(items[0])
-        y = str(items[1])
-        return Coordinate(system="cartesian", values=[x, y])
+        # Constant values are folded to floats now; anything that may read a
+        # variable is kept as a string for later evaluation
+        x = fold_constant(str(items[0]))
+        y = fold_constant(str(items[1]))
+        return Coordinate.cartesian(x, y)
 
     def polar_coord(self, items):
         """Transform polar coordinate."""
-        # Keep as strings for later evaluation
-        angle = str(items[0])
-        radius = str(items[1])
-        return Coordinate(system="polar", values=[angle, radius])
+        # Folded like cartesian values
+        angle = fold_constant(str(items[0]))
+        radius = fold_constant(str(items[1]))
+        return Coordinate(system="polar", values=(angle, radius))
 
     def named_coord(self, items):
         """Transform named coordinate."""
-        name = str(items[0])
+        # Interned, like the names stored by CoordinateResolver.store_named,
+        # so resolving it is an identity hit in the dict lookup
+        name = sys.intern(str(items[0]))
         anchor = items[1] if len(items) > 1 else None
-        return Coordinate(system="named", name=name, values=[])
+        return Coordinate(system="named", name=name)
 
     def relative_coord(self, items):
         """Transform relative coordinate."""
         # items[0] is '++' or '+', items[1] is the coordinate
         coord = items[-1]  # The actual coordinate
-        coord.system = "relative"
-        return coord
+        return dataclasses.replace(coord, system="relative")
 
     def anchor(self, items):
         """Return anchor name (can be multi-word like 'north east')."""
@@ -530,7 +590,7 @@ class TikzTransformer(Transformer):
 
     def node_name(self, items):
         """Extract node name."""
-        return {"_type": "node_name", "name": str(items[0])}
+        return {"_type": "node_name", "name": sys.intern(str(items[0]))}
 
     def node_position(self, items):
         """Extract node position."""
@@ -575,12 +635,15 @@ class TikzTransformer(Transformer):
         return {"_type": "node_label", "name": name, "text": text, "options": options}
 
     def name_with_vars(self, items):
-        """Extract name that may contain variable references."""
+        """Extract name that may contain variable references.
+
+        Names are interned: they end up as keys of the named coordinate table.
+        """
         from lark import Token
 
         if items and isinstance(items[0], Token):
-            return str(items[0].value)
-        return str(items[0]) if items else ""
+            return sys.intern(str(items[0].value))
+        return sys.intern(str(items[0])) if items else ""
 
     def coordinate_stmt(self, items):
         """Transform coordinate definition."""
@@ -699,8 +762,8 @@ class TikzTransformer(Transformer):
         seen_list = False
 
         for item in items:
-            if isinstance(item, list) and len(item) > 0:
-                # First list is variables, second is values
+            if isinstance(item, (list, array)) and len(item) > 0:
+                # First list is variables, second is values (a list or a range array)
                 if not seen_list:
                     variables = item
                     seen_list = True
@@ -807,19 +870,17 @@ class TikzTransformer(Transformer):
                 end_val = float(end)
                 step = float(step)
 
-                # Generate range values
-                values = []
-                current = start_val
-                if step > 0:
-                    while current <= end_val + 1e-10:  # Small epsilon for float comparison
-                        values.append(current)
-                        current += step
-                elif step < 0:
-                    while current >= end_val - 1e-10:
-                        values.append(current)
-                        current += step
+                # Generate range values, stored unboxed since they are all floats.
+                # The length is computed up front (small epsilon for float
+                # comparison) and each value as start + i*step, so the array is
+                # built in one call and long ranges do not accumulate rounding
+                if step:
+                    count = max(
+                        0, math.floor((end_val - start_val + math.copysign(1e-10, step)) / step) + 1
+                    )
+                    values = array("d", [start_val + i * step for i in range(count)])
                 else:
-                    values.append(start_val)  # Zero step, just return start
+                    values = array("d", [start_val])  # Zero step, just return start
                 return values
             except Exception:
                 # If evaluation fails, return the range as a dict for later evaluation
@@ -874,10 +935,11 @@ class TikzTransformer(Transformer):
             return item
         elif isinstance(item, tuple):
             # key-value tuple
-            return {item[0]: item[1]}
+            key, value = item
+            return {_intern_text(key): _intern_text(value)}
         else:
             # flag
-            key = self._to_string(item)
+            key = _intern_text(self._to_string(item))
             return {key: True}
 
     def arrow_spec(self, items):
@@ -1005,16 +1067,25 @@ class TikzTransformer(Transformer):
             return f"\\{items[1].value}"
 
         # Multiple items - reconstruct expression
-        # Format: expr MATH_OP expr, or function(expr), or (expr)
-        result = ""
-        for item in items:
-            if isinstance(item, Token):
-                # Handle MATH_OP and other tokens
-                result += str(item.value)
-            else:
-                result += str(item)
+        # Format: expr MATH_OP expr, or function(expr), or (expr); tokens
+        # contribute their text, joined in one pass
+        return "".join(str(item.value if isinstance(item, Token) else item) for item in items)
 
-        return result
+    def var_ref(self, items):
+        """Transform variable reference, keeping its backslash."""
+        return f"\\{items[0]}"
+
+    def math_function(self, items):
+        """Transform math function name."""
+        return str(items[0])
+
+    def function_call(self, items):
+        """Transform function call, keeping the parentheses around its argument."""
+        return f"{items[0]}({items[1]})"
+
+    def paren_expr(self, items):
+        """Transform parenthesized expression, keeping the parentheses."""
+        return f"({items[0]})"
 
     def text(self, items):
         """Extract text content."""
@@ -1054,26 +1125,73 @@ class TikzParser:
 
     def __init__(self):
         """Initialize parser with grammar."""
-        import os
+        self.parser = _build_parser()
+        self.preprocessor = TikzPreprocessor()
 
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        grammar_path = os.path.join(current_dir, "grammar.lark")
-        with open(grammar_path, "r") as f:
-            grammar = f.read()
+    def __getstate__(self) -> Dict[str, Any]:
+        """Pickle only the preprocessor state; the Lark parser is rebuilt on load.
 
-        self.parser = Lark(grammar, parser="lalr", transformer=TikzTransformer())
-        self.preprocessor = TikzPreprocessor()
+        Lets parsers be sent to worker processes (e.g. pytest-xdist).
+        """
+        return {"preprocessor": self.preprocessor}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        """Restore a pickled parser, rebuilding Lark from the cached tables."""
+        self.parser = _build_parser()
+        self.preprocessor = state["preprocessor"]
+
+    def reset(self) -> None:
+        """Forget macros defined by previously parsed code."""
+        self.preprocessor.macro_expander.macros.clear()
 
     def parse(self, tikz_code: str) -> TikzPicture:
-        """Parse TikZ code into AST."""
+        """Parse TikZ code into AST.
+
+        Short sources parsed while no macros are defined are memoized, across
+        parser instances: the result depends only on the text then. Each call
+        gets its own copy of the tree, and macros the source defines are
+        registered as usual.
+        """
+        macros = self.preprocessor.macro_expander.macros
         try:
-            # Preprocess the code
-            tikz_code = self.preprocessor.preprocess(tikz_code)
-            ast = self.parser.parse(tikz_code)
+            if len(tikz_code) <= _PARSE_CACHE_MAX_SOURCE and not macros:
+                # The copy keeps callers from mutating the memoized tree, at the
+                # cost of also copying the shared Coordinate.cartesian() nodes:
+                # a hit's coordinates are equal to, not the same as, the flyweights
+                ast, defined = copy.deepcopy(self._parse_cached(tikz_code))
+                macros.update(defined)
+            else:
+                ast = self._parse_source(tikz_code)
             return ast
         except Exception as e:
             raise ValueError(f"Failed to parse TikZ code: {e}")
 
+    def _parse_source(self, tikz_code: str) -> TikzPicture:
+        """Preprocess and parse TikZ code without memoization."""
+        # Preprocess the code
+        tikz_code = self.preprocessor.preprocess(tikz_code)
+        return self.parser.parse(tikz_code)
+
+    def _parse_cached(self, tikz_code: str) -> Tuple[TikzPicture, Dict[str, Any]]:
+        """Look up or parse a source in the shared memo (macro table must be empty)."""
+        with _parse_memo_lock:
+            if (entry := _parse_memo.get(tikz_code)) is not None:
+                _parse_memo.move_to_end(tikz_code)
+        if entry is None:
+            # Parsed outside the lock so a slow source does not hold up other
+            # threads; concurrent misses on one source just parse it twice
+            entry = self._parse_defining_macros(tikz_code)
+            with _parse_memo_lock:
+                _parse_memo[tikz_code] = entry
+                if len(_parse_memo) > _PARSE_CACHE_SIZE:
+                    _parse_memo.popitem(last=False)
+        return entry
+
+    def _parse_defining_macros(self, tikz_code: str) -> Tuple[TikzPicture, Dict[str, Any]]:
+        """Parse with an empty macro table; also return the macros it defined."""
+        ast = self._parse_source(tikz_code)
+        return ast, dict(self.preprocessor.macro_expander.macros)
+
     def parse_file(self, file_path: str) -> TikzPicture:
         """Parse TikZ code from file."""
         with open(file_path, "r") as f:
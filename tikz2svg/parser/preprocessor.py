@@ -4,6 +4,16 @@ import re
 
 from ..evaluator.macro_expander import MacroExpander
 
+# An unescaped % and the rest of its line
+_COMMENT_RE = re.compile(r"(?<!\\)%[^\n]*")
+_TIKZ_ENV_RE = re.compile(r"\\begin{tikzpicture}.*?\\end{tikzpicture}", re.DOTALL)
+# Tokens of the fused comment/environment scan
+_SCAN_RE = re.compile(
+    r"(?P<comment>(?<!\\)%[^\n]*)|(?P<begin>\\begin{tikzpicture})|(?P<end>\\end{tikzpicture})"
+)
+# A line break with the whitespace around it, including any blank lines
+_LINE_BREAK_RE = re.compile(r"\s*\n\s*")
+
 
 class TikzPreprocessor:
     """Preprocesses TikZ code before parsing."""
@@ -13,11 +23,8 @@ class TikzPreprocessor:
 
     def preprocess(self, tikz_code: str) -> str:
         """Preprocess TikZ code."""
-        # Remove LaTeX comments
-        tikz_code = self.remove_comments(tikz_code)
-
-        # Extract tikzpicture environments
-        tikz_code = self.extract_tikzpicture(tikz_code)
+        # Remove LaTeX comments and extract tikzpicture environments
+        tikz_code = self.strip_and_extract(tikz_code)
 
         # Expand macros (must be before parsing)
         tikz_code = self.macro_expander.extract_and_expand(tikz_code)
@@ -27,19 +34,53 @@ class TikzPreprocessor:
 
         return tikz_code
 
+    def strip_and_extract(self, tikz_code: str) -> str:
+        """Remove comments and extract tikzpicture environments in one pass.
+
+        Equivalent to extract_tikzpicture(remove_comments(tikz_code)), but the
+        source is scanned once: comments are skipped while the comment-free
+        text is assembled, and environment spans are recorded as offsets into it.
+
+        Most sources have no comment at all; ``in`` finds that with a single C
+        level search, and extraction is then one findall with no Python loop.
+        """
+        return (
+            self._scan_comments_and_environments(tikz_code)
+            if "%" in tikz_code
+            else self.extract_tikzpicture(tikz_code)
+        )
+
+    def _scan_comments_and_environments(self, tikz_code: str) -> str:
+        """Token scan behind strip_and_extract() for sources with comments."""
+        pieces = []
+        spans = []
+        pos = length = 0
+        start = None
+
+        for match in _SCAN_RE.finditer(tikz_code):
+            kind = match.lastgroup
+            kept = tikz_code[pos : match.start() if kind == "comment" else match.end()]
+            pieces.append(kept)
+            length += len(kept)
+            if kind == "begin" and start is None:
+                start = length - len(match.group())
+            elif kind == "end" and start is not None:
+                spans.append((start, length))
+                start = None
+            pos = match.end()
+
+        pieces.append(tikz_code[pos:])
+        text = "".join(pieces)
+        return "\n".join(text[a:b] for a, b in spans) if spans else text
+
     def remove_comments(self, tikz_code: str) -> str:
         """Remove LaTeX comments (% to end of line)."""
-        lines = [
-            line[: match.start()] if (match := re.search(r"(?<!\\)%", line)) else line
-            for line in tikz_code.split("\n")
-        ]
-        return "\n".join(lines)
+        return _COMMENT_RE.sub("", tikz_code)
 
     def extract_tikzpicture(self, tikz_code: str) -> str:
         """Extract just the tikzpicture environment(s)."""
         # Find all tikzpicture environments
-        pattern = r"\\begin{tikzpicture}.*?\\end{tikzpicture}"
-        matches = re.findall(pattern, tikz_code, re.DOTALL)
+        matches = _TIKZ_ENV_RE.findall(tikz_code)
 
         if matches:
             # Return all tikzpicture environments concatenated
@@ -50,10 +91,5 @@ class TikzPreprocessor:
 
     def normalize_whitespace(self, tikz_code: str) -> str:
         """Normalize whitespace while preserving structure."""
-        # Remove leading/trailing whitespace from lines
-        lines = [line.strip() for line in tikz_code.split("\n")]
-
-        # Remove empty lines
-        lines = [line for line in lines if line]
-
-        return "\n".join(lines)
+        # Strip every line and drop empty ones in a single pass
+        return _LINE_BREAK_RE.sub("\n", tikz_code.strip())
@@ -1,5 +1,25 @@
 """SVG generation package."""
 
-from .converter import SVGConverter
+from importlib import import_module
+from typing import Any, List
+
+# The converter imports every SVG module, so it is loaded on first use
+_LAZY_EXPORTS = {"SVGConverter": ".converter"}
 
 __all__ = ["SVGConverter"]
+
+
+def __getattr__(name: str) -> Any:
+    """Import SVGConverter on first access (PEP 562).
+
+    The imported class is cached in the module globals.
+    """
+    if (module := _LAZY_EXPORTS.get(name)) is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = globals()[name] = getattr(import_module(module, __name__), name)
+    return value
+
+
+def __dir__() -> List[str]:
+    """List the lazy exports alongside the module's own names."""
+    return sorted({*globals(), *_LAZY_EXPORTS})
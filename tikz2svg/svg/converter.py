@@ -1,12 +1,13 @@
 """Convert TikZ AST to SVG."""
 
-from typing import Tuple
+from functools import partial
+from typing import Callable, Iterator, Tuple, Union, cast
 
 from ..evaluator.context import EvaluationContext
 from ..evaluator.math_eval import MathEvaluator
 from ..parser.ast_nodes import *
 from .coordinate_resolver import CoordinateResolver
-from .geometry import CoordinateTransformer
+from .geometry import make_transformer
 from .loop_expander import ForeachLoopExpander
 from .math_renderer import MathRenderer
 from .option_processor import OptionProcessor
@@ -14,6 +15,61 @@ from .path_renderer import PathRenderer
 from .string_evaluator import StringEvaluator
 from .styles import StyleConverter
 
+# Separator between sibling elements at the top level of the document
+_ELEMENT_SEP = "\n  "
+
+# Separator between the elements of a <g> group, and the group templates
+# filled with the group attribute and the joined elements
+_GROUP_SEP = "\n    "
+_SCOPE_GROUP = '<g style="%s">\n    %s\n  </g>'
+_LAYER_GROUP = '<g data-layer="%s">\n    %s\n  </g>'
+
+# Root element of the document, around the sibling elements
+_SVG_OPEN = '<svg xmlns="http://www.w3.org/2000/svg" width="%s" height="%s" viewBox="0 0 %s %s">'
+_SVG_CLOSE = "\n</svg>"
+
+# Marker attributes appended to <path> elements for arrow tips
+_MARKER_START_ATTR = ' marker-start="url(#arrow-start)"'
+_MARKER_END_ATTR = ' marker-end="url(#arrow-end)"'
+
+# Visit method for each statement type, keyed by exact type. Methods are
+# stored by name so converter subclasses can override them. Other types are
+# resolved through their MRO on first sight and cached here, None meaning no
+# visitor
+_STATEMENT_VISITORS: Dict[type, Optional[str]] = {
+    DrawStatement: "visit_draw_statement",
+    Node: "visit_node",
+    CoordinateDefinition: "visit_coordinate_definition",
+    Scope: "visit_scope",
+    ForeachLoop: "visit_foreach_loop",
+    MacroDefinition: "visit_macro_definition",
+    Layer: "visit_layer",
+    LayerDeclaration: "visit_layer_declaration",
+    LayerSet: "visit_layer_set",
+    StyleDefinition: "visit_style_definition",
+}
+
+# Statements whose children are walked by SVGConverter._visit_statements:
+# (visit method, method wrapping the rendered children in a group). A
+# converter subclass overriding the visit method gets it called instead
+_GROUP_WRAPPERS: Dict[type, Tuple[str, str]] = {
+    Scope: ("visit_scope", "_wrap_scope"),
+    Layer: ("visit_layer", "_wrap_layer"),
+}
+
+
+def _resolve_visitor(kind: type) -> Optional[str]:
+    """Find, and cache, the visit method of a type missing from _STATEMENT_VISITORS.
+
+    Subclasses of the statement types use their nearest base's visitor, as an
+    isinstance check would.
+    """
+    name = next(
+        (name for base in kind.__mro__[1:] if (name := _STATEMENT_VISITORS.get(base))), None
+    )
+    _STATEMENT_VISITORS[kind] = name
+    return name
+
 
 class SVGConverter:
     """Converts TikZ AST to SVG document."""
@@ -30,15 +86,16 @@ class SVGConverter:
         self.scale = scale
         self.width = width
         self.height = height
-        self.coord_transformer = CoordinateTransformer(scale, width // 2, height // 2)
+        self.coord_transformer = make_transformer(scale, width // 2, height // 2)
         self.style_converter = StyleConverter()
 
-        # Math evaluation
-        self.context = EvaluationContext()
-        self.evaluator = MathEvaluator(self.context)
+        # Math evaluation: one evaluator shared by every component, whose
+        # context is swapped when entering a foreach scope (see `context`)
+        self._context = EvaluationContext()
+        self.evaluator = MathEvaluator(self._context)
 
         # String evaluation
-        self.string_evaluator = StringEvaluator(self.context)
+        self.string_evaluator = StringEvaluator(self._context)
 
         # Math rendering
         self.math_renderer = MathRenderer()
@@ -58,9 +115,44 @@ class SVGConverter:
         # Loop expansion
         self.loop_expander = ForeachLoopExpander(self.option_processor)
 
+        # Number of <path> elements emitted by the last convert() call
+        self._path_count = 0
+
+    @property
+    def context(self) -> EvaluationContext:
+        """Current evaluation context (the innermost foreach scope)."""
+        return self._context
+
+    @context.setter
+    def context(self, context: EvaluationContext) -> None:
+        # The evaluators are shared with the coordinate resolver and option
+        # processor, so re-pointing them reaches every component at once
+        self._context = context
+        self.evaluator.context = context
+        self.string_evaluator.context = context
+
+    @property
+    def path_count(self) -> int:
+        """Number of drawn <path> elements in the last converted document.
+
+        Arrow marker definitions are not counted.
+        """
+        return self._path_count
+
+    def reset(self) -> None:
+        """Clear state left by previous conversions, so the converter can be reused.
+
+        Named coordinates and context variables otherwise carry over from one
+        convert() call to the next.
+        """
+        self.named_coordinates.clear()
+        self.context.variables.clear()
+        self.context.coordinates.clear()
+
     def convert(self, ast: TikzPicture) -> str:
         """Convert TikZ AST to SVG string."""
         elements = []
+        self._path_count = 0
 
         # Check if we need arrow markers
         has_arrows = self._check_for_arrows(ast)
@@ -70,17 +162,16 @@ class SVGConverter:
             elements.append(self._create_arrow_markers())
 
         # Process all statements
-        elements.extend(
-            svg_element for stmt in ast.statements if (svg_element := self.visit_statement(stmt))
-        )
+        elements.extend(self._visit_statements(ast.statements))
 
-        # Build SVG document
-        svg_content = "\n  ".join(elements)
-        svg_doc = f"""<svg xmlns="http://www.w3.org/2000/svg" width="{self.width}" height="{self.height}" viewBox="0 0 {self.width} {self.height}">
-  {svg_content}
-</svg>"""
+        # Build SVG document with a single join, so the elements are copied
+        # once. The closing tag goes on the last part; an empty picture keeps
+        # its blank content line
+        parts = [_SVG_OPEN % (self.width, self.height, self.width, self.height)]
+        parts.extend(elements or [""])
+        parts[-1] += _SVG_CLOSE
 
-        return svg_doc
+        return _ELEMENT_SEP.join(parts)
 
     def _process_inline_coordinates(self, path: Path) -> None:
         """Process inline coordinate labels in path segments.
@@ -99,7 +190,7 @@ class SVGConverter:
                 # Evaluate variables in coordinate name
                 evaluated_name = self.string_evaluator.evaluate(coord_name)
                 # Store it
-                self.named_coordinates[evaluated_name] = pos
+                self.coord_resolver.store_named(evaluated_name, pos)
 
     def _process_inline_nodes(self, path: Path, parent_options: Dict[str, Any] = None) -> list:
         """Process inline node labels in path segments.
@@ -113,8 +204,6 @@ class SVGConverter:
         Returns:
             List of SVG strings for the inline nodes
         """
-        from ..parser.ast_nodes import Node
-
         if parent_options is None:
             parent_options = {}
 
@@ -160,35 +249,89 @@ class SVGConverter:
     </marker>
   </defs>"""
 
+    def _visit_statements(self, statements: List[ASTNode]) -> List[str]:
+        """
+        Visit statements in order and return their non-empty SVG elements.
+
+        Nested scopes and layers are walked with an explicit stack instead of
+        recursion, so deep nesting costs no Python frames and cannot hit the
+        recursion limit. A group is wrapped once all of its children are done.
+        Groups whose visit method a subclass overrides go through that method.
+        """
+        # Groups walked here: those whose visit method is not overridden
+        walked = {
+            kind: wrap
+            for kind, (visit, wrap) in _GROUP_WRAPPERS.items()
+            if getattr(type(self), visit) is getattr(SVGConverter, visit)
+        }
+
+        elements: List[str] = []
+        # Frames of (pending statements, wrapper of the open group, its elements)
+        stack: List[
+            Tuple[Iterator[ASTNode], Optional[Callable[[List[str]], Optional[str]]], List[str]]
+        ] = [(iter(statements), None, elements)]
+        while stack:
+            pending, wrap, collected = stack[-1]
+            if (stmt := next(pending, None)) is None:
+                stack.pop()
+                if wrap and (group := wrap(collected)):
+                    stack[-1][2].append(group)
+            elif name := walked.get(type(stmt)):
+                # Only scopes and layers are walked, and both hold statements
+                node = cast(Union[Scope, Layer], stmt)
+                stack.append((iter(node.statements), partial(getattr(self, name), node), []))
+            elif element := self.visit_statement(stmt):
+                collected.append(element)
+        return elements
+
     def visit_statement(self, stmt: ASTNode) -> Optional[str]:
         """Visit a statement node."""
-        if isinstance(stmt, DrawStatement):
-            return self.visit_draw_statement(stmt)
-        elif isinstance(stmt, Node):
-            return self.visit_node(stmt)
-        elif isinstance(stmt, CoordinateDefinition):
-            return self.visit_coordinate_definition(stmt)
-        elif isinstance(stmt, Scope):
-            return self.visit_scope(stmt)
-        elif isinstance(stmt, ForeachLoop):
-            return self.visit_foreach_loop(stmt)
-        elif isinstance(stmt, MacroDefinition):
-            return self.visit_macro_definition(stmt)
-        elif isinstance(stmt, Layer):
-            return self.visit_layer(stmt)
-        elif isinstance(stmt, LayerDeclaration):
-            return self.visit_layer_declaration(stmt)
-        elif isinstance(stmt, LayerSet):
-            return self.visit_layer_set(stmt)
-        elif isinstance(stmt, StyleDefinition):
-            return self.visit_style_definition(stmt)
-        return None
+        visitor = self._statement_visitor(stmt)
+        return visitor(stmt) if visitor else None
+
+    def compile_statement(self, stmt: ASTNode) -> Optional[Callable[[], Optional[str]]]:
+        """
+        Bind a statement to its visitor, for bodies that are run many times.
+
+        The statement type is dispatched once here instead of on every
+        foreach iteration; calling the result visits the statement in the
+        converter's current context.
+
+        Returns:
+            Zero-argument callable rendering the statement, or None for
+            statements that produce no output
+        """
+        visitor = self._statement_visitor(stmt)
+        return partial(visitor, stmt) if visitor else None
+
+    def _statement_visitor(self, stmt: ASTNode) -> Optional[Callable[[Any], Optional[str]]]:
+        """Return the bound visit method for a statement, or None if it has none."""
+        kind = type(stmt)
+        name = _STATEMENT_VISITORS[kind] if kind in _STATEMENT_VISITORS else _resolve_visitor(kind)
+        return getattr(self, name) if name else None
 
     def visit_draw_statement(self, stmt: DrawStatement) -> str:
         """Convert draw statement to SVG path."""
-        # Process inline coordinate labels before rendering path
-        self._process_inline_coordinates(stmt.path)
+        if stmt.is_simple:
+            # No inline labels to store or render: just the path element
+            result = self._path_element(stmt)
+        else:
+            # Process inline coordinate labels before rendering path
+            self._process_inline_coordinates(stmt.path)
 
+            result = self._path_element(stmt)
+
+            # Process inline node labels and add them to the result
+            # Pass parent options so nodes can inherit color
+            inline_nodes = self._process_inline_nodes(stmt.path, stmt.options)
+            if inline_nodes:
+                # One join for the path and its labels instead of two concatenations
+                result = _ELEMENT_SEP.join([result, *inline_nodes])
+
+        return result
+
+    def _path_element(self, stmt: DrawStatement) -> str:
+        """Render the <path> element of a draw statement."""
         path_data = self.path_renderer.render_path(stmt.path)
 
         # Evaluate options with variables
@@ -197,24 +340,11 @@ class SVGConverter:
 
         # Check for arrows
         arrow_spec = stmt.options.get("arrow", "")
-        marker_start = ""
-        marker_end = ""
+        marker_start = _MARKER_START_ATTR if arrow_spec and "<-" in arrow_spec else ""
+        marker_end = _MARKER_END_ATTR if arrow_spec and "->" in arrow_spec else ""
 
-        if arrow_spec:
-            if "<-" in arrow_spec:
-                marker_start = ' marker-start="url(#arrow-start)"'
-            if "->" in arrow_spec:
-                marker_end = ' marker-end="url(#arrow-end)"'
-
-        result = f'<path d="{path_data}" style="{style}"{marker_start}{marker_end}/>'
-
-        # Process inline node labels and add them to the result
-        # Pass parent options so nodes can inherit color
-        inline_nodes = self._process_inline_nodes(stmt.path, stmt.options)
-        if inline_nodes:
-            result = result + "\n  " + "\n  ".join(inline_nodes)
-
-        return result
+        self._path_count += 1
+        return f'<path d="{path_data}" style="{style}"{marker_start}{marker_end}/>'
 
     def _get_text_anchor_attrs(self, options: Dict[str, Any]) -> tuple:
         """Convert TikZ text anchors to SVG text-anchor and dominant-baseline.
@@ -275,7 +405,7 @@ class SVGConverter:
         if node.name:
             # Evaluate variables in node name (e.g., P\i -> P0)
             evaluated_name = self.string_evaluator.evaluate(node.name)
-            self.named_coordinates[evaluated_name] = (x, y)
+            self.coord_resolver.store_named(evaluated_name, (x, y))
 
         # Convert options to style
         style = self.style_converter.convert_text_style(node.options)
@@ -336,18 +466,19 @@ class SVGConverter:
             pos = self.coord_resolver.resolve(coord_def.position)
             # Evaluate variables in coordinate name (e.g., P\i -> P0)
             evaluated_name = self.string_evaluator.evaluate(coord_def.name)
-            self.named_coordinates[evaluated_name] = pos
+            self.coord_resolver.store_named(evaluated_name, pos)
         return None
 
     def visit_scope(self, scope: Scope) -> str:
         """Convert scope to SVG group."""
-        elements = [element for stmt in scope.statements if (element := self.visit_statement(stmt))]
+        return self._wrap_scope(scope, self._visit_statements(scope.statements))
 
+    def _wrap_scope(self, scope: Scope, elements: List[str]) -> str:
+        """Wrap a scope's rendered elements in a group, or return "" if there are none."""
         if elements:
             # Apply scope options to group
             style = self.style_converter.convert(scope.options, "draw")
-            content = "\n    ".join(elements)
-            result = f'<g style="{style}">\n    {content}\n  </g>'
+            result = _SCOPE_GROUP % (style, _GROUP_SEP.join(elements))
         else:
             result = ""
 
@@ -364,7 +495,7 @@ class SVGConverter:
         - Nested loops with proper scoping
         """
         elements = self.loop_expander.expand(loop, self)
-        return "\n  ".join(elements)
+        return _ELEMENT_SEP.join(elements)
 
     def visit_macro_definition(self, macro: MacroDefinition) -> None:
         """
@@ -401,11 +532,12 @@ class SVGConverter:
         """Convert layer environment to SVG group."""
         # For now, treat layers like scopes - just group the elements
         # In a full implementation, we'd reorder elements based on layer ordering
-        elements = [element for stmt in layer.statements if (element := self.visit_statement(stmt))]
+        return self._wrap_layer(layer, self._visit_statements(layer.statements))
 
+    def _wrap_layer(self, layer: Layer, elements: List[str]) -> str:
+        """Wrap a layer's rendered elements in a group, or return "" if there are none."""
         if elements:
-            content = "\n    ".join(elements)
-            result = f'<g data-layer="{layer.name}">\n    {content}\n  </g>'
+            result = _LAYER_GROUP % (layer.name, _GROUP_SEP.join(elements))
         else:
             result = ""
 
@@ -1,8 +1,34 @@
 """Coordinate resolution for TikZ to SVG conversion."""
 
+import sys
+from functools import lru_cache
 from typing import Any, Dict, Optional, Tuple
 
+from ..evaluator.math_eval import MathEvaluator, is_constant_expression
 from ..parser.ast_nodes import Coordinate
+from .geometry import CoordinateTransformer
+
+# Evaluates constant expressions, which by definition never read its context
+_CONSTANT_EVALUATOR = MathEvaluator()
+
+
+def _eval_string(evaluator, value: str) -> float:
+    """Evaluate a string expression, falling back to float() and then 0.0."""
+    try:
+        result = float(evaluator.evaluate(value))
+    except Exception:
+        # If evaluation fails, try direct conversion
+        try:
+            result = float(value)
+        except Exception:
+            result = 0.0
+    return result
+
+
+@lru_cache(maxsize=4096)
+def _eval_constant(value: str) -> float:
+    """Memoized _eval_string() for constant expressions like "sqrt(2)" or "1+1"."""
+    return _eval_string(_CONSTANT_EVALUATOR, value)
 
 
 class CoordinateResolver:
@@ -16,7 +42,10 @@ class CoordinateResolver:
     """
 
     def __init__(
-        self, coord_transformer, evaluator, named_coordinates: Dict[str, Tuple[float, float]]
+        self,
+        coord_transformer: CoordinateTransformer,
+        evaluator: MathEvaluator,
+        named_coordinates: Dict[str, Tuple[float, float]],
     ):
         """Initialize coordinate resolver.
 
@@ -41,7 +70,16 @@ class CoordinateResolver:
         Returns:
             Tuple of (x, y) in SVG coordinate space
         """
-        if coord.system == "cartesian":
+        values = coord.values
+        if (
+            coord.system == "cartesian"
+            and len(values) == 2
+            and type(values[0]) is float
+            and type(values[1]) is float
+        ):
+            # Literal floats need none of eval_value's type and string handling
+            return self.coord_transformer.tikz_to_svg(values[0], values[1])
+        elif coord.system == "cartesian":
             return self._resolve_cartesian(coord)
         elif coord.system == "polar":
             return self._resolve_polar(coord)
@@ -90,11 +128,10 @@ class CoordinateResolver:
             SVG (x, y) position, or origin if not found
         """
         name = coord.name
-        result = (
-            self.named_coordinates[name]
-            if name and name in self.named_coordinates
-            else self.coord_transformer.tikz_to_svg(0, 0)
-        )
+        if name is not None and name in self.named_coordinates:
+            result = self.named_coordinates[name]
+        else:
+            result = self.coord_transformer.tikz_to_svg(0, 0)
         return result
 
     def _resolve_relative(
@@ -149,14 +186,13 @@ class CoordinateResolver:
             return float(value)
 
         if isinstance(value, str):
-            try:
-                return float(self.evaluator.evaluate(value))
-            except Exception:
-                # If evaluation fails, try direct conversion
-                try:
-                    return float(value)
-                except Exception:
-                    return 0.0
+            # Constant expressions recur across loop iterations and are cached;
+            # anything that may read a variable is evaluated in the live context
+            return (
+                _eval_constant(value)
+                if is_constant_expression(value)
+                else _eval_string(self.evaluator, value)
+            )
 
         return 0.0
 
@@ -167,4 +203,4 @@ class CoordinateResolver:
             name: Coordinate name
             position: SVG (x, y) position
         """
-        self.named_coordinates[name] = position
+        self.named_coordinates[sys.intern(name)] = position
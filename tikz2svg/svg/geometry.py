@@ -1,11 +1,23 @@
 """Geometric transformations for TikZ to SVG conversion."""
 
 import math
-from typing import Tuple
+from functools import lru_cache
+from typing import Any, Tuple
 
 
 class CoordinateTransformer:
-    """Handles coordinate system transformations."""
+    """Handles coordinate system transformations.
+
+    Instances are read-only once built: make_transformer() shares one between
+    all converters with the same canvas settings, so a different scale or
+    offset needs a new transformer.
+    """
+
+    __slots__ = ("scale", "offset_x", "offset_y")
+
+    scale: float
+    offset_x: float
+    offset_y: float
 
     def __init__(self, scale: float = 28.35, offset_x: float = 250, offset_y: float = 250):
         """
@@ -16,9 +28,17 @@ class CoordinateTransformer:
             offset_x: X offset for center (SVG pixels)
             offset_y: Y offset for center (SVG pixels)
         """
-        self.scale = scale
-        self.offset_x = offset_x
-        self.offset_y = offset_y
+        object.__setattr__(self, "scale", scale)
+        object.__setattr__(self, "offset_x", offset_x)
+        object.__setattr__(self, "offset_y", offset_y)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Reject changes, which would leak into every converter sharing the instance."""
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __reduce__(self) -> Tuple[Any, Tuple[float, float, float]]:
+        """Unpickle through make_transformer(), sharing the cached instance again."""
+        return make_transformer, (self.scale, self.offset_x, self.offset_y)
 
     def tikz_to_svg(self, x: float, y: float) -> Tuple[float, float]:
         """
@@ -81,3 +101,24 @@ class CoordinateTransformer:
         sweep = 1 if end_angle > start_angle else 0
 
         return f"A {radius} {radius} 0 {large_arc} {sweep} {end_x:.2f} {end_y:.2f}"
+
+
+@lru_cache(maxsize=128)
+def make_transformer(
+    scale: float = 28.35, offset_x: float = 250, offset_y: float = 250
+) -> CoordinateTransformer:
+    """
+    Return a shared coordinate transformer for the given parameters.
+
+    Transformers are read-only, so converters and renderers with the same
+    canvas settings can share one instance.
+
+    Args:
+        scale: Scale factor (points to pixels)
+        offset_x: X offset for center (SVG pixels)
+        offset_y: Y offset for center (SVG pixels)
+
+    Returns:
+        Cached CoordinateTransformer
+    """
+    return CoordinateTransformer(scale, offset_x, offset_y)
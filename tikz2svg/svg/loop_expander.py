@@ -1,11 +1,15 @@
 """Foreach loop expansion for TikZ to SVG conversion."""
 
-from typing import List
+from typing import Any, Callable, List, Optional, cast
 
-from ..evaluator.math_eval import MathEvaluator
 from ..parser.ast_nodes import ForeachLoop
 
 
+def _variable_key(name: str) -> str:
+    """Return a variable name as stored by EvaluationContext (no leading backslash)."""
+    return name[1:] if name.startswith("\\") else name
+
+
 class ForeachLoopExpander:
     """Expands TikZ foreach loops by iterating and processing body statements.
 
@@ -34,79 +38,119 @@ class ForeachLoopExpander:
         Returns:
             List of SVG element strings from expanded loop
         """
-        elements = []
-        num_vars = len(loop.variables)
+        # Loops without values or body produce nothing, so no child context
+        # or binder is created for them
+        return self._expand_iterations(loop, converter) if loop.values and loop.body else []
 
-        for value in loop.values:
-            # Create child context for this iteration
-            parent_context = converter.context
-            parent_evaluator = converter.evaluator
+    def _expand_iterations(self, loop: ForeachLoop, converter) -> List[str]:
+        """Run every iteration of a non-empty foreach loop.
 
-            converter.context = converter.context.create_child_context()
-            converter.evaluator = MathEvaluator(converter.context)
+        Args:
+            loop: ForeachLoop AST node with values and body statements
+            converter: SVGConverter instance for context and statement visiting
 
-            try:
-                # Set loop variable(s)
-                self._set_loop_variables(
-                    loop.variables, value, num_vars, parent_evaluator, converter.context
-                )
+        Returns:
+            List of SVG element strings from expanded loop
+        """
+        # Body statements are bound to their visitors once per loop, so each
+        # iteration only binds the variables and calls them. Statements the
+        # converter has no visitor for are dropped here
+        body = [run for stmt in loop.body if (run := converter.compile_statement(stmt))]
+
+        # Each body statement yields at most one element per iteration, so the
+        # result is preallocated at its maximum size and truncated at the end
+        elements: List[Optional[str]] = [None] * (len(loop.values) * len(body))
+        count = 0
+
+        # One child context for the whole loop, emptied at the start of every
+        # iteration. Setting converter.context re-points the converter's shared
+        # evaluators, so no evaluator is created per loop or iteration
+        parent_context = converter.context
+        converter.context = context = parent_context.create_child_context()
+
+        # Variable binding is specialized once per loop instead of branching on
+        # the variable count and evaluate clause in every iteration
+        scope = context.variables
+        bind = self._make_binder(loop, converter.evaluator, scope)
+
+        try:
+            for value in loop.values:
+                scope.clear()
+                context.coordinates.clear()
 
-                # Handle evaluate clause
-                if loop.evaluate_clause:
-                    self._handle_evaluate_clause(
-                        loop.evaluate_clause, converter.evaluator, converter.context
-                    )
+                # The context is empty at this point, so values are evaluated
+                # as they would be in the parent context
+                bind(value)
 
                 # Visit body statements
-                elements.extend(
-                    element for stmt in loop.body if (element := converter.visit_statement(stmt))
-                )
+                for run in body:
+                    if element := run():
+                        elements[count] = element
+                        count += 1
 
-            finally:
-                # Restore parent context
-                converter.context = parent_context
-                converter.evaluator = parent_evaluator
+        finally:
+            # Restore parent context
+            converter.context = parent_context
 
-        return elements
+        # Only the written slots remain, and each holds an element string
+        del elements[count:]
+        return cast(List[str], elements)
 
-    def _set_loop_variables(
-        self, variables: List[str], value, num_vars: int, parent_evaluator, context
-    ):
-        """Set loop variable(s) in current context.
+    def _make_binder(self, loop: ForeachLoop, evaluator, scope: dict) -> Callable[[Any], None]:
+        """Build the function that sets the loop variable(s) for one value.
+
+        Variable names are normalized here once, so each iteration writes
+        straight into the loop context's variables dict.
 
         Args:
-            variables: List of variable names
-            value: Value(s) to assign
-            num_vars: Number of variables
-            parent_evaluator: Parent evaluator for safe evaluation
-            context: Current evaluation context
+            loop: ForeachLoop AST node
+            evaluator: Evaluator for safe evaluation of the values
+            scope: Variables dict of the loop's child context
+
+        Returns:
+            Callable taking the value(s) of a single iteration
         """
+        variables = [_variable_key(name) for name in loop.variables]
+        num_vars = len(variables)
+        safe_evaluate = self.option_processor.safe_evaluate
+
         if num_vars == 1:
             # Single variable
             var_name = variables[0]
-            value_eval = self.option_processor.safe_evaluate(value, parent_evaluator)
-            context.set_variable(var_name, value_eval)
-        elif num_vars > 1 and isinstance(value, (tuple, list)):
-            # Multiple variables with paired values
-            for i, var_name in enumerate(variables):
-                if i < len(value):
-                    val = self.option_processor.safe_evaluate(value[i], parent_evaluator)
-                    context.set_variable(var_name, val)
-
-    def _handle_evaluate_clause(self, evaluate_clause: dict, evaluator, context):
+
+            def bind(value):
+                scope[var_name] = safe_evaluate(value, evaluator)
+
+        else:
+            # Multiple variables with paired values, all evaluated before any is
+            # set so that one value never sees another loop variable
+            def bind(value):
+                if isinstance(value, (tuple, list)):
+                    evaluated = [safe_evaluate(val, evaluator) for val in value[:num_vars]]
+                    scope.update(zip(variables, evaluated))
+
+        if evaluate_clause := loop.evaluate_clause:
+            bind_variables = bind
+            target_var = _variable_key(evaluate_clause["target"])
+            expression = evaluate_clause["expression"]
+
+            def bind(value):
+                bind_variables(value)
+                self._handle_evaluate_clause(target_var, expression, evaluator, scope)
+
+        return bind
+
+    def _handle_evaluate_clause(self, target_var: str, expression: str, evaluator, scope: dict):
         """Process evaluate clause to compute derived variables.
 
         Args:
-            evaluate_clause: Dictionary with 'target' and 'expression' keys
+            target_var: Normalized name of the computed variable
+            expression: Expression evaluated with the current loop values
             evaluator: Math evaluator
-            context: Current evaluation context
+            scope: Variables dict of the loop's child context
         """
-        target_var = evaluate_clause["target"]
-        expression = evaluate_clause["expression"]
-
         # Evaluate the expression with current loop variable value
         try:
-            result = evaluator.evaluate(expression)
-            context.set_variable(target_var, result)
+            scope[target_var] = evaluator.evaluate(expression)
         except Exception:
             pass
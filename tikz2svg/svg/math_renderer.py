@@ -1,14 +1,42 @@
 """Math rendering using ziamath for LaTeX math mode."""
 
+import importlib.util
 import re
-from typing import Optional, Tuple
+from functools import lru_cache
+from types import ModuleType
+from typing import Optional, Tuple, cast
 
-try:
-    import ziamath as zm
+# ziamath loads and parses its math font when imported, so availability is
+# checked without importing it and the import is deferred to the first render
+ZIAMATH_AVAILABLE = importlib.util.find_spec("ziamath") is not None
 
-    ZIAMATH_AVAILABLE = True
-except ImportError:
-    ZIAMATH_AVAILABLE = False
+# Inline math: $...$ with a non-empty body
+_MATH_RE = re.compile(r"\$([^$]+)\$")
+
+
+@lru_cache(maxsize=None)
+def _ziamath() -> ModuleType:
+    """Import ziamath once; the module keeps its loaded fonts for the process."""
+    import ziamath
+
+    return ziamath
+
+
+@lru_cache(maxsize=512)
+def _render_cached(math_expr: str) -> str:
+    """Render a math expression to SVG with ziamath.
+
+    Memoized: labels like $x$ or $\\alpha$ repeat across nodes, and ziamath
+    output depends only on the expression. Failures raise and are not cached.
+    """
+    # The module is imported lazily, so its return types are not visible here
+    svg = cast(str, _ziamath().Latex(math_expr).svg()).strip()
+
+    # Extract just the SVG content (remove XML declaration if present)
+    if svg.startswith("<?xml"):
+        svg = svg.split("?>", 1)[1].strip()
+
+    return svg
 
 
 class MathRenderer:
@@ -34,9 +62,8 @@ class MathRenderer:
         Returns:
             True if text contains $...$ or \\(...\\)
         """
-        if not text:
-            return False
-        return bool(re.search(r"\$[^$]+\$", text))
+        # The C-level "in" check rules out most labels without running the regex
+        return bool(text) and "$" in text and _MATH_RE.search(text) is not None
 
     def render(self, text: str) -> Tuple[str, Optional[str]]:
         """Render math in text to SVG.
@@ -49,11 +76,12 @@ class MathRenderer:
             - plain_text: Text with math removed (for fallback)
             - svg_content: SVG string if math was found and rendered, None otherwise
         """
-        if not self.enabled or not text:
+        # Labels without a "$" (most of them) skip the regex scan entirely
+        if not self.enabled or not text or "$" not in text:
             return text, None
 
         # Find math content
-        match = re.search(r"\$([^$]+)\$", text)
+        match = _MATH_RE.search(text)
         if not match:
             return text, None
 
@@ -61,16 +89,7 @@ class MathRenderer:
         math_expr = match.group(1)
 
         try:
-            # Render with ziamath
-            latex_obj = zm.Latex(math_expr)
-            svg = latex_obj.svg()
-
-            # Extract just the SVG content (remove XML declaration if present)
-            svg = svg.strip()
-            if svg.startswith("<?xml"):
-                svg = svg.split("?>", 1)[1].strip()
-
-            return text, svg
+            return text, _render_cached(math_expr)
 
         except Exception:
             # If rendering fails, return plain text
@@ -86,5 +105,6 @@ class MathRenderer:
         Returns:
             Text with $ removed but math content preserved
         """
-        # Remove dollar signs but keep the math content
-        return re.sub(r"\$([^$]+)\$", r"\1", text)
+        # Remove dollar signs but keep the math content; text without a "$"
+        # (or empty/None) is returned as is without running the regex
+        return _MATH_RE.sub(r"\1", text) if text and "$" in text else text
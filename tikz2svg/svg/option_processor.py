@@ -1,7 +1,37 @@
 """Option processing for TikZ to SVG conversion."""
 
+import keyword
+import re
 from typing import Any, Dict, Optional
 
+from lark import Token
+
+# Characters that mark an option value as an expression worth evaluating
+_EXPRESSION_RE = re.compile(r"[\\+\-*/(]")
+
+# Bare words that are option keywords, never variable references
+_RESERVED_WORDS = frozenset({"true", "false", "none"})
+
+# Marks a failed evaluation (None or a number are valid results)
+_NOT_EVALUATED = object()
+
+# Words that float() accepts, so they evaluate even without a variable
+_FLOAT_WORDS = frozenset({"inf", "infinity", "nan"})
+
+
+def _is_unbound_name(value: str, context) -> bool:
+    """Check whether a value is a bare name that cannot evaluate.
+
+    Such values (colors, node names, ...) would only make the evaluator
+    raise, so callers keep them as they are without trying.
+    """
+    return (
+        value.isidentifier()
+        and not keyword.iskeyword(value)
+        and value.lower() not in _FLOAT_WORDS
+        and context.get_variable(value) is None
+    )
+
 
 class OptionProcessor:
     """Processes TikZ options, evaluating expressions and variables.
@@ -20,6 +50,10 @@ class OptionProcessor:
         """
         self.evaluator = evaluator
 
+        # Option handlers by exact value type; a dict lookup per option
+        # instead of a chain of isinstance checks
+        self._dispatch = {str: self._process_string, Token: self._process_token}
+
     def process(self, options: Dict[str, Any]) -> Dict[str, Any]:
         """Evaluate expressions in options dictionary.
 
@@ -29,42 +63,57 @@ class OptionProcessor:
         Returns:
             Options with evaluated expressions
         """
-        from lark import Token
-
-        evaluated = {}
-        for key, value in options.items():
-            # If value is a Token, convert to string first
-            if isinstance(value, Token):
-                value = str(value.value)
-
-            eval_succeeded = False
-
-            # Try to evaluate if it looks like an expression
-            if isinstance(value, str):
-                # Check if it's a variable reference (single word that might be a variable)
-                if value.isalpha() and value not in ["true", "false", "none"]:
-                    # Try as variable first
-                    try:
-                        evaluated[key] = self.evaluator.evaluate(f"\\{value}")
-                        eval_succeeded = True
-                    except Exception:
-                        pass
-
-                # Try to evaluate if it has operators or backslash (only if not already evaluated)
-                if not eval_succeeded and (
-                    "\\" in value or any(op in value for op in ["+", "-", "*", "/", "("])
-                ):
-                    try:
-                        evaluated[key] = self.evaluator.evaluate(value)
-                        eval_succeeded = True
-                    except Exception:
-                        pass
-
-            # Keep as-is if no evaluation succeeded
-            if not eval_succeeded:
-                evaluated[key] = value
-
-        return evaluated
+        dispatch = self._dispatch
+        return {
+            key: dispatch.get(type(value), self._process_other)(value)
+            for key, value in options.items()
+        }
+
+    def _process_string(self, value: str) -> Any:
+        """Evaluate a string option value, keeping it as-is if nothing evaluates.
+
+        Args:
+            value: Raw option value
+
+        Returns:
+            Evaluated result or the original string
+        """
+        result = _NOT_EVALUATED
+
+        # Check if it's a variable reference (single word that might be a variable)
+        # Words that name no variable are skipped without raising
+        if (
+            value.isalpha()
+            and value not in _RESERVED_WORDS
+            and self.evaluator.context.get_variable(value) is not None
+        ):
+            result = self._try_evaluate(f"\\{value}")
+
+        # Try to evaluate if it has operators or backslash (only if not already evaluated)
+        if result is _NOT_EVALUATED and _EXPRESSION_RE.search(value):
+            result = self._try_evaluate(value)
+
+        return value if result is _NOT_EVALUATED else result
+
+    def _process_token(self, value: Token) -> Any:
+        """Process a lark Token option value as its string value."""
+        return self._process_string(str(value.value))
+
+    def _process_other(self, value: Any) -> Any:
+        """Process a value whose exact type has no dispatch entry.
+
+        String subclasses other than Token still take the string path;
+        everything else (numbers, booleans, nested dicts) passes through.
+        """
+        return self._process_string(value) if isinstance(value, str) else value
+
+    def _try_evaluate(self, expr: str) -> Any:
+        """Evaluate an expression, returning _NOT_EVALUATED on failure."""
+        try:
+            result = self.evaluator.evaluate(expr)
+        except Exception:
+            result = _NOT_EVALUATED
+        return result
 
     def safe_evaluate(self, value, evaluator: Optional[Any] = None):
         """Safely evaluate a value with fallback.
@@ -80,7 +129,13 @@ class OptionProcessor:
             return value
 
         eval_instance = evaluator or self.evaluator
-        try:
-            return eval_instance.evaluate(value)
-        except Exception:
-            return value
+        result = value
+
+        # Bare names without a variable are kept as is instead of raising
+        if not _is_unbound_name(value, eval_instance.context):
+            try:
+                result = eval_instance.evaluate(value)
+            except Exception:
+                pass
+
+        return result
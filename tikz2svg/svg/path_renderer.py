@@ -2,7 +2,36 @@
 
 from typing import List, Optional, Tuple
 
-from ..parser.ast_nodes import Path
+from ..parser.ast_nodes import Coordinate, Path
+
+# SVG command template for operations that emit a single point. %-formatting
+# a per-operation template avoids interpolating the command letter as well
+_LINE_FORMAT = "L %.2f %.2f"
+_POINT_FORMATS = {"start": "M %.2f %.2f", "move": "M %.2f %.2f", "--": _LINE_FORMAT}
+
+# Multi-point commands, each filled by one %-operation
+_ARC_FORMAT = "A %.2f %.2f 0 %d %d %.2f %.2f"
+_CUBIC_FORMAT = "C %.2f %.2f %.2f %.2f %.2f %.2f"
+_QUADRATIC_FORMAT = "Q %.2f %.2f %.2f %.2f"
+
+# Fixed-shape command lists, filled with one %-operation and split into commands
+_CIRCLE_TEMPLATE = "M %.2f %s\nA %.2f %.2f 0 1 0 %.2f %s\nA %.2f %.2f 0 1 0 %.2f %s"
+_RECTANGLE_TEMPLATE = "L %.2f %.2f\nL %.2f %.2f\nL %.2f %.2f\nZ"
+
+
+def _grid_positions(start: float, end: float, step: float) -> List[str]:
+    """Format the grid line positions from start to end (inclusive, 0.01 tolerance).
+
+    Positions are computed as start + i * step rather than by repeated
+    addition, so rounding error does not accumulate across a dense grid.
+    """
+    count = int((end + 0.01 - start) // step) + 1 if step > 0 else 1
+    return [f"{start + i * step:.2f}" for i in range(count)]
+
+
+def _absolute(coord: Optional[Coordinate]) -> Optional[Coordinate]:
+    """Return coord unless it is relative, whose position depends on where it is used."""
+    return coord if coord is not None and coord.system != "relative" else None
 
 
 class PathRenderer:
@@ -36,8 +65,12 @@ class PathRenderer:
         """
         path_data = []
         current_pos = None
+        # Absolute coordinate current_pos was resolved from. Circles repeat the
+        # preceding coordinate as their center, e.g. (\x,\y) circle (r), so it
+        # is not evaluated twice
+        current_coord = None
 
-        for i, segment in enumerate(path.segments):
+        for segment in path.segments:
             # Handle operation types
             op = segment.operation
 
@@ -56,9 +89,13 @@ class PathRenderer:
                 elif op_type == "circle":
                     # Circle at current position
                     circle_spec = op.get("spec", {})
-                    if current_pos and segment.destination:
+                    if current_pos and segment.destination is current_coord:
+                        # Circle at the coordinate just resolved
+                        center = current_pos
+                    elif current_pos and segment.destination:
                         # Circle at specific coordinate
                         center = self.coord_resolver.resolve(segment.destination, current_pos)
+                        current_coord = _absolute(segment.destination)
                     elif current_pos:
                         center = current_pos
                     else:
@@ -84,19 +121,16 @@ class PathRenderer:
                         if curve_cmd:
                             path_data.append(curve_cmd)
                             current_pos = dest
+                            current_coord = _absolute(segment.destination)
 
             elif segment.destination:
                 # Handle standard operations with destination
                 coord = self.coord_resolver.resolve(segment.destination, current_pos)
                 x, y = coord
 
-                if op == "start":
-                    path_data.append(f"M {x:.2f} {y:.2f}")
-                elif op == "move":
-                    # Move without drawing (for placing nodes without connecting lines)
-                    path_data.append(f"M {x:.2f} {y:.2f}")
-                elif op == "--":
-                    path_data.append(f"L {x:.2f} {y:.2f}")
+                if point_format := _POINT_FORMATS.get(op):
+                    # Start, line and move (move places nodes without connecting lines)
+                    path_data.append(point_format % (x, y))
                 elif op == "..":
                     # Curve (simplified as quadratic)
                     curve_cmd = self._render_simple_curve(x, y, current_pos)
@@ -113,7 +147,7 @@ class PathRenderer:
                     path_data.extend(grid_cmds)
                 else:
                     # Default to line
-                    path_data.append(f"L {x:.2f} {y:.2f}")
+                    path_data.append(_LINE_FORMAT % (x, y))
 
                 # Update current position
                 if segment.destination.system == "relative":
@@ -122,6 +156,7 @@ class PathRenderer:
                         current_pos = (x, y)
                 else:
                     current_pos = (x, y)
+                current_coord = _absolute(segment.destination)
 
         return " ".join(path_data)
 
@@ -166,7 +201,7 @@ class PathRenderer:
             large_arc = 1 if abs(end_angle - start_angle) > 180 else 0
             sweep = 1 if end_angle > start_angle else 0
 
-            return f"A {radius:.2f} {radius:.2f} 0 {large_arc} {sweep} {end_x:.2f} {end_y:.2f}"
+            return _ARC_FORMAT % (radius, radius, large_arc, sweep, end_x, end_y)
 
         else:
             # Options format [start angle=..., end angle=..., radius=...]
@@ -186,7 +221,7 @@ class PathRenderer:
             large_arc = 1 if abs(end_angle - start_angle) > 180 else 0
             sweep = 1
 
-            return f"A {radius:.2f} {radius:.2f} 0 {large_arc} {sweep} {end_x:.2f} {end_y:.2f}"
+            return _ARC_FORMAT % (radius, radius, large_arc, sweep, end_x, end_y)
 
     def _render_circle_as_path(self, center: Tuple[float, float], radius: float) -> List[str]:
         """Render circle as SVG path commands.
@@ -199,11 +234,10 @@ class PathRenderer:
             List of path commands (M, A, A, Z)
         """
         cx, cy = center
-        return [
-            f"M {cx - radius:.2f} {cy}",
-            f"A {radius:.2f} {radius:.2f} 0 1 0 {cx + radius:.2f} {cy}",
-            f"A {radius:.2f} {radius:.2f} 0 1 0 {cx - radius:.2f} {cy}",
-        ]
+        left, right = cx - radius, cx + radius
+        return (
+            _CIRCLE_TEMPLATE % (left, cy, radius, radius, right, cy, radius, radius, left, cy)
+        ).split("\n")
 
     def _render_bezier(
         self,
@@ -225,11 +259,11 @@ class PathRenderer:
             # Cubic Bezier
             c1 = self.coord_resolver.resolve(controls[0], current_pos)
             c2 = self.coord_resolver.resolve(controls[1], current_pos)
-            return f"C {c1[0]:.2f} {c1[1]:.2f} {c2[0]:.2f} {c2[1]:.2f} {dest[0]:.2f} {dest[1]:.2f}"
+            return _CUBIC_FORMAT % (*c1, *c2, *dest)
         elif len(controls) == 1:
             # Quadratic Bezier
             c1 = self.coord_resolver.resolve(controls[0], current_pos)
-            return f"Q {c1[0]:.2f} {c1[1]:.2f} {dest[0]:.2f} {dest[1]:.2f}"
+            return _QUADRATIC_FORMAT % (*c1, *dest)
         return None
 
     def _render_simple_curve(
@@ -248,8 +282,8 @@ class PathRenderer:
         if current_pos:
             cx = (current_pos[0] + x) / 2
             cy = (current_pos[1] + y) / 2
-            return f"Q {cx:.2f} {cy:.2f} {x:.2f} {y:.2f}"
-        return f"L {x:.2f} {y:.2f}"
+            return _QUADRATIC_FORMAT % (cx, cy, x, y)
+        return _LINE_FORMAT % (x, y)
 
     def _render_orthogonal(
         self, op: str, x: float, y: float, current_pos: Optional[Tuple[float, float]]
@@ -268,11 +302,11 @@ class PathRenderer:
         if current_pos:
             if op == "|-":
                 # Horizontal then vertical
-                return [f"L {x:.2f} {current_pos[1]:.2f}", f"L {x:.2f} {y:.2f}"]
+                return [_LINE_FORMAT % (x, current_pos[1]), _LINE_FORMAT % (x, y)]
             else:
                 # Vertical then horizontal
-                return [f"L {current_pos[0]:.2f} {y:.2f}", f"L {x:.2f} {y:.2f}"]
-        return [f"L {x:.2f} {y:.2f}"]
+                return [_LINE_FORMAT % (current_pos[0], y), _LINE_FORMAT % (x, y)]
+        return [_LINE_FORMAT % (x, y)]
 
     def _render_rectangle(
         self, x: float, y: float, current_pos: Optional[Tuple[float, float]]
@@ -289,12 +323,7 @@ class PathRenderer:
         """
         if current_pos:
             x1, y1 = current_pos
-            return [
-                f"L {x:.2f} {y1:.2f}",
-                f"L {x:.2f} {y:.2f}",
-                f"L {x1:.2f} {y:.2f}",
-                "Z",
-            ]
+            return (_RECTANGLE_TEMPLATE % (x, y1, x, y, x1, y)).split("\n")
         return []
 
     def _render_grid(
@@ -319,25 +348,26 @@ class PathRenderer:
         # Default step is 1cm = 28.35pt in TikZ
         step = self.coord_transformer.scale * 28.35
 
-        commands = []
-
-        # Draw vertical lines
         x_start = min(x1, x2)
         x_end = max(x1, x2)
         y_start = min(y1, y2)
         y_end = max(y1, y2)
 
-        current_x = x_start
-        while current_x <= x_end + 0.01:
-            commands.append(f"M {current_x:.2f} {y_start:.2f}")
-            commands.append(f"L {current_x:.2f} {y_end:.2f}")
-            current_x += step
-
-        # Draw horizontal lines
-        current_y = y_start
-        while current_y <= y_end + 0.01:
-            commands.append(f"M {x_start:.2f} {current_y:.2f}")
-            commands.append(f"L {x_end:.2f} {current_y:.2f}")
-            current_y += step
+        # Every line shares its other coordinate, so each number is formatted
+        # once and the commands are assembled from the formatted strings
+        left, right = f"{x_start:.2f}", f"{x_end:.2f}"
+        top, bottom = f"{y_start:.2f}", f"{y_end:.2f}"
+
+        # Draw vertical lines, then horizontal lines
+        commands = [
+            cmd
+            for gx in _grid_positions(x_start, x_end, step)
+            for cmd in (f"M {gx} {top}", f"L {gx} {bottom}")
+        ]
+        commands.extend(
+            cmd
+            for gy in _grid_positions(y_start, y_end, step)
+            for cmd in (f"M {left} {gy}", f"L {right} {gy}")
+        )
 
         return commands
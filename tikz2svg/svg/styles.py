@@ -1,6 +1,10 @@
 """Style conversion from TikZ options to SVG styles."""
 
-from typing import Any, Dict
+from collections import OrderedDict
+from typing import Any, Dict, Tuple
+
+# Number of built styles kept per converter, least recently used evicted first
+_STYLE_CACHE_SIZE = 512
 
 
 class StyleConverter:
@@ -40,10 +44,48 @@ class StyleConverter:
         "ultra thick": 4.0,
     }
 
+    def __init__(self) -> None:
+        """Initialize style converter."""
+        # Styles already built, by command and typed option items
+        self._styles: "OrderedDict[Tuple[Any, ...], str]" = OrderedDict()
+
     def convert(self, options: Dict[str, Any], command: str = "draw") -> str:
         """
         Convert TikZ options to SVG style string.
 
+        The style only depends on the command and the options, so statements
+        and loop iterations repeating the same options share one result.
+
+        Args:
+            options: TikZ options dictionary
+            command: TikZ command ('draw', 'fill', 'filldraw')
+
+        Returns:
+            SVG style string
+        """
+        # Value types are part of the key: 1, 1.0 and True are equal but
+        # render differently (e.g. as opacity)
+        key = (command, *((name, type(value), value) for name, value in options.items()))
+        try:
+            style = self._styles.get(key)
+            cacheable = True
+        except TypeError:
+            # Unhashable option value (list, dict): build without caching
+            style, cacheable = None, False
+        if style is not None:
+            self._styles.move_to_end(key)
+        else:
+            style = self._build_style(options, command)
+            if cacheable:
+                self._styles[key] = style
+                if len(self._styles) > _STYLE_CACHE_SIZE:
+                    self._styles.popitem(last=False)
+        return style
+
+    def _build_style(self, options: Dict[str, Any], command: str) -> str:
+        """
+        Build the SVG style string for convert().
+
         Args:
             options: TikZ options dictionary
             command: TikZ command ('draw', 'fill', 'filldraw')